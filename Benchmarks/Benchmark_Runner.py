@@ -0,0 +1,301 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from Benchmarks.Dataset_Generator import DatasetGenerator
+from Src.Backends.Query_Stats import QueryStats
+from Src.Config.Config_load import load_config, load_pool_config
+from Src.Config.Sql_load import migrate
+from Src.DBconnect import DBconnect
+from Src.Services.Availability_Index import AvailabilityIndex
+from Src.Services.Import import Import
+from Src.Services.Reservation_Service import ReservationService
+from Src.Services.Utilization import Utilization
+from Src.Table_Gateways.Daily_Rollup import DailyRollup
+from Src.Table_Gateways.Hall import Hall
+from Src.Table_Gateways.Reference_Cache import ReferenceCache
+from Src.Table_Gateways.Service import Service
+
+class BenchmarkError(Exception):
+    pass
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_VERSION = 1
+
+def percentile(samples:list, percent:float):
+    if not samples:
+        return 0.0
+    position = min(len(samples) - 1, int(round(percent / 100 * (len(samples) - 1))))
+    return samples[position]
+
+def summarize(samples:list, errors:int, rows:int=None):
+    samples = sorted(samples)
+    total = sum(samples)
+    result = {
+        "iterations": len(samples),
+        "errors": errors,
+        "total_s": round(total, 6),
+        "mean_ms": round(total * 1000 / len(samples), 3) if samples else 0.0,
+        "min_ms": round(samples[0] * 1000, 3) if samples else 0.0,
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "max_ms": round(samples[-1] * 1000, 3) if samples else 0.0,
+        "ops_per_s": round(len(samples) / total, 1) if total else 0.0
+    }
+    if rows is not None:
+        result["rows"] = rows
+        result["rows_per_s"] = round(rows / total, 1) if total else 0.0
+    return result
+
+def measure(iterations:int, operation):
+    samples = []
+    errors = 0
+    for i in range(iterations):
+        started = time.perf_counter()
+        try:
+            operation(i)
+        except Exception:
+            errors += 1
+            continue
+        samples.append(time.perf_counter() - started)
+    return samples, errors
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_PATH, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+class BenchmarkRunner:
+    def __init__(self, db:DBconnect, dataset:DatasetGenerator, iterations:int=200, scans:int=3, seed:int=42):
+        self.db = db
+        self.dataset = dataset
+        self.iterations = iterations
+        self.scans = scans
+        self.rng = random.Random(seed)
+        self.results = {}
+        self.counts = {}
+
+    def run(self, work_dir:str):
+        with self.db.session() as connection:
+            migrate(connection, os.path.join(BASE_PATH, "Migrations"))
+            self.bench_import(connection, self.dataset.write_csv(work_dir))
+            self.counts = self.dataset.load_history(connection)
+            self.prepare(connection)
+
+            created = self.bench_create_reservation(connection)
+            self.bench_check_halls(connection)
+            self.bench_quote(connection)
+            self.bench_pay_and_transfer(connection, created)
+            self.bench_read_reservation_detail(connection)
+            self.bench_report(connection)
+            self.bench_utilization(connection)
+            self.bench_revenue(connection)
+        return self.results
+
+    def prepare(self, connection):
+        cursor = connection.cursor()
+        cursor.execute("UPDATE cash_account SET balance = 99999999 WHERE account_type = 'CUSTOMER'")
+        connection.commit()
+        cursor.execute("SELECT id, account_id FROM customer")
+        self.accounts = dict(cursor.fetchall())
+        cursor.close()
+
+        ReservationService(connection).report(exact=True)
+        ReferenceCache().invalidate()
+        AvailabilityIndex().invalidate()
+        self.halls = {hall[0]: hall for hall in Hall(connection).read_all()}
+        self.services_not_optional = Service(connection).read_not_optional()
+
+    def random_future_interval(self):
+        day = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=self.rng.randint(1, 365))
+        start = day + timedelta(hours=self.rng.randint(8, 20))
+        return start, start + timedelta(hours=self.rng.randint(1, 2))
+
+    def bench_import(self, connection, paths:dict):
+        importer = Import(connection, 1000)
+        for table, rows in (("customer", self.dataset.customers), ("hall", self.dataset.halls), ("service", self.dataset.services)):
+            samples, errors = measure(1, lambda i: importer.import_csv(table, paths[f"import_{table}"]))
+            if errors:
+                raise BenchmarkError(f"Import of {table} failed")
+            self.results[f"import_csv.{table}"] = summarize(samples, errors, rows)
+
+    def bench_create_reservation(self, connection):
+        service = ReservationService(connection)
+        customer_ids = list(self.accounts)
+        created = []
+
+        def create(i):
+            hall_id = self.rng.choice(list(self.halls))
+            customer_id = self.rng.choice(customer_ids)
+            start, end = self.random_future_interval()
+            reservation_id = service.create_reservation(customer_id, start, end, {}, self.services_not_optional, {hall_id: self.halls[hall_id]})
+            created.append((reservation_id, customer_id, service.calc_price({}, self.services_not_optional, {hall_id: self.halls[hall_id]}, end, start)))
+
+        samples, errors = measure(self.iterations, create)
+        self.results["create_reservation"] = summarize(samples, errors)
+        return created
+
+    def bench_check_halls(self, connection):
+        service = ReservationService(connection)
+
+        def check(i):
+            hall_id = self.rng.choice(list(self.halls))
+            start, end = self.random_future_interval()
+            service.check_halls({hall_id: self.halls[hall_id]}, start, end)
+
+        samples, errors = measure(self.iterations, check)
+        self.results["check_halls"] = summarize(samples, errors)
+
+    def bench_quote(self, connection, slots:int=50):
+        service = ReservationService(connection)
+        hall_sets = [{hall_id: hall} for hall_id, hall in self.halls.items()]
+        quoted = [0]
+
+        def quote(i):
+            start, end = self.random_future_interval()
+            quoted[0] += len(service.quote(None, hall_sets, [(start + timedelta(minutes=30 * k), end + timedelta(minutes=30 * k)) for k in range(slots)],
+                                           {}, self.services_not_optional))
+
+        samples, errors = measure(self.iterations, quote)
+        self.results["quote"] = summarize(samples, errors, quoted[0])
+
+    def bench_pay_and_transfer(self, connection, created:list):
+        service = ReservationService(connection)
+
+        def pay(i):
+            reservation_id, customer_id, amount = created[i]
+            service.pay_and_transfer(reservation_id, self.accounts[customer_id], amount)
+
+        samples, errors = measure(len(created), pay)
+        self.results["pay_and_transfer"] = summarize(samples, errors)
+
+    def bench_read_reservation_detail(self, connection):
+        service = ReservationService(connection)
+        rows = [0]
+
+        def scan(i):
+            rows[0] = sum(len(page) for page in service.iter_reservation_detail())
+
+        samples, errors = measure(self.scans, scan)
+        self.results["read_reservation_detail"] = summarize(samples, errors, rows[0] * len(samples))
+
+    def bench_report(self, connection):
+        service = ReservationService(connection)
+        samples, errors = measure(self.iterations, lambda i: service.report())
+        self.results["report"] = summarize(samples, errors)
+        samples, errors = measure(self.scans, lambda i: service.report(exact=True))
+        self.results["report.exact"] = summarize(samples, errors)
+
+    def bench_utilization(self, connection):
+        utilization = Utilization(connection)
+        now = datetime.now()
+        date_from = now - timedelta(days=int(self.dataset.years * 365))
+        date_to = now + timedelta(days=366)
+        samples, errors = measure(self.scans, lambda i: utilization.report(date_from, date_to))
+        self.results["utilization"] = summarize(samples, errors, self.counts.get("reservation_halls", 0) * len(samples))
+
+    def bench_revenue(self, connection):
+        service = ReservationService(connection)
+        days = [0]
+
+        def refresh(i):
+            days[0] = DailyRollup(connection).refresh()
+
+        samples, errors = measure(1, refresh)
+        self.results["refresh_rollups"] = summarize(samples, errors, days[0])
+        now = datetime.now()
+        date_from = now - timedelta(days=int(self.dataset.years * 365))
+        date_to = now + timedelta(days=366)
+        for by in ("hall", "service", "day"):
+            samples, errors = measure(self.iterations, lambda i: service.revenue(date_from, date_to, by))
+            self.results[f"revenue.{by}"] = summarize(samples, errors)
+
+def compare(results:dict, baseline:dict, tolerance:float):
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or not previous.get("mean_ms"):
+            continue
+        ratio = current["mean_ms"] / previous["mean_ms"]
+        status = "REGRESSION" if ratio > 1 + tolerance else "ok"
+        print(f"{name:28} {previous['mean_ms']:>10.3f} ms -> {current['mean_ms']:>10.3f} ms  x{ratio:5.2f}  {status}", file=sys.stderr)
+        if status == "REGRESSION":
+            regressions.append(name)
+    return regressions
+
+def parser():
+    parser = argparse.ArgumentParser(prog="python -m Benchmarks.Benchmark_Runner", description="Benchmark the reservation hot paths on a synthetic dataset")
+    parser.add_argument("--config", help="use the database from this config file instead of a fresh SQLite file; the schema must be empty")
+    parser.add_argument("--database", help="SQLite database file, defaults to a temporary file")
+    parser.add_argument("--customers", type=int, default=1000)
+    parser.add_argument("--halls", type=int, default=20)
+    parser.add_argument("--services", type=int, default=8)
+    parser.add_argument("--years", type=float, default=2.0)
+    parser.add_argument("--bookings-per-day", dest="bookings_per_day", type=int, default=3)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--scans", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--query-stats", dest="query_stats", action="store_true", help="record per-statement timings and add them to the results")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="previous results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown of the mean before a benchmark counts as a regression")
+    return parser
+
+def main(argv:list=None):
+    args = parser().parse_args(argv)
+    dataset = DatasetGenerator(args.customers, args.halls, args.services, args.years, args.bookings_per_day, args.seed)
+
+    with tempfile.TemporaryDirectory(prefix="halls-bench-") as work_dir:
+        if args.config:
+            cfg = load_config(args.config)
+            pool_cfg = load_pool_config(args.config)
+            db = DBconnect(cfg["user"], cfg["password"], cfg["dsn"], cfg["encoding"], pool_cfg["min"], pool_cfg["max"],
+                           pool_cfg["increment"], pool_cfg["wait_timeout"], cfg["backend"], pool_cfg["statement_cache"])
+        else:
+            db = DBconnect(None, None, args.database or os.path.join(work_dir, "bench.db"), "UTF-8", 1, 2, 1, 5000, "sqlite")
+        ReferenceCache(300)
+        QueryStats().configure(args.query_stats)
+        db.create_pool()
+
+        runner = BenchmarkRunner(db, dataset, args.iterations, args.scans, args.seed)
+        try:
+            results = runner.run(work_dir)
+        finally:
+            pool_stats = db.stats()
+            db.disconnect()
+
+    report = {
+        "version": RESULTS_VERSION,
+        "commit": git_commit(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "backend": pool_stats["backend"],
+        "dataset": {**dataset.describe(), **runner.counts},
+        "results": results
+    }
+    if args.query_stats:
+        report["query_stats"] = QueryStats().snapshot()
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report["results"], indent=2))
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("Regressions: " + ", ".join(regressions), file=sys.stderr)
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
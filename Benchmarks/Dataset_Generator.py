@@ -0,0 +1,143 @@
+import csv
+import os
+import random
+from datetime import datetime, timedelta
+
+from Src.Backends.Backend import DatabaseError
+
+class DatasetGeneratorError(Exception):
+    pass
+
+SPORT_TYPES = ["FOOTBALL", "BASKETBALL", "VOLLEYBALL", "BADMINTON", "HANDBALL", "FLORBALL"]
+FIRST_NAMES = ["Jan", "Petr", "Pavel", "Martin", "Tomas", "Jana", "Eva", "Lucie", "Katerina", "Marie"]
+LAST_NAMES = ["Novak", "Svoboda", "Novotny", "Dvorak", "Cerny", "Prochazka", "Kucera", "Vesely", "Horak", "Marek"]
+SERVICES = [("Lighting", 150, 0), ("Referee", 500, 1), ("Cleaning service", 200, 1), ("Sound system", 300, 1),
+            ("Security staff", 400, 0), ("Physiotherapist", 600, 1), ("Video recording", 350, 1), ("Ball rental", 50, 1)]
+INSERT_CHUNK = 1000
+
+class DatasetGenerator:
+    def __init__(self, customers:int=1000, halls:int=20, services:int=8, years:float=2.0, bookings_per_day:int=3, seed:int=42):
+        if customers <= 0 or halls <= 0 or years <= 0 or bookings_per_day <= 0:
+            raise DatasetGeneratorError("Dataset sizes must be positive")
+        if not 0 < services <= len(SERVICES):
+            raise DatasetGeneratorError(f"Number of services must be between 1 and {len(SERVICES)}")
+        self.customers = customers
+        self.halls = halls
+        self.services = services
+        self.years = years
+        self.bookings_per_day = bookings_per_day
+        self.seed = seed
+
+    def describe(self):
+        return {
+            "customers": self.customers,
+            "halls": self.halls,
+            "services": self.services,
+            "years": self.years,
+            "bookings_per_day": self.bookings_per_day,
+            "seed": self.seed
+        }
+
+    def write_csv(self, directory:str):
+        os.makedirs(directory, exist_ok=True)
+        rng = random.Random(self.seed)
+        paths = {
+            "import_customer": os.path.join(directory, "customer.csv"),
+            "import_hall": os.path.join(directory, "hall.csv"),
+            "import_service": os.path.join(directory, "service.csv")
+        }
+
+        with open(paths["import_customer"], "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["name", "email", "phone", "customer_type", "is_active"])
+            for i in range(1, self.customers + 1):
+                if rng.random() < 0.2:
+                    name = f"Team {rng.choice(LAST_NAMES)} {i}"
+                    customer_type = "TEAM"
+                else:
+                    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}"
+                    customer_type = "INDIVIDUAL"
+                writer.writerow([name, f"customer{i}@example.com", f"+420{rng.randint(600000000, 799999999)}", customer_type, 1])
+
+        with open(paths["import_hall"], "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["name", "sport_type", "hourly_rate", "capacity"])
+            for i in range(1, self.halls + 1):
+                sport_type = SPORT_TYPES[(i - 1) % len(SPORT_TYPES)]
+                writer.writerow([f"{sport_type.title()} Hall {i}", sport_type, rng.randrange(400, 1500, 50), rng.randint(6, 30)])
+
+        with open(paths["import_service"], "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["name", "price_per_hour", "is_optional"])
+            for name, price, optional in SERVICES[:self.services]:
+                writer.writerow([name, price, optional])
+
+        return paths
+
+    def load_history(self, connection, until:datetime=None):
+        rng = random.Random(self.seed + 1)
+        until = (until or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+        start = until - timedelta(days=int(self.years * 365))
+
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT id FROM customer")
+            customer_ids = [row[0] for row in cursor.fetchall()]
+            cursor.execute("SELECT id, hourly_rate FROM hall")
+            halls = cursor.fetchall()
+            cursor.execute("SELECT id, price_per_hour, is_optional FROM service")
+            services = cursor.fetchall()
+            if not customer_ids or not halls:
+                raise DatasetGeneratorError("Customers and halls must be imported before loading history")
+
+            mandatory = [s for s in services if not s[2]]
+            optional = [s for s in services if s[2]]
+            counts = {"reservations": 0, "reservation_halls": 0, "reservation_services": 0, "payments": 0}
+
+            pending = []
+            day = start
+            while day < until:
+                for hall_id, hourly_rate in halls:
+                    hour = 8
+                    for _ in range(rng.randint(0, self.bookings_per_day)):
+                        hour += rng.randint(0, 2)
+                        length = rng.randint(1, 3)
+                        if hour + length > 22:
+                            break
+                        chosen = mandatory + rng.sample(optional, rng.randint(0, min(2, len(optional))))
+                        price = (hourly_rate + sum(s[1] for s in mandatory)) * length + sum(s[1] for s in chosen if s[2])
+                        pending.append((rng.choice(customer_ids), day + timedelta(hours=hour), day + timedelta(hours=hour + length),
+                                        price, hall_id, [(s[0], length, s[1] if s[2] else s[1] * length) for s in chosen]))
+                        hour += length
+                    if len(pending) >= INSERT_CHUNK:
+                        self._insert_chunk(connection, pending, counts)
+                        pending = []
+                day += timedelta(days=1)
+
+            if pending:
+                self._insert_chunk(connection, pending, counts)
+            cursor.close()
+            return counts
+        except DatabaseError as e:
+            connection.rollback()
+            raise DatasetGeneratorError(f'Dataset database error: {e.message}')
+
+    def _insert_chunk(self, connection, bookings:list, counts:dict):
+        cursor = connection.cursor()
+        reservation_ids = cursor.insert_many_returning_ids("INSERT INTO reservation (customer_id, start_time, end_time, total_price, status) "
+                                                           "VALUES (:1, :2, :3, :4, :5)",
+                                                           [(b[0], b[1], b[2], b[3], "CONFIRMED") for b in bookings])
+        cursor.executemany("INSERT INTO reservation_hall (reservation_id, hall_id) VALUES (:1, :2)",
+                           [(reservation_id, b[4]) for reservation_id, b in zip(reservation_ids, bookings)])
+        service_rows = [(reservation_id, service_id, hours, amount) for reservation_id, b in zip(reservation_ids, bookings) for service_id, hours, amount in b[5]]
+        if service_rows:
+            cursor.executemany("INSERT INTO reservation_service (reservation_id, service_id, hours, amount) VALUES (:1, :2, :3, :4)", service_rows)
+        cursor.executemany("INSERT INTO payment (reservation_id, amount, paid_at) VALUES (:1, :2, :3)",
+                           [(reservation_id, b[3], b[1]) for reservation_id, b in zip(reservation_ids, bookings)])
+        connection.commit()
+        cursor.close()
+
+        counts["reservations"] += len(bookings)
+        counts["reservation_halls"] += len(bookings)
+        counts["reservation_services"] += len(service_rows)
+        counts["payments"] += len(bookings)
@@ -2,10 +2,12 @@ CREATE TABLE cash_account (
     id INT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
     account_type VARCHAR2(20) NOT NULL CHECK (account_type IN ('CUSTOMER', 'SYSTEM')),
     balance NUMBER(10,2) NOT NULL CHECK (balance >= 0)
-);
+)
+/
 
 CREATE UNIQUE INDEX ux_one_system_account
-ON cash_account ( CASE WHEN account_type = 'SYSTEM' THEN account_type END);
+ON cash_account ( CASE WHEN account_type = 'SYSTEM' THEN account_type END)
+/
 
 CREATE TABLE customer (
     id INT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
@@ -17,7 +19,8 @@ CREATE TABLE customer (
     is_active NUMBER(1) DEFAULT 1 CHECK (is_active IN (0,1)),
     created_at DATE DEFAULT SYSDATE,
     FOREIGN KEY (account_id) REFERENCES cash_account(id) ON DELETE CASCADE
-);
+)
+/
 
 CREATE TABLE hall (
     id INT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
@@ -25,7 +28,8 @@ CREATE TABLE hall (
     sport_type VARCHAR2(30) NOT NULL CHECK (sport_type IN ('FOOTBALL', 'BASKETBALL', 'VOLLEYBALL', 'BADMINTON', 'HANDBALL', 'FLORBALL')),
     hourly_rate NUMBER(8,2) NOT NULL CHECK(hourly_rate >=0),
     capacity NUMBER NOT NULL CHECK(capacity > 0)
-);
+)
+/
 
 CREATE TABLE reservation (
     id INT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
@@ -36,7 +40,8 @@ CREATE TABLE reservation (
     total_price NUMBER(10,2) CHECK(total_price >= 0),
     CHECK(start_time < end_time),
     FOREIGN KEY (customer_id) REFERENCES customer(id) ON DELETE SET NULL
-);
+)
+/
 
 CREATE TABLE reservation_hall (
     reservation_id INT NOT NULL,
@@ -44,14 +49,16 @@ CREATE TABLE reservation_hall (
     PRIMARY KEY (reservation_id, hall_id),
     FOREIGN KEY (reservation_id) REFERENCES reservation(id) ON DELETE CASCADE,
     FOREIGN KEY (hall_id) REFERENCES hall(id) ON DELETE CASCADE
-);
+)
+/
 
 CREATE TABLE service (
     id INT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
     name VARCHAR2(100) NOT NULL UNIQUE CHECK (REGEXP_LIKE(name, '^[a-zA-ZĚŠČŘŽÝÁÍÉÚŮŇĎŤÓěščřžýáíéúňďťó0-9 ]+$')),
     price_per_hour NUMBER(8,2) NOT NULL CHECK(price_per_hour >=0),
     is_optional NUMBER(1) DEFAULT 1 CHECK (is_optional IN (0,1))
-);
+)
+/
 
 CREATE TABLE reservation_service (
     reservation_id INT NOT NULL,
@@ -60,7 +67,8 @@ CREATE TABLE reservation_service (
     PRIMARY KEY (reservation_id, service_id),
     FOREIGN KEY (reservation_id) REFERENCES reservation(id) ON DELETE CASCADE,
     FOREIGN KEY (service_id) REFERENCES service(id) ON DELETE CASCADE
-);
+)
+/
 
 CREATE TABLE payment (
     id INT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
@@ -68,14 +76,16 @@ CREATE TABLE payment (
     amount NUMBER(10,2) NOT NULL CHECK(amount > 0),
     paid_at DATE DEFAULT SYSDATE,
     FOREIGN KEY (reservation_id) REFERENCES reservation(id) ON DELETE SET NULL
-);
+)
+/
 
 INSERT INTO cash_account (account_type, balance)
 SELECT 'SYSTEM', 0
 FROM dual
 WHERE NOT EXISTS (
     SELECT 1 FROM cash_account WHERE account_type = 'SYSTEM'
-);
+)
+/
 
 CREATE VIEW free_halls_view AS
 SELECT h.id AS hall_id,
@@ -92,7 +102,8 @@ WHERE NOT EXISTS (
       AND r.status <> 'CANCELLED'
       AND r.start_time <= SYSDATE
       AND r.end_time   >= SYSDATE
-);
+)
+/
 
 CREATE VIEW reservation_details_view AS
 SELECT r.id AS reservation_id,
@@ -108,29 +119,53 @@ SELECT r.id AS reservation_id,
 FROM reservation r
 JOIN customer c ON r.customer_id = c.id
 JOIN reservation_hall rh ON rh.reservation_id = r.id
-JOIN hall h ON rh.hall_id = h.id;
+JOIN hall h ON rh.hall_id = h.id
+/
 
-CREATE VIEW reservation_summary_view AS
+CREATE OR REPLACE VIEW reservation_summary_view AS
 SELECT
-    COUNT(DISTINCT r.id) AS total_reservations,
-    COUNT(DISTINCT CASE WHEN r.status <> 'CANCELLED' THEN r.id END) AS active_reservations,
-    MIN(r.total_price) AS min_reservation_price,
-    MAX(r.total_price) AS max_reservation_price,
-    ROUND(AVG(r.total_price), 2) AS avg_reservation_price,
+    (SELECT COUNT(*) FROM reservation) AS total_reservations,
+    (SELECT COUNT(*) FROM reservation WHERE status <> 'CANCELLED') AS active_reservations,
+    (SELECT MIN(total_price) FROM reservation) AS min_reservation_price,
+    (SELECT MAX(total_price) FROM reservation) AS max_reservation_price,
+    (SELECT ROUND(AVG(total_price), 2) FROM reservation) AS avg_reservation_price,
 
-    NVL(SUM(p.amount), 0) AS total_paid_amount,
-    COUNT(p.id) AS total_payments,
-    ROUND(AVG(p.amount), 2) AS avg_payment,
+    (SELECT NVL(SUM(p.amount), 0) FROM payment p JOIN reservation r ON r.id = p.reservation_id) AS total_paid_amount,
+    (SELECT COUNT(*) FROM payment p JOIN reservation r ON r.id = p.reservation_id) AS total_payments,
+    (SELECT ROUND(AVG(p.amount), 2) FROM payment p JOIN reservation r ON r.id = p.reservation_id) AS avg_payment,
 
-    COUNT(DISTINCT c.id) AS unique_customers,
+    (SELECT COUNT(DISTINCT customer_id) FROM reservation) AS unique_customers,
 
-    COUNT(DISTINCT rh.hall_id) AS used_halls,
+    (SELECT COUNT(DISTINCT hall_id) FROM reservation_hall) AS used_halls,
 
-    COUNT(DISTINCT rs.service_id) AS used_services,
-    NVL(SUM(rs.hours), 0) AS total_service_hours
+    (SELECT COUNT(DISTINCT service_id) FROM reservation_service) AS used_services,
+    (SELECT NVL(SUM(hours), 0) FROM reservation_service) AS total_service_hours
 
-FROM reservation r
-JOIN customer c ON c.id = r.customer_id
-LEFT JOIN payment p ON p.reservation_id = r.id
-LEFT JOIN reservation_hall rh ON rh.reservation_id = r.id
-LEFT JOIN reservation_service rs ON rs.reservation_id = r.id;
\ No newline at end of file
+FROM dual
+/
+
+CREATE TABLE reservation_summary (
+    id NUMBER(1) PRIMARY KEY CHECK (id = 1),
+    total_reservations INT DEFAULT 0 NOT NULL,
+    active_reservations INT DEFAULT 0 NOT NULL,
+    min_reservation_price NUMBER(10,2),
+    max_reservation_price NUMBER(10,2),
+    reservation_price_sum NUMBER(14,2) DEFAULT 0 NOT NULL,
+    priced_reservations INT DEFAULT 0 NOT NULL,
+    total_paid_amount NUMBER(14,2) DEFAULT 0 NOT NULL,
+    total_payments INT DEFAULT 0 NOT NULL,
+    unique_customers INT DEFAULT 0 NOT NULL,
+    used_halls INT DEFAULT 0 NOT NULL,
+    used_services INT DEFAULT 0 NOT NULL,
+    total_service_hours NUMBER(14,2) DEFAULT 0 NOT NULL,
+    refreshed_at DATE
+)
+/
+
+INSERT INTO reservation_summary (id)
+SELECT 1
+FROM dual
+WHERE NOT EXISTS (
+    SELECT 1 FROM reservation_summary
+)
+/
@@ -0,0 +1,14 @@
+CREATE INDEX ix_reservation_time ON reservation (start_time, end_time)
+/
+
+CREATE INDEX ix_reservation_customer ON reservation (customer_id)
+/
+
+CREATE INDEX ix_reservation_hall_hall ON reservation_hall (hall_id)
+/
+
+CREATE INDEX ix_reservation_service_service ON reservation_service (service_id)
+/
+
+CREATE INDEX ix_payment_reservation ON payment (reservation_id)
+/
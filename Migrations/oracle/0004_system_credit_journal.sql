@@ -0,0 +1,7 @@
+CREATE TABLE system_credit (
+    id INT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    amount NUMBER(10,2) NOT NULL CHECK(amount > 0),
+    rolled_up NUMBER(1) DEFAULT 0 NOT NULL CHECK (rolled_up IN (0,1)),
+    created_at DATE DEFAULT SYSDATE
+)
+/
@@ -0,0 +1,44 @@
+CREATE TABLE ledger_transfer (
+    id INT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    kind VARCHAR2(20) NOT NULL CHECK (kind IN ('OPENING', 'DEPOSIT', 'WITHDRAWAL', 'PAYMENT')),
+    amount NUMBER(10,2) NOT NULL CHECK(amount > 0),
+    reference_id INT,
+    created_at DATE DEFAULT SYSDATE NOT NULL
+)
+/
+
+CREATE TABLE ledger_entry (
+    id INT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    transfer_id INT NOT NULL,
+    account_id INT,
+    amount NUMBER(10,2) NOT NULL,
+    created_at DATE DEFAULT SYSDATE NOT NULL,
+    FOREIGN KEY (transfer_id) REFERENCES ledger_transfer(id)
+)
+/
+
+CREATE INDEX ix_ledger_entry_account ON ledger_entry (account_id, created_at)
+/
+
+CREATE INDEX ix_ledger_entry_transfer ON ledger_entry (transfer_id)
+/
+
+CREATE TABLE balance_snapshot (
+    account_id INT NOT NULL,
+    taken_through DATE NOT NULL,
+    balance NUMBER(14,2) NOT NULL,
+    PRIMARY KEY (account_id, taken_through)
+)
+/
+
+INSERT INTO ledger_transfer (kind, amount, reference_id)
+SELECT 'OPENING', a.balance + CASE WHEN a.account_type = 'SYSTEM' THEN (SELECT NVL(SUM(c.amount), 0) FROM system_credit c) ELSE 0 END, a.id
+FROM cash_account a
+WHERE a.balance + CASE WHEN a.account_type = 'SYSTEM' THEN (SELECT NVL(SUM(c.amount), 0) FROM system_credit c) ELSE 0 END > 0
+/
+
+INSERT INTO ledger_entry (transfer_id, account_id, amount)
+SELECT id, reference_id, amount FROM ledger_transfer WHERE kind = 'OPENING'
+UNION ALL
+SELECT id, NULL, -amount FROM ledger_transfer WHERE kind = 'OPENING'
+/
@@ -0,0 +1,120 @@
+CREATE OR REPLACE PACKAGE reservation_api AS
+    TYPE id_list IS TABLE OF NUMBER INDEX BY PLS_INTEGER;
+    TYPE amount_list IS TABLE OF NUMBER INDEX BY PLS_INTEGER;
+
+    PROCEDURE book(
+        p_customer_id IN NUMBER,
+        p_start_time IN DATE,
+        p_end_time IN DATE,
+        p_hall_ids IN id_list,
+        p_service_ids IN id_list,
+        p_service_amounts IN amount_list,
+        p_rate_factor IN NUMBER,
+        p_team_discount IN NUMBER,
+        p_reservation_id OUT NUMBER,
+        p_total_price OUT NUMBER,
+        p_conflict OUT VARCHAR2
+    );
+END reservation_api;
+/
+
+CREATE OR REPLACE PACKAGE BODY reservation_api AS
+    PROCEDURE book(
+        p_customer_id IN NUMBER,
+        p_start_time IN DATE,
+        p_end_time IN DATE,
+        p_hall_ids IN id_list,
+        p_service_ids IN id_list,
+        p_service_amounts IN amount_list,
+        p_rate_factor IN NUMBER,
+        p_team_discount IN NUMBER,
+        p_reservation_id OUT NUMBER,
+        p_total_price OUT NUMBER,
+        p_conflict OUT VARCHAR2
+    ) IS
+        v_hours NUMBER := (p_end_time - p_start_time) * 24;
+        v_service_hours NUMBER := TRUNC((p_end_time - p_start_time) * 24);
+        v_name hall.name%TYPE;
+        v_rate hall.hourly_rate%TYPE;
+        v_busy NUMBER;
+        v_used NUMBER;
+        v_new_halls NUMBER := 0;
+        v_new_services NUMBER := 0;
+        v_new_customer NUMBER;
+        v_services id_list;
+        v_customer_type customer.customer_type%TYPE;
+        v_count PLS_INTEGER := 0;
+    BEGIN
+        p_reservation_id := NULL;
+        p_conflict := NULL;
+        p_total_price := 0;
+
+        FOR i IN 1 .. p_hall_ids.COUNT LOOP
+            SELECT name, hourly_rate INTO v_name, v_rate FROM hall WHERE id = p_hall_ids(i) FOR UPDATE;
+
+            SELECT COUNT(*) INTO v_busy
+            FROM reservation r JOIN reservation_hall rh ON rh.reservation_id = r.id
+            WHERE rh.hall_id = p_hall_ids(i) AND r.status <> 'CANCELLED'
+              AND p_start_time < r.end_time AND p_end_time > r.start_time;
+            IF v_busy > 0 THEN
+                p_conflict := v_name;
+                RETURN;
+            END IF;
+
+            SELECT COUNT(*) INTO v_used FROM reservation_hall WHERE hall_id = p_hall_ids(i) AND ROWNUM = 1;
+            v_new_halls := v_new_halls + 1 - v_used;
+            p_total_price := p_total_price + v_rate * v_hours * p_rate_factor;
+        END LOOP;
+
+        FOR i IN 1 .. p_service_ids.COUNT LOOP
+            v_count := v_count + 1;
+            v_services(v_count) := p_service_ids(i);
+            p_total_price := p_total_price + p_service_amounts(i);
+        END LOOP;
+        FOR s IN (SELECT id, price_per_hour FROM service WHERE is_optional = 0) LOOP
+            v_count := v_count + 1;
+            v_services(v_count) := s.id;
+            p_total_price := p_total_price + s.price_per_hour * v_hours;
+        END LOOP;
+        IF p_team_discount > 0 THEN
+            SELECT customer_type INTO v_customer_type FROM customer WHERE id = p_customer_id;
+            IF v_customer_type = 'TEAM' THEN
+                p_total_price := p_total_price * (1 - p_team_discount);
+            END IF;
+        END IF;
+        p_total_price := ROUND(p_total_price, 2);
+
+        FOR i IN 1 .. v_count LOOP
+            SELECT COUNT(*) INTO v_used FROM reservation_service WHERE service_id = v_services(i) AND ROWNUM = 1;
+            v_new_services := v_new_services + 1 - v_used;
+        END LOOP;
+        SELECT COUNT(*) INTO v_used FROM reservation WHERE customer_id = p_customer_id AND ROWNUM = 1;
+        v_new_customer := 1 - v_used;
+
+        UPDATE reservation_summary SET
+            total_reservations = total_reservations + 1,
+            active_reservations = active_reservations + 1,
+            min_reservation_price = LEAST(NVL(min_reservation_price, p_total_price), p_total_price),
+            max_reservation_price = GREATEST(NVL(max_reservation_price, p_total_price), p_total_price),
+            reservation_price_sum = reservation_price_sum + p_total_price,
+            priced_reservations = priced_reservations + 1,
+            unique_customers = unique_customers + v_new_customer,
+            used_halls = used_halls + v_new_halls,
+            used_services = used_services + v_new_services,
+            total_service_hours = total_service_hours + v_service_hours * v_count
+        WHERE id = 1;
+
+        INSERT INTO reservation (customer_id, start_time, end_time, total_price, status)
+        VALUES (p_customer_id, p_start_time, p_end_time, p_total_price, 'CREATED')
+        RETURNING id INTO p_reservation_id;
+
+        FORALL i IN 1 .. v_count
+            INSERT INTO reservation_service (reservation_id, service_id, hours)
+            VALUES (p_reservation_id, v_services(i), v_service_hours);
+
+        FORALL i IN 1 .. p_hall_ids.COUNT
+            INSERT INTO reservation_hall (reservation_id, hall_id)
+            VALUES (p_reservation_id, p_hall_ids(i));
+    END book;
+END reservation_api;
+/
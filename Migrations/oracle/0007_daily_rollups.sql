@@ -0,0 +1,46 @@
+CREATE TABLE daily_hall_usage (
+    day DATE NOT NULL,
+    hall_id INT NOT NULL,
+    bookings INT NOT NULL,
+    booked_hours NUMBER(12,2) NOT NULL,
+    revenue NUMBER(14,2) NOT NULL,
+    PRIMARY KEY (day, hall_id)
+)
+/
+
+CREATE TABLE daily_service_usage (
+    day DATE NOT NULL,
+    service_id INT NOT NULL,
+    bookings INT NOT NULL,
+    booked_hours NUMBER(12,2) NOT NULL,
+    revenue NUMBER(14,2) NOT NULL,
+    PRIMARY KEY (day, service_id)
+)
+/
+
+CREATE TABLE rollup_dirty_day (
+    id INT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    day DATE NOT NULL,
+    claimed NUMBER(1) DEFAULT 0 NOT NULL CHECK (claimed IN (0,1))
+)
+/
+
+CREATE INDEX ix_rollup_dirty_day_claimed ON rollup_dirty_day (claimed, day)
+/
+
+CREATE OR REPLACE TRIGGER reservation_rollup_dirty
+AFTER INSERT OR DELETE OR UPDATE OF start_time, end_time, total_price ON reservation
+FOR EACH ROW
+BEGIN
+    IF INSERTING OR UPDATING THEN
+        INSERT INTO rollup_dirty_day (day) VALUES (TRUNC(:NEW.start_time));
+    END IF;
+    IF DELETING OR UPDATING THEN
+        INSERT INTO rollup_dirty_day (day) VALUES (TRUNC(:OLD.start_time));
+    END IF;
+END;
+/
+
+INSERT INTO rollup_dirty_day (day)
+SELECT DISTINCT TRUNC(start_time) FROM reservation
+/
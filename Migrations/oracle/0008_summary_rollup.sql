@@ -0,0 +1,116 @@
+CREATE TABLE daily_reservation_usage (
+    day DATE PRIMARY KEY,
+    reservations INT NOT NULL,
+    active_reservations INT NOT NULL,
+    priced_reservations INT NOT NULL,
+    booked_hours NUMBER(12,2) NOT NULL,
+    revenue NUMBER(14,2) NOT NULL,
+    service_hours NUMBER(12,2) NOT NULL
+)
+/
+
+CREATE INDEX ix_reservation_price ON reservation (total_price)
+/
+
+CREATE OR REPLACE PACKAGE BODY reservation_api AS
+    PROCEDURE book(
+        p_customer_id IN NUMBER,
+        p_start_time IN DATE,
+        p_end_time IN DATE,
+        p_hall_ids IN id_list,
+        p_service_ids IN id_list,
+        p_service_amounts IN amount_list,
+        p_rate_factor IN NUMBER,
+        p_team_discount IN NUMBER,
+        p_reservation_id OUT NUMBER,
+        p_total_price OUT NUMBER,
+        p_conflict OUT VARCHAR2
+    ) IS
+        v_hours NUMBER := (p_end_time - p_start_time) * 24;
+        v_service_hours NUMBER := TRUNC((p_end_time - p_start_time) * 24);
+        v_name hall.name%TYPE;
+        v_rate hall.hourly_rate%TYPE;
+        v_busy NUMBER;
+        v_services id_list;
+        v_customer_type customer.customer_type%TYPE;
+        v_count PLS_INTEGER := 0;
+    BEGIN
+        p_reservation_id := NULL;
+        p_conflict := NULL;
+        p_total_price := 0;
+
+        FOR i IN 1 .. p_hall_ids.COUNT LOOP
+            SELECT name, hourly_rate INTO v_name, v_rate FROM hall WHERE id = p_hall_ids(i) FOR UPDATE;
+
+            SELECT COUNT(*) INTO v_busy
+            FROM reservation r JOIN reservation_hall rh ON rh.reservation_id = r.id
+            WHERE rh.hall_id = p_hall_ids(i) AND r.status <> 'CANCELLED'
+              AND p_start_time < r.end_time AND p_end_time > r.start_time;
+            IF v_busy > 0 THEN
+                p_conflict := v_name;
+                RETURN;
+            END IF;
+
+            p_total_price := p_total_price + v_rate * v_hours * p_rate_factor;
+        END LOOP;
+
+        FOR i IN 1 .. p_service_ids.COUNT LOOP
+            v_count := v_count + 1;
+            v_services(v_count) := p_service_ids(i);
+            p_total_price := p_total_price + p_service_amounts(i);
+        END LOOP;
+        FOR s IN (SELECT id, price_per_hour FROM service WHERE is_optional = 0) LOOP
+            v_count := v_count + 1;
+            v_services(v_count) := s.id;
+            p_total_price := p_total_price + s.price_per_hour * v_hours;
+        END LOOP;
+        IF p_team_discount > 0 THEN
+            SELECT customer_type INTO v_customer_type FROM customer WHERE id = p_customer_id;
+            IF v_customer_type = 'TEAM' THEN
+                p_total_price := p_total_price * (1 - p_team_discount);
+            END IF;
+        END IF;
+        p_total_price := ROUND(p_total_price, 2);
+
+        INSERT INTO reservation (customer_id, start_time, end_time, total_price, status)
+        VALUES (p_customer_id, p_start_time, p_end_time, p_total_price, 'CREATED')
+        RETURNING id INTO p_reservation_id;
+
+        FORALL i IN 1 .. v_count
+            INSERT INTO reservation_service (reservation_id, service_id, hours)
+            VALUES (p_reservation_id, v_services(i), v_service_hours);
+
+        FORALL i IN 1 .. p_hall_ids.COUNT
+            INSERT INTO reservation_hall (reservation_id, hall_id)
+            VALUES (p_reservation_id, p_hall_ids(i));
+    END book;
+END reservation_api;
+/
+
+DELETE FROM daily_hall_usage
+/
+
+DELETE FROM daily_service_usage
+/
+
+DELETE FROM rollup_dirty_day
+/
+
+INSERT INTO rollup_dirty_day (day)
+SELECT DISTINCT TRUNC(start_time) FROM reservation
+/
+
+UPDATE reservation_summary SET
+    total_reservations = 0,
+    active_reservations = 0,
+    min_reservation_price = NULL,
+    max_reservation_price = NULL,
+    reservation_price_sum = 0,
+    priced_reservations = 0,
+    unique_customers = 0,
+    used_halls = 0,
+    used_services = 0,
+    total_service_hours = 0,
+    refreshed_at = NULL
+WHERE id = 1
+/
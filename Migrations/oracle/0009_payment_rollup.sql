@@ -0,0 +1,29 @@
+ALTER TABLE daily_reservation_usage ADD (
+    payments INT DEFAULT 0 NOT NULL,
+    paid_amount NUMBER(14,2) DEFAULT 0 NOT NULL
+)
+/
+
+CREATE OR REPLACE TRIGGER payment_rollup_dirty
+AFTER INSERT OR DELETE OR UPDATE OF amount ON payment
+FOR EACH ROW
+BEGIN
+    IF INSERTING OR UPDATING THEN
+        INSERT INTO rollup_dirty_day (day) SELECT TRUNC(start_time) FROM reservation WHERE id = :NEW.reservation_id;
+    END IF;
+    IF DELETING THEN
+        INSERT INTO rollup_dirty_day (day) SELECT TRUNC(start_time) FROM reservation WHERE id = :OLD.reservation_id;
+    END IF;
+END;
+/
+
+INSERT INTO rollup_dirty_day (day)
+SELECT DISTINCT TRUNC(start_time) FROM reservation
+/
+
+UPDATE reservation_summary SET
+    total_paid_amount = 0,
+    total_payments = 0,
+    refreshed_at = NULL
+WHERE id = 1
+/
@@ -0,0 +1,95 @@
+ALTER TABLE reservation_service ADD amount NUMBER(12,2)
+/
+
+CREATE OR REPLACE PACKAGE BODY reservation_api AS
+    PROCEDURE book(
+        p_customer_id IN NUMBER,
+        p_start_time IN DATE,
+        p_end_time IN DATE,
+        p_hall_ids IN id_list,
+        p_service_ids IN id_list,
+        p_service_amounts IN amount_list,
+        p_rate_factor IN NUMBER,
+        p_team_discount IN NUMBER,
+        p_reservation_id OUT NUMBER,
+        p_total_price OUT NUMBER,
+        p_conflict OUT VARCHAR2
+    ) IS
+        v_hours NUMBER := (p_end_time - p_start_time) * 24;
+        v_service_hours NUMBER := TRUNC((p_end_time - p_start_time) * 24);
+        v_name hall.name%TYPE;
+        v_rate hall.hourly_rate%TYPE;
+        v_busy NUMBER;
+        v_services id_list;
+        v_amounts amount_list;
+        v_customer_type customer.customer_type%TYPE;
+        v_count PLS_INTEGER := 0;
+    BEGIN
+        p_reservation_id := NULL;
+        p_conflict := NULL;
+        p_total_price := 0;
+
+        FOR i IN 1 .. p_hall_ids.COUNT LOOP
+            SELECT name, hourly_rate INTO v_name, v_rate FROM hall WHERE id = p_hall_ids(i) FOR UPDATE;
+
+            SELECT COUNT(*) INTO v_busy
+            FROM reservation r JOIN reservation_hall rh ON rh.reservation_id = r.id
+            WHERE rh.hall_id = p_hall_ids(i) AND r.status <> 'CANCELLED'
+              AND p_start_time < r.end_time AND p_end_time > r.start_time;
+            IF v_busy > 0 THEN
+                p_conflict := v_name;
+                RETURN;
+            END IF;
+
+            p_total_price := p_total_price + v_rate * v_hours * p_rate_factor;
+        END LOOP;
+
+        FOR i IN 1 .. p_service_ids.COUNT LOOP
+            v_count := v_count + 1;
+            v_services(v_count) := p_service_ids(i);
+            v_amounts(v_count) := p_service_amounts(i);
+            p_total_price := p_total_price + p_service_amounts(i);
+        END LOOP;
+        FOR s IN (SELECT id, price_per_hour FROM service WHERE is_optional = 0) LOOP
+            v_count := v_count + 1;
+            v_services(v_count) := s.id;
+            v_amounts(v_count) := s.price_per_hour * v_hours;
+            p_total_price := p_total_price + s.price_per_hour * v_hours;
+        END LOOP;
+        IF p_team_discount > 0 THEN
+            SELECT customer_type INTO v_customer_type FROM customer WHERE id = p_customer_id;
+            IF v_customer_type = 'TEAM' THEN
+                p_total_price := p_total_price * (1 - p_team_discount);
+                FOR i IN 1 .. v_count LOOP
+                    v_amounts(i) := v_amounts(i) * (1 - p_team_discount);
+                END LOOP;
+            END IF;
+        END IF;
+        p_total_price := ROUND(p_total_price, 2);
+
+        INSERT INTO reservation (customer_id, start_time, end_time, total_price, status)
+        VALUES (p_customer_id, p_start_time, p_end_time, p_total_price, 'CREATED')
+        RETURNING id INTO p_reservation_id;
+
+        FORALL i IN 1 .. v_count
+            INSERT INTO reservation_service (reservation_id, service_id, hours, amount)
+            VALUES (p_reservation_id, v_services(i), v_service_hours, ROUND(v_amounts(i), 2));
+
+        FORALL i IN 1 .. p_hall_ids.COUNT
+            INSERT INTO reservation_hall (reservation_id, hall_id)
+            VALUES (p_reservation_id, p_hall_ids(i));
+    END book;
+END reservation_api;
+/
+
+-- Mandatory services are charged like a new booking: hourly price times the exact reservation length.
+-- Optional services keep the stored hours times the price: the hours chosen at booking and the team
+-- discount then in effect were never stored, so those amounts can differ from what was charged.
+UPDATE reservation_service rs
+SET amount = ROUND((SELECT CASE WHEN s.is_optional = 1 THEN rs.hours ELSE (SELECT (r.end_time - r.start_time) * 24 FROM reservation r WHERE r.id = rs.reservation_id) END * s.price_per_hour
+                    FROM service s WHERE s.id = rs.service_id), 2)
+/
+
+INSERT INTO rollup_dirty_day (day)
+SELECT DISTINCT TRUNC(start_time) FROM reservation
+/
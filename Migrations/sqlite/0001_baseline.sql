@@ -0,0 +1,190 @@
+CREATE TABLE dual (
+    dummy VARCHAR(1)
+)
+/
+
+INSERT INTO dual (dummy) VALUES ('X')
+/
+
+CREATE TABLE cash_account (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    account_type VARCHAR(20) NOT NULL CHECK (account_type IN ('CUSTOMER', 'SYSTEM')),
+    balance REAL NOT NULL CHECK (balance >= 0),
+    CONSTRAINT too_large_balance CHECK (balance < 100000000)
+)
+/
+
+CREATE UNIQUE INDEX ux_one_system_account
+ON cash_account (account_type) WHERE account_type = 'SYSTEM'
+/
+
+CREATE TABLE customer (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    account_id INTEGER NOT NULL,
+    name VARCHAR(100) NOT NULL CHECK (REGEXP_LIKE(name, '^[a-zA-ZĚŠČŘŽÝÁÍÉÚŮŇĎŤÓěščřžýáíéúňďťó0-9 ]+$')),
+    email VARCHAR(100) NOT NULL CHECK (REGEXP_LIKE(email, '^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$')) UNIQUE,
+    phone VARCHAR(15) NOT NULL CHECK (REGEXP_LIKE(phone, '^\+?[0-9]{9,15}$')),
+    customer_type VARCHAR(20) NOT NULL CHECK (customer_type IN ('INDIVIDUAL', 'TEAM')),
+    is_active INTEGER DEFAULT 1 CHECK (is_active IN (0,1)),
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    CONSTRAINT too_large_name CHECK (length(name) <= 100),
+    CONSTRAINT too_large_email CHECK (length(email) <= 100),
+    CONSTRAINT too_large_phone CHECK (length(phone) <= 15),
+    FOREIGN KEY (account_id) REFERENCES cash_account(id) ON DELETE CASCADE
+)
+/
+
+CREATE TABLE hall (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name VARCHAR(100) NOT NULL UNIQUE CHECK (REGEXP_LIKE(name, '^[a-zA-ZĚŠČŘŽÝÁÍÉÚŮŇĎŤÓěščřžýáíéúňďťó0-9 ]+$')),
+    sport_type VARCHAR(30) NOT NULL CHECK (sport_type IN ('FOOTBALL', 'BASKETBALL', 'VOLLEYBALL', 'BADMINTON', 'HANDBALL', 'FLORBALL')),
+    hourly_rate REAL NOT NULL CHECK(hourly_rate >=0),
+    capacity INTEGER NOT NULL CHECK(capacity > 0),
+    CONSTRAINT too_large_name CHECK (length(name) <= 100),
+    CONSTRAINT too_large_hourly_rate CHECK (hourly_rate < 1000000)
+)
+/
+
+CREATE TABLE reservation (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    customer_id INTEGER NOT NULL,
+    start_time TIMESTAMP NOT NULL,
+    end_time TIMESTAMP NOT NULL,
+    status VARCHAR(20) NOT NULL CHECK (status IN ('CREATED', 'CONFIRMED')),
+    total_price REAL CHECK(total_price >= 0),
+    CHECK(start_time < end_time),
+    CONSTRAINT too_large_total_price CHECK (total_price < 100000000),
+    FOREIGN KEY (customer_id) REFERENCES customer(id) ON DELETE SET NULL
+)
+/
+
+CREATE TABLE reservation_hall (
+    reservation_id INTEGER NOT NULL,
+    hall_id INTEGER NOT NULL,
+    PRIMARY KEY (reservation_id, hall_id),
+    FOREIGN KEY (reservation_id) REFERENCES reservation(id) ON DELETE CASCADE,
+    FOREIGN KEY (hall_id) REFERENCES hall(id) ON DELETE CASCADE
+)
+/
+
+CREATE TABLE service (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name VARCHAR(100) NOT NULL UNIQUE CHECK (REGEXP_LIKE(name, '^[a-zA-ZĚŠČŘŽÝÁÍÉÚŮŇĎŤÓěščřžýáíéúňďťó0-9 ]+$')),
+    price_per_hour REAL NOT NULL CHECK(price_per_hour >=0),
+    is_optional INTEGER DEFAULT 1 CHECK (is_optional IN (0,1)),
+    CONSTRAINT too_large_name CHECK (length(name) <= 100),
+    CONSTRAINT too_large_price_per_hour CHECK (price_per_hour < 1000000)
+)
+/
+
+CREATE TABLE reservation_service (
+    reservation_id INTEGER NOT NULL,
+    service_id INTEGER NOT NULL,
+    hours REAL NOT NULL CHECK(hours > 0),
+    PRIMARY KEY (reservation_id, service_id),
+    CONSTRAINT too_large_hours CHECK (hours < 1000),
+    FOREIGN KEY (reservation_id) REFERENCES reservation(id) ON DELETE CASCADE,
+    FOREIGN KEY (service_id) REFERENCES service(id) ON DELETE CASCADE
+)
+/
+
+CREATE TABLE payment (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    reservation_id INTEGER NOT NULL,
+    amount REAL NOT NULL CHECK(amount > 0),
+    paid_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    CONSTRAINT too_large_amount CHECK (amount < 100000000),
+    FOREIGN KEY (reservation_id) REFERENCES reservation(id) ON DELETE SET NULL
+)
+/
+
+INSERT INTO cash_account (account_type, balance)
+SELECT 'SYSTEM', 0
+FROM dual
+WHERE NOT EXISTS (
+    SELECT 1 FROM cash_account WHERE account_type = 'SYSTEM'
+)
+/
+
+CREATE VIEW free_halls_view AS
+SELECT h.id AS hall_id,
+       h.name AS hall_name,
+       h.sport_type,
+       h.hourly_rate,
+       h.capacity
+FROM hall h
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM reservation_hall rh
+    JOIN reservation r ON rh.reservation_id = r.id
+    WHERE rh.hall_id = h.id
+      AND r.status <> 'CANCELLED'
+      AND r.start_time <= datetime('now', 'localtime')
+      AND r.end_time   >= datetime('now', 'localtime')
+)
+/
+
+CREATE VIEW reservation_details_view AS
+SELECT r.id AS reservation_id,
+       r.start_time,
+       r.end_time,
+       r.status,
+       r.total_price,
+       c.id AS customer_id,
+       c.name AS customer_name,
+       c.email,
+       h.id AS hall_id,
+       h.name AS hall_name
+FROM reservation r
+JOIN customer c ON r.customer_id = c.id
+JOIN reservation_hall rh ON rh.reservation_id = r.id
+JOIN hall h ON rh.hall_id = h.id
+/
+
+CREATE VIEW reservation_summary_view AS
+SELECT
+    (SELECT COUNT(*) FROM reservation) AS total_reservations,
+    (SELECT COUNT(*) FROM reservation WHERE status <> 'CANCELLED') AS active_reservations,
+    (SELECT MIN(total_price) FROM reservation) AS min_reservation_price,
+    (SELECT MAX(total_price) FROM reservation) AS max_reservation_price,
+    (SELECT ROUND(AVG(total_price), 2) FROM reservation) AS avg_reservation_price,
+
+    (SELECT IFNULL(SUM(p.amount), 0) FROM payment p JOIN reservation r ON r.id = p.reservation_id) AS total_paid_amount,
+    (SELECT COUNT(*) FROM payment p JOIN reservation r ON r.id = p.reservation_id) AS total_payments,
+    (SELECT ROUND(AVG(p.amount), 2) FROM payment p JOIN reservation r ON r.id = p.reservation_id) AS avg_payment,
+
+    (SELECT COUNT(DISTINCT customer_id) FROM reservation) AS unique_customers,
+
+    (SELECT COUNT(DISTINCT hall_id) FROM reservation_hall) AS used_halls,
+
+    (SELECT COUNT(DISTINCT service_id) FROM reservation_service) AS used_services,
+    (SELECT IFNULL(SUM(hours), 0) FROM reservation_service) AS total_service_hours
+
+FROM dual
+/
+
+CREATE TABLE reservation_summary (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    total_reservations INTEGER DEFAULT 0 NOT NULL,
+    active_reservations INTEGER DEFAULT 0 NOT NULL,
+    min_reservation_price REAL,
+    max_reservation_price REAL,
+    reservation_price_sum REAL DEFAULT 0 NOT NULL,
+    priced_reservations INTEGER DEFAULT 0 NOT NULL,
+    total_paid_amount REAL DEFAULT 0 NOT NULL,
+    total_payments INTEGER DEFAULT 0 NOT NULL,
+    unique_customers INTEGER DEFAULT 0 NOT NULL,
+    used_halls INTEGER DEFAULT 0 NOT NULL,
+    used_services INTEGER DEFAULT 0 NOT NULL,
+    total_service_hours REAL DEFAULT 0 NOT NULL,
+    refreshed_at TIMESTAMP
+)
+/
+
+INSERT INTO reservation_summary (id)
+SELECT 1
+FROM dual
+WHERE NOT EXISTS (
+    SELECT 1 FROM reservation_summary
+)
+/
@@ -0,0 +1,8 @@
+CREATE TABLE system_credit (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    amount REAL NOT NULL CHECK(amount > 0),
+    rolled_up INTEGER DEFAULT 0 NOT NULL CHECK (rolled_up IN (0,1)),
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    CONSTRAINT too_large_amount CHECK (amount < 100000000)
+)
+/
@@ -0,0 +1,46 @@
+CREATE TABLE ledger_transfer (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind VARCHAR(20) NOT NULL CHECK (kind IN ('OPENING', 'DEPOSIT', 'WITHDRAWAL', 'PAYMENT')),
+    amount REAL NOT NULL CHECK(amount > 0),
+    reference_id INT,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')) NOT NULL,
+    CONSTRAINT too_large_amount CHECK (amount < 100000000)
+)
+/
+
+CREATE TABLE ledger_entry (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    transfer_id INT NOT NULL,
+    account_id INT,
+    amount REAL NOT NULL,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')) NOT NULL,
+    CONSTRAINT too_large_amount CHECK (amount > -100000000 AND amount < 100000000),
+    FOREIGN KEY (transfer_id) REFERENCES ledger_transfer(id)
+)
+/
+
+CREATE INDEX ix_ledger_entry_account ON ledger_entry (account_id, created_at)
+/
+
+CREATE INDEX ix_ledger_entry_transfer ON ledger_entry (transfer_id)
+/
+
+CREATE TABLE balance_snapshot (
+    account_id INT NOT NULL,
+    taken_through TIMESTAMP NOT NULL,
+    balance REAL NOT NULL,
+    PRIMARY KEY (account_id, taken_through)
+)
+/
+
+INSERT INTO ledger_transfer (kind, amount, reference_id)
+SELECT 'OPENING', a.balance + CASE WHEN a.account_type = 'SYSTEM' THEN (SELECT IFNULL(SUM(c.amount), 0) FROM system_credit c) ELSE 0 END, a.id
+FROM cash_account a
+WHERE a.balance + CASE WHEN a.account_type = 'SYSTEM' THEN (SELECT IFNULL(SUM(c.amount), 0) FROM system_credit c) ELSE 0 END > 0
+/
+
+INSERT INTO ledger_entry (transfer_id, account_id, amount)
+SELECT id, reference_id, amount FROM ledger_transfer WHERE kind = 'OPENING'
+UNION ALL
+SELECT id, NULL, -amount FROM ledger_transfer WHERE kind = 'OPENING'
+/
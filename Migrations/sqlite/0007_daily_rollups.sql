@@ -0,0 +1,52 @@
+CREATE TABLE daily_hall_usage (
+    day TIMESTAMP NOT NULL,
+    hall_id INTEGER NOT NULL,
+    bookings INTEGER NOT NULL,
+    booked_hours REAL NOT NULL,
+    revenue REAL NOT NULL,
+    PRIMARY KEY (day, hall_id)
+)
+/
+
+CREATE TABLE daily_service_usage (
+    day TIMESTAMP NOT NULL,
+    service_id INTEGER NOT NULL,
+    bookings INTEGER NOT NULL,
+    booked_hours REAL NOT NULL,
+    revenue REAL NOT NULL,
+    PRIMARY KEY (day, service_id)
+)
+/
+
+CREATE TABLE rollup_dirty_day (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    day TIMESTAMP NOT NULL,
+    claimed INTEGER DEFAULT 0 NOT NULL CHECK (claimed IN (0,1))
+)
+/
+
+CREATE INDEX ix_rollup_dirty_day_claimed ON rollup_dirty_day (claimed, day)
+/
+
+CREATE TRIGGER reservation_rollup_dirty_insert AFTER INSERT ON reservation
+BEGIN
+    INSERT INTO rollup_dirty_day (day) VALUES (datetime(date(NEW.start_time)));
+END
+/
+
+CREATE TRIGGER reservation_rollup_dirty_delete AFTER DELETE ON reservation
+BEGIN
+    INSERT INTO rollup_dirty_day (day) VALUES (datetime(date(OLD.start_time)));
+END
+/
+
+CREATE TRIGGER reservation_rollup_dirty_update AFTER UPDATE OF start_time, end_time, total_price ON reservation
+BEGIN
+    INSERT INTO rollup_dirty_day (day) VALUES (datetime(date(NEW.start_time)));
+    INSERT INTO rollup_dirty_day (day) VALUES (datetime(date(OLD.start_time)));
+END
+/
+
+INSERT INTO rollup_dirty_day (day)
+SELECT DISTINCT datetime(date(start_time)) FROM reservation
+/
@@ -0,0 +1,41 @@
+CREATE TABLE daily_reservation_usage (
+    day TIMESTAMP PRIMARY KEY,
+    reservations INTEGER NOT NULL,
+    active_reservations INTEGER NOT NULL,
+    priced_reservations INTEGER NOT NULL,
+    booked_hours REAL NOT NULL,
+    revenue REAL NOT NULL,
+    service_hours REAL NOT NULL
+)
+/
+
+CREATE INDEX ix_reservation_price ON reservation (total_price)
+/
+
+DELETE FROM daily_hall_usage
+/
+
+DELETE FROM daily_service_usage
+/
+
+DELETE FROM rollup_dirty_day
+/
+
+INSERT INTO rollup_dirty_day (day)
+SELECT DISTINCT datetime(date(start_time)) FROM reservation
+/
+
+UPDATE reservation_summary SET
+    total_reservations = 0,
+    active_reservations = 0,
+    min_reservation_price = NULL,
+    max_reservation_price = NULL,
+    reservation_price_sum = 0,
+    priced_reservations = 0,
+    unique_customers = 0,
+    used_halls = 0,
+    used_services = 0,
+    total_service_hours = 0,
+    refreshed_at = NULL
+WHERE id = 1
+/
@@ -0,0 +1,34 @@
+ALTER TABLE daily_reservation_usage ADD COLUMN payments INTEGER DEFAULT 0 NOT NULL
+/
+
+ALTER TABLE daily_reservation_usage ADD COLUMN paid_amount REAL DEFAULT 0 NOT NULL
+/
+
+CREATE TRIGGER payment_rollup_dirty_insert AFTER INSERT ON payment
+BEGIN
+    INSERT INTO rollup_dirty_day (day) SELECT datetime(date(start_time)) FROM reservation WHERE id = NEW.reservation_id;
+END
+/
+
+CREATE TRIGGER payment_rollup_dirty_delete AFTER DELETE ON payment
+BEGIN
+    INSERT INTO rollup_dirty_day (day) SELECT datetime(date(start_time)) FROM reservation WHERE id = OLD.reservation_id;
+END
+/
+
+CREATE TRIGGER payment_rollup_dirty_update AFTER UPDATE OF amount ON payment
+BEGIN
+    INSERT INTO rollup_dirty_day (day) SELECT datetime(date(start_time)) FROM reservation WHERE id = NEW.reservation_id;
+END
+/
+
+INSERT INTO rollup_dirty_day (day)
+SELECT DISTINCT datetime(date(start_time)) FROM reservation
+/
+
+UPDATE reservation_summary SET
+    total_paid_amount = 0,
+    total_payments = 0,
+    refreshed_at = NULL
+WHERE id = 1
+/
@@ -0,0 +1,14 @@
+ALTER TABLE reservation_service ADD COLUMN amount REAL
+/
+
+-- Mandatory services are charged like a new booking: hourly price times the exact reservation length.
+-- Optional services keep the stored hours times the price: the hours chosen at booking and the team
+-- discount then in effect were never stored, so those amounts can differ from what was charged.
+UPDATE reservation_service
+SET amount = ROUND((SELECT CASE WHEN s.is_optional = 1 THEN reservation_service.hours ELSE (SELECT (julianday(r.end_time) - julianday(r.start_time)) * 24 FROM reservation r WHERE r.id = reservation_service.reservation_id) END * s.price_per_hour
+                    FROM service s WHERE s.id = reservation_service.service_id), 2)
+/
+
+INSERT INTO rollup_dirty_day (day)
+SELECT DISTINCT datetime(date(start_time)) FROM reservation
+/
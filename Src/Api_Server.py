@@ -0,0 +1,246 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from Src.Backends.Query_Stats import QueryStats
+from Src.DBconnect import DBconnectError
+from Src.Services.Customer_Service import CustomerServiceException
+from Src.Services.Export import ExportError
+from Src.Services.Import import ImportingError
+from Src.Services.Operation_Service import OperationService, OperationServiceException
+from Src.Services.Reservation_Service import ReservationServiceException
+from Src.Services.Utilization import UtilizationError
+from Src.Table_Gateways.Cash_Account import CashAccountError
+from Src.Table_Gateways.Customer import CustomerError
+from Src.Table_Gateways.Daily_Rollup import DailyRollupError
+from Src.Table_Gateways.Hall import HallError
+from Src.Table_Gateways.Ledger import LedgerError
+from Src.Table_Gateways.Reference_Cache import ReferenceCache
+from Src.Table_Gateways.Reservation import ReservationException
+from Src.Table_Gateways.Service import ServiceException
+
+class ApiServerError(Exception):
+    pass
+
+class HttpError(Exception):
+    def __init__(self, status:int, message:str):
+        super().__init__(message)
+        self.status = status
+
+STATUS_TEXT = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable"
+}
+
+MAX_BODY = 1024 * 1024
+
+CLIENT_ERRORS = (OperationServiceException, ReservationServiceException, CustomerServiceException, UtilizationError,
+                 ExportError, ImportingError, DailyRollupError, CashAccountError, CustomerError, HallError, LedgerError,
+                 ReservationException, ServiceException)
+
+class ApiServer:
+    def __init__(self, db, host:str="127.0.0.1", port:int=8080, workers:int=None, paths:dict=None, import_batch_size:int=1000, rollup_interval:float=0,
+                 snapshot_interval:float=0, settle_seconds:int=300, refresh_interval:float=0):
+        self.db = db
+        self.host = host
+        self.port = port
+        self.workers = workers or db.pool_max
+        self.paths = paths
+        self.import_batch_size = import_batch_size
+        self.rollup_interval = rollup_interval
+        self.snapshot_interval = snapshot_interval
+        self.settle_seconds = settle_seconds
+        self.refresh_interval = refresh_interval
+        self.executor = None
+
+    def serve(self):
+        try:
+            asyncio.run(self._serve())
+        except KeyboardInterrupt:
+            pass
+
+    async def _serve(self):
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="api-worker")
+        jobs = [(self.rollup_interval, {"op": "rollup"}),
+                (self.snapshot_interval, {"op": "snapshot", "settle_seconds": self.settle_seconds}),
+                (self.refresh_interval, {"op": "refresh_rollups"})]
+        tasks = [asyncio.create_task(self.periodic(interval, operation)) for interval, operation in jobs if interval > 0]
+        try:
+            server = await asyncio.start_server(self.handle, self.host, self.port)
+            async with server:
+                await server.serve_forever()
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.executor.shutdown(wait=True)
+
+    async def periodic(self, interval:float, operation:dict):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await loop.run_in_executor(self.executor, self.run_operation, operation)
+            except Exception:
+                continue
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    self.write_response(writer, 400, {"error": "Malformed request line"}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                if "content-length" not in headers and "transfer-encoding" in headers:
+                    self.write_response(writer, 411, {"error": "Content-Length is required"}, False)
+                    break
+                try:
+                    length = int(headers.get("content-length", "0"))
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    self.write_response(writer, 400, {"error": "Invalid Content-Length"}, False)
+                    break
+                if length > MAX_BODY:
+                    self.write_response(writer, 413, {"error": "Request body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                status, payload = await self.dispatch(method.upper(), target, body)
+                self.write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def write_response(self, writer, status:int, payload, keep_alive:bool):
+        body = json.dumps(payload, default=str).encode("utf-8")
+        writer.write((f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'Unknown')}\r\n"
+                      "Content-Type: application/json\r\n"
+                      f"Content-Length: {len(body)}\r\n"
+                      f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode("latin-1") + body)
+
+    async def dispatch(self, method:str, target:str, body:bytes):
+        try:
+            url = urlsplit(target)
+            query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+            segments = [segment for segment in url.path.split("/") if segment]
+
+            if segments == ["stats"] and method == "GET":
+                if not query.get("limit", "20").isdigit():
+                    raise HttpError(400, "limit must be a non-negative integer")
+                return 200, {"pool": self.db.stats(), "cache": ReferenceCache().stats(), "queries": QueryStats().snapshot(int(query.get("limit", 20)))}
+            if segments == ["stats", "reset"] and method == "POST":
+                QueryStats().reset()
+                return 200, {"reset": True}
+
+            status, operation = self.route(method, segments, query, self.parse_body(body))
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self.executor, self.run_operation, operation)
+            return status, result
+        except HttpError as e:
+            return e.status, {"error": str(e)}
+        except DBconnectError as e:
+            return 503, {"error": str(e)}
+        except CLIENT_ERRORS as e:
+            return 400, {"error": str(e)}
+        except Exception:
+            return 500, {"error": "Internal server error"}
+
+    def parse_body(self, body:bytes):
+        if not body:
+            return {}
+        try:
+            data = json.loads(body)
+        except ValueError:
+            raise HttpError(400, "Request body is not valid JSON")
+        if not isinstance(data, dict):
+            raise HttpError(400, "Request body must be a JSON object")
+        return data
+
+    def route(self, method:str, segments:list, query:dict, body:dict):
+        if segments == ["customers"]:
+            self.allow(method, "GET")
+            return 200, {"op": "customers", "after": query.get("after"), "limit": query.get("limit", 100)}
+        if segments == ["halls"]:
+            self.allow(method, "GET")
+            return 200, {"op": "halls"}
+        if segments == ["services"]:
+            self.allow(method, "GET")
+            return 200, {"op": "services"}
+        if segments == ["availability"]:
+            self.allow(method, "GET")
+            return 200, {"op": "slots", "sport": query.get("sport"), "duration": query.get("duration"),
+                         "window_from": query.get("from"), "window_to": query.get("to"),
+                         "min_capacity": query.get("min_capacity", 0), "customer": query.get("customer")}
+        if segments == ["quotes"]:
+            self.allow(method, "POST")
+            return 200, {**body, "op": "quote"}
+        if segments == ["reservations"]:
+            self.allow(method, "POST")
+            return 201, {**body, "op": "reserve"}
+        if len(segments) == 2 and segments[0] == "reservations":
+            self.allow(method, "DELETE")
+            return 200, {"op": "cancel", "reservation": segments[1]}
+        if segments == ["payments"]:
+            self.allow(method, "POST")
+            return 201, {**body, "op": "pay"}
+        if segments == ["system-account"]:
+            self.allow(method, "GET")
+            return 200, {"op": "system_account"}
+        if segments == ["system-account", "rollup"]:
+            self.allow(method, "POST")
+            return 200, {"op": "rollup"}
+        if len(segments) == 3 and segments[0] == "accounts" and segments[2] == "statement":
+            self.allow(method, "GET")
+            return 200, {"op": "statement", "accounts": segments[1], "from": query.get("from"), "to": query.get("to")}
+        if segments == ["ledger", "check"]:
+            self.allow(method, "GET")
+            return 200, {"op": "ledger_check"}
+        if segments == ["utilization"]:
+            self.allow(method, "GET")
+            return 200, {"op": "utilization", "from": query.get("from"), "to": query.get("to"),
+                         "hall": [hall_id for hall_id in query.get("hall", "").split(",") if hall_id]}
+        if segments == ["revenue"]:
+            self.allow(method, "GET")
+            return 200, {"op": "revenue", "from": query.get("from"), "to": query.get("to"), "by": query.get("by"),
+                         "refresh": query.get("refresh", "").lower() in ("1", "true", "yes")}
+        if segments == ["revenue", "refresh"]:
+            self.allow(method, "POST")
+            return 200, {"op": "refresh_rollups"}
+        if segments == ["report"]:
+            self.allow(method, "GET")
+            return 200, {"op": "report", "exact": query.get("exact", "").lower() in ("1", "true", "yes")}
+        raise HttpError(404, "Not found")
+
+    def allow(self, method:str, allowed:str):
+        if method != allowed:
+            raise HttpError(405, f"Method {method} is not allowed here")
+
+    def run_operation(self, operation:dict):
+        with self.db.session() as connection:
+            return OperationService(connection, self.paths, self.import_batch_size).execute(operation)
@@ -1,17 +1,18 @@
 import os
 import sys
 
-from cx_Oracle import DatabaseError
-from Src.Config.Config_load import load_config, load_paths
+from Src.Backends.Query_Stats import QueryStats
+from Src.Config.Config_load import load_config, load_paths, load_pool_config, load_import_config, load_cache_config, load_instrumentation_config, load_pricing_config
 from Src.DBconnect import DBconnect
-from Src.Config.Sql_load import load_sql
+from Src.Config.Sql_load import migrate
 from Src.Services.Customer_Service import CustomerService
 from Src.Services.Import import Import, ImportingError
+from Src.Services.Pricing_Engine import PricingEngine
 from Src.Services.Reservation_Service import ReservationService
 from Src.Table_Gateways.Cash_Account import CashAccount
 from Src.Table_Gateways.Customer import Customer
 from Src.Table_Gateways.Hall import Hall
-from Src.Table_Gateways.Reservation import Reservation
+from Src.Table_Gateways.Reference_Cache import ReferenceCache
 from Src.Table_Gateways.Service import Service
 from Src.UI import UI
 
@@ -28,16 +29,18 @@ def get_base_path():
 
 class App:
     def __init__(self, path_cfg:str="config.ini"):
+        self.db = None
         self.connection = None
         if path_cfg is None:
             self.config_path = os.path.join(get_base_path(), "config.ini")
         else:
             self.config_path = path_cfg
-        self.sql_path = None
+        self.migrations_path = None
         self.import_cash_accounts = None
         self.import_customers = None
         self.import_halls = None
         self.import_services = None
+        self.import_batch_size = 1000
         self.UI = UI()
         self._is_running = False
         self.run()
@@ -67,10 +70,12 @@ class App:
                     raise AppError("Invalid action number")
                 self.UI.clear_console()
                 self.UI.print_line()
+                self.connection = self.db.acquire()
                 self.actions()[chosen_action]()
             except Exception as e:
                 self.UI.message(e)
             finally:
+                self.release_connection()
                 self.UI.user_input("enter", "Press Enter to continue:")
                 self.UI.clear_console()
 
@@ -116,8 +121,9 @@ class App:
     def add_reservation(self):
         try:
             customers = Customer(self.connection).read_all()
-            services_optional = Service(self.connection).read_optional()
-            services_not_optional = Service(self.connection).read_not_optional()
+            service = Service(self.connection)
+            services_optional = service.read_optional()
+            services_not_optional = service.read_not_optional()
             halls = Hall(self.connection).read_all()
             information = self.UI.reservation_form(customers, services_optional, halls)
             reservation_service = ReservationService(self.connection)
@@ -126,13 +132,27 @@ class App:
         except Exception as e:
             self.UI.message(e)
 
+    def add_reservation_series(self):
+        try:
+            teams = [customer for customer in Customer(self.connection).read_all() if customer[5] == 'TEAM']
+            service = Service(self.connection)
+            services_optional = service.read_optional()
+            services_not_optional = service.read_not_optional()
+            halls = Hall(self.connection).read_all()
+            information = self.UI.reservation_form(teams, services_optional, halls)
+            series = self.UI.series_form()
+            reservation_service = ReservationService(self.connection)
+            report = reservation_service.create_reservation_series(information["customer_id"], information["start_dt"], information["end_dt"], series["rule"], series["until"], series["exceptions"], information["chosen_services"], services_not_optional, information["halls"])
+            self.UI.print_series_report(report)
+        except Exception as e:
+            self.UI.message(e)
+
     def delete_reservation(self):
         try:
             reservation_service = ReservationService(self.connection)
             reservation_customer = reservation_service.read_reservation_detail()
             information = self.UI.delete_reservation_form(reservation_customer)
-            reservation = Reservation(self.connection)
-            reservation.delete(information)
+            reservation_service.delete_reservation(information)
             self.UI.message("Reservation deleted successfully")
         except Exception as e:
             self.UI.message(e)
@@ -142,11 +162,6 @@ class App:
             reservation_service = ReservationService(self.connection)
             not_paid_reservations = reservation_service.read_not_paid()
             information = self.UI.payment_form(not_paid_reservations)
-            accounts = CashAccount(self.connection)
-
-            if not accounts.check_balance(information["account_id"], information["total_price"]):
-                raise Exception("Insufficient funds on customer's account")
-
             reservation_service.pay_and_transfer(information["reservation_id"], information["account_id"], information["total_price"])
             self.UI.message("Reservation paid successfully")
         except Exception as e:
@@ -160,18 +175,26 @@ class App:
         except Exception as e:
             self.UI.message(e)
 
+    def find_free_slots(self):
+        try:
+            information = self.UI.free_slots_form()
+            reservation_service = ReservationService(self.connection)
+            slots = reservation_service.find_free_slots(information["sport_type"], information["duration"], information["windows"], min_capacity=information["min_capacity"])
+            self.UI.print_free_slots(slots)
+        except Exception as e:
+            self.UI.message(e)
+
     def view_reservations_detail(self):
         try:
             reservation_service = ReservationService(self.connection)
-            reservations = reservation_service.read_reservation_detail()
-            self.UI.print_reservations_detailed(reservations)
+            self.UI.print_reservations_detailed(reservation_service.iter_reservation_detail())
         except Exception as e:
             self.UI.message(e)
 
     def view_report(self):
         try:
             reservation_service = ReservationService(self.connection)
-            data = reservation_service.report()
+            data = reservation_service.report(exact=True)
             self.UI.print_report(data)
         except Exception as e:
             self.UI.message(e)
@@ -179,17 +202,29 @@ class App:
     def view_customers(self):
         try:
             customer_service = CustomerService(self.connection)
-            data = customer_service.read_customers_and_balance()
-            self.UI.print_customers(data)
+            self.UI.print_customers(customer_service.iter_customers_and_balance())
+        except Exception as e:
+            self.UI.message(e)
+
+    def view_stats(self):
+        try:
+            self.UI.print_stats("SESSION POOL", self.db.stats())
+            self.UI.print_stats("REFERENCE CACHE", ReferenceCache().stats())
+            balance, pending = CashAccount(self.connection).read_system_balance()
+            self.UI.print_stats("SYSTEM ACCOUNT", {"balance": balance, "pending_credits": pending})
+            self.UI.print_query_stats(QueryStats().snapshot(10))
         except Exception as e:
             self.UI.message(e)
 
     def import_data(self):
         try:
-            import_class = Import(self.connection)
-            import_class.import_csv("customer",self.import_customers)
-            import_class.import_csv("hall",self.import_halls)
-            import_class.import_csv("service",self.import_services)
+            import_class = Import(self.connection, self.import_batch_size)
+            rejected = {
+                "customer": import_class.import_csv("customer",self.import_customers),
+                "hall": import_class.import_csv("hall",self.import_halls),
+                "service": import_class.import_csv("service",self.import_services)
+            }
+            self.UI.print_import_report(rejected)
             self.UI.message("Import completed successfully")
         except ImportingError as e:
             if str(e) == "Already exists":
@@ -202,10 +237,13 @@ class App:
     def load_paths(self):
         try:
             paths = load_paths()
+            import_cfg = load_import_config(self.config_path)
         except Exception as e:
             raise AppConfigError("Configuration error: "+ str(e))
 
-        self.sql_path = paths["db_code"]
+        self.import_batch_size = import_cfg["batch_size"]
+
+        self.migrations_path = paths["migrations"]
         self.import_customers = paths["import_customer"]
         self.import_halls = paths["import_hall"]
         self.import_services = paths["import_service"]
@@ -213,18 +251,31 @@ class App:
     def db_load_connect(self):
         try:
             cfg = load_config(self.config_path)
+            pool_cfg = load_pool_config(self.config_path)
+            cache_cfg = load_cache_config(self.config_path)
+            instrumentation_cfg = load_instrumentation_config(self.config_path)
+            pricing_cfg = load_pricing_config(self.config_path)
         except Exception as e:
             raise AppConfigError("Configuration error: "+ str(e))
 
-        db = DBconnect(cfg["user"], cfg["password"], cfg["dsn"], cfg["encoding"])
-        self.connection = db.connect()
+        ReferenceCache(cache_cfg["ttl"])
+        PricingEngine().configure(pricing_cfg)
+        QueryStats().configure(instrumentation_cfg["enabled"], instrumentation_cfg["slow_threshold_ms"], instrumentation_cfg["slow_log"])
+
+        self.db = DBconnect(cfg["user"], cfg["password"], cfg["dsn"], cfg["encoding"],
+                            pool_cfg["min"], pool_cfg["max"], pool_cfg["increment"], pool_cfg["wait_timeout"], cfg["backend"], pool_cfg["statement_cache"])
+        self.db.create_pool()
         try:
-            load_result = load_sql(self.connection, self.sql_path)
-            if type(load_result) == Exception or type(load_result) == DatabaseError:
-                raise AppConfigError(str(load_result))
+            with self.db.session() as connection:
+                migrate(connection, self.migrations_path)
         except Exception as e:
             raise AppConfigError("Error when importing database: "+ str(e))
 
+    def release_connection(self):
+        if self.db and self.connection:
+            self.db.release(self.connection)
+        self.connection = None
+
     def actions(self):
         return {
             "0": self.shutdown,
@@ -239,11 +290,15 @@ class App:
             "9": self.view_now_available_halls,
             "10": self.view_reservations_detail,
             "11": self.import_data,
-            "12": self.view_report
+            "12": self.view_report,
+            "13": self.view_stats,
+            "14": self.find_free_slots,
+            "15": self.add_reservation_series
         }
 
     def shutdown(self, message="Thank you for using our service!"):
-        if self.connection:
-            self.connection.close()
+        self.release_connection()
+        if self.db:
+            self.db.disconnect()
         self.UI.message(message)
         self._is_running = False
\ No newline at end of file
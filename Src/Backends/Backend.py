@@ -0,0 +1,247 @@
+import math
+import time
+from collections import OrderedDict, namedtuple
+
+from Src.Backends.Query_Stats import QueryStats
+
+DUPLICATE = "DUPLICATE"
+CHECK = "CHECK"
+NOT_NULL = "NOT_NULL"
+TOO_LARGE = "TOO_LARGE"
+FOREIGN_KEY = "FOREIGN_KEY"
+NO_TABLE = "NO_TABLE"
+ALREADY_EXISTS = "ALREADY_EXISTS"
+
+INTEGRITY_KINDS = (DUPLICATE, CHECK, NOT_NULL, TOO_LARGE, FOREIGN_KEY)
+
+BatchError = namedtuple("BatchError", ["offset", "kind", "code", "message"])
+
+class BackendError(Exception):
+    pass
+
+class DatabaseError(Exception):
+    def __init__(self, message:str, kind:str=None, code=None):
+        super().__init__(message)
+        self.message = message
+        self.kind = kind
+        self.code = code
+
+class IntegrityError(DatabaseError):
+    pass
+
+def get_backend(name:str):
+    name = (name or "oracle").lower()
+    if name == "oracle":
+        from Src.Backends.Oracle_Backend import OracleBackend
+        return OracleBackend()
+    if name == "sqlite":
+        from Src.Backends.Sqlite_Backend import SqliteBackend
+        return SqliteBackend()
+    raise BackendError(f"Unknown database backend: {name}")
+
+class Backend:
+    name = None
+    driver_errors = ()
+    reuse_cursors = False
+    stored_procedures = False
+
+    def create_pool(self, user, passwd, dsn, encoding, pool_min:int, pool_max:int, pool_increment:int, wait_timeout:int, statement_cache:int):
+        raise NotImplementedError
+
+    def classify(self, error):
+        raise NotImplementedError
+
+    def translate(self, sql:str):
+        return sql
+
+    def error(self, error):
+        kind, code, message = self.classify(error)
+        if kind in INTEGRITY_KINDS:
+            return IntegrityError(message, kind, code)
+        return DatabaseError(message, kind, code)
+
+    def cursor(self, connection):
+        return connection.cursor()
+
+    def before_execute(self, connection, sql:str):
+        pass
+
+    def set_fetch_size(self, cursor, rows:int):
+        cursor.arraysize = rows
+
+    def var(self, cursor, kind:type):
+        raise NotImplementedError
+
+    def array(self, cursor, kind:type, values:list):
+        raise NotImplementedError
+
+    def insert_returning_id(self, cursor, sql:str, params, column:str):
+        raise NotImplementedError
+
+    def insert_many_returning_ids(self, cursor, sql:str, rows:list, column:str):
+        raise NotImplementedError
+
+    def executemany_batch_errors(self, cursor, sql:str, rows:list):
+        raise NotImplementedError
+
+class Connection:
+    transactional = False
+
+    def __init__(self, backend:Backend, raw, statement_cache:int=0):
+        self.backend = backend
+        self.raw = raw
+        self.stats = QueryStats()
+        self.statement_cache = statement_cache if backend.reuse_cursors else 0
+        self._statements = OrderedDict()
+
+    def cursor(self):
+        try:
+            return Cursor(self, self.backend.cursor(self.raw))
+        except self.backend.driver_errors as e:
+            raise self.backend.error(e) from e
+
+    def _statement(self, sql:str):
+        cursor = self._statements.get(sql)
+        if cursor is not None:
+            self._statements.move_to_end(sql)
+            return cursor
+        cursor = self.cursor()
+        if self.statement_cache:
+            cursor.cached = True
+            self._statements[sql] = cursor
+            if len(self._statements) > self.statement_cache:
+                self._statements.popitem(last=False)
+        return cursor
+
+    def execute(self, sql:str, params=None):
+        return self._statement(sql).execute(sql, params)
+
+    def insert_returning_id(self, sql:str, params, column:str="id"):
+        return self._statement(sql).insert_returning_id(sql, params, column)
+
+    def close_statements(self):
+        statements = list(self._statements.values())
+        self._statements.clear()
+        for cursor in statements:
+            try:
+                cursor.raw.close()
+            except self.backend.driver_errors:
+                pass
+
+    def commit(self):
+        try:
+            self.raw.commit()
+        except self.backend.driver_errors as e:
+            raise self.backend.error(e) from e
+
+    def after_commit(self, callback, *args):
+        callback(*args)
+
+    def rollback(self):
+        try:
+            self.raw.rollback()
+        except self.backend.driver_errors as e:
+            raise self.backend.error(e) from e
+
+class Cursor:
+    def __init__(self, connection:Connection, raw):
+        self.connection = connection
+        self.backend = connection.backend
+        self.stats = connection.stats
+        self.raw = raw
+        self.statement = None
+        self.cached = False
+
+    @property
+    def rowcount(self):
+        return self.raw.rowcount
+
+    @property
+    def description(self):
+        return self.raw.description
+
+    def _run(self, sql:str, call, round_trips:int=1):
+        if not self.stats.enabled:
+            try:
+                self.backend.before_execute(self.connection.raw, sql)
+                return call(self.backend.translate(sql))
+            except self.backend.driver_errors as e:
+                raise self.backend.error(e) from e
+
+        started = time.perf_counter()
+        try:
+            self.backend.before_execute(self.connection.raw, sql)
+            result = call(self.backend.translate(sql))
+        except self.backend.driver_errors as e:
+            self.stats.record_execute(sql, time.perf_counter() - started, 0, round_trips, failed=True)
+            raise self.backend.error(e) from e
+        self.statement = self.stats.record_execute(sql, time.perf_counter() - started, self.raw.rowcount, round_trips)
+        return result
+
+    def _fetch(self, call):
+        if not self.stats.enabled or self.statement is None:
+            try:
+                return call()
+            except self.backend.driver_errors as e:
+                raise self.backend.error(e) from e
+
+        started = time.perf_counter()
+        try:
+            rows = call()
+        except self.backend.driver_errors as e:
+            raise self.backend.error(e) from e
+        count = 1 if rows is not None and not isinstance(rows, list) else len(rows or [])
+        self.stats.record_fetch(self.statement, time.perf_counter() - started, count, math.ceil(count / max(self.raw.arraysize, 1)))
+        return rows
+
+    def execute(self, sql:str, params=None):
+        if params is None:
+            self._run(sql, lambda translated: self.raw.execute(translated))
+        else:
+            self._run(sql, lambda translated: self.raw.execute(translated, params))
+        return self
+
+    def executemany(self, sql:str, rows:list):
+        self._run(sql, lambda translated: self.raw.executemany(translated, rows))
+
+    def insert_returning_id(self, sql:str, params, column:str="id"):
+        return self._run(sql, lambda translated: self.backend.insert_returning_id(self.raw, translated, params, column))
+
+    def insert_many_returning_ids(self, sql:str, rows:list, column:str="id"):
+        if not rows:
+            return []
+        return self._run(sql, lambda translated: self.backend.insert_many_returning_ids(self.raw, translated, rows, column))
+
+    def executemany_batch_errors(self, sql:str, rows:list):
+        if not rows:
+            return []
+        return self._run(sql, lambda translated: self.backend.executemany_batch_errors(self.raw, translated, rows))
+
+    def set_fetch_size(self, rows:int):
+        self.backend.set_fetch_size(self.raw, rows)
+
+    def var(self, kind:type):
+        return self.backend.var(self.raw, kind)
+
+    def array(self, kind:type, values:list):
+        return self.backend.array(self.raw, kind, values)
+
+    def fetchone(self):
+        return self._fetch(self.raw.fetchone)
+
+    def fetchmany(self, size:int=None):
+        return self._fetch(lambda: self.raw.fetchmany(size or self.raw.arraysize))
+
+    def fetchall(self):
+        return self._fetch(self.raw.fetchall)
+
+    def __iter__(self):
+        while True:
+            rows = self.fetchmany()
+            if not rows:
+                return
+            yield from rows
+
+    def close(self):
+        if not self.cached:
+            self.raw.close()
@@ -0,0 +1,79 @@
+import cx_Oracle
+
+from Src.Backends.Backend import (Backend, BatchError, DUPLICATE, CHECK, NOT_NULL, TOO_LARGE, FOREIGN_KEY,
+                                  NO_TABLE, ALREADY_EXISTS)
+
+ERROR_KINDS = {
+    1: DUPLICATE,
+    2290: CHECK,
+    1400: NOT_NULL,
+    1407: NOT_NULL,
+    1438: TOO_LARGE,
+    12899: TOO_LARGE,
+    2291: FOREIGN_KEY,
+    2292: FOREIGN_KEY,
+    942: NO_TABLE,
+    955: ALREADY_EXISTS,
+    1408: ALREADY_EXISTS,
+    1430: ALREADY_EXISTS,
+    2260: ALREADY_EXISTS,
+    2261: ALREADY_EXISTS,
+    2275: ALREADY_EXISTS
+}
+
+VAR_TYPES = {
+    int: cx_Oracle.NUMBER,
+    float: cx_Oracle.NUMBER,
+    str: cx_Oracle.STRING
+}
+
+class OracleBackend(Backend):
+    name = "oracle"
+    driver_errors = (cx_Oracle.DatabaseError,)
+    reuse_cursors = True
+    stored_procedures = True
+
+    def create_pool(self, user, passwd, dsn, encoding, pool_min:int, pool_max:int, pool_increment:int, wait_timeout:int, statement_cache:int):
+        getmode = cx_Oracle.SPOOL_ATTRVAL_TIMEDWAIT if wait_timeout > 0 else cx_Oracle.SPOOL_ATTRVAL_WAIT
+        pool = cx_Oracle.SessionPool(user=user, password=passwd, dsn=dsn,
+                                     min=pool_min, max=pool_max, increment=pool_increment,
+                                     threaded=True, getmode=getmode, encoding=encoding)
+        if wait_timeout > 0:
+            pool.wait_timeout = wait_timeout
+        pool.stmtcachesize = statement_cache
+        return pool
+
+    def classify(self, error):
+        error_obj, = error.args
+        code = getattr(error_obj, "code", None)
+        message = getattr(error_obj, "message", str(error_obj))
+        return ERROR_KINDS.get(code), code, message
+
+    def set_fetch_size(self, cursor, rows:int):
+        cursor.arraysize = rows
+        cursor.prefetchrows = rows + 1
+
+    def var(self, cursor, kind:type):
+        return cursor.var(VAR_TYPES[kind])
+
+    def array(self, cursor, kind:type, values:list):
+        array = cursor.arrayvar(VAR_TYPES[kind], max(len(values), 1))
+        array.setvalue(0, list(values))
+        return array
+
+    def insert_returning_id(self, cursor, sql:str, params, column:str):
+        new_id = cursor.var(cx_Oracle.NUMBER)
+        cursor.execute(f"{sql} RETURNING {column} INTO :new_id", {**params, "new_id": new_id})
+        return int(new_id.getvalue()[0])
+
+    def insert_many_returning_ids(self, cursor, sql:str, rows:list, column:str):
+        width = len(rows[0])
+        new_ids = cursor.var(cx_Oracle.NUMBER, arraysize=len(rows))
+        cursor.setinputsizes(*([None] * width), new_ids)
+        cursor.executemany(f"{sql} RETURNING {column} INTO :{width + 1}", rows)
+        return [int(new_ids.getvalue(i)[0]) for i in range(len(rows))]
+
+    def executemany_batch_errors(self, cursor, sql:str, rows:list):
+        cursor.executemany(sql, rows, batcherrors=True)
+        return [BatchError(error.offset, ERROR_KINDS.get(error.code), error.code, error.message)
+                for error in cursor.getbatcherrors()]
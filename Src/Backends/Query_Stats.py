@@ -0,0 +1,187 @@
+import json
+import os
+import re
+import sys
+import threading
+import zlib
+from bisect import bisect_left
+from datetime import datetime
+
+class QueryStatsError(Exception):
+    pass
+
+BUCKETS_MS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+WHITESPACE = re.compile(r"\s+")
+BACKENDS_DIR = os.path.dirname(os.path.abspath(__file__))
+HELPER_FILES = ("Paging.py",)
+
+class QueryStats:
+    _lock = threading.Lock()
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super(QueryStats, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self, enabled:bool=False, slow_threshold_ms:float=100.0, slow_log:str=None):
+        if getattr(self, "_initialized", False):
+            return
+
+        self.enabled = enabled
+        self.slow_threshold_ms = slow_threshold_ms
+        self.slow_log = slow_log
+        self._stats_lock = threading.Lock()
+        self._statements = {}
+        self._keys = {}
+        self._slow_count = 0
+        self._initialized = True
+
+    def configure(self, enabled:bool, slow_threshold_ms:float=None, slow_log:str=None):
+        if slow_threshold_ms is not None:
+            if slow_threshold_ms < 0:
+                raise QueryStatsError("Slow query threshold cannot be negative")
+            self.slow_threshold_ms = slow_threshold_ms
+        self.slow_log = slow_log
+        self.enabled = enabled
+
+    def statement_key(self, sql:str):
+        key = self._keys.get(sql)
+        if key is None:
+            normalized = WHITESPACE.sub(" ", sql).strip()
+            key = (f"{zlib.crc32(normalized.encode('utf-8')):08x}", normalized)
+            if len(self._keys) > 4096:
+                self._keys.clear()
+            self._keys[sql] = key
+        return key
+
+    def entry(self, key:str, sql:str):
+        entry = self._statements.get(key)
+        if entry is None:
+            entry = self._statements[key] = {
+                "id": key,
+                "sql": sql,
+                "callers": {},
+                "executions": 0,
+                "failures": 0,
+                "execute_ms": 0.0,
+                "fetch_ms": 0.0,
+                "max_ms": 0.0,
+                "rows": 0,
+                "round_trips": 0,
+                "histogram": [0] * (len(BUCKETS_MS) + 1)
+            }
+        return entry
+
+    def caller(self):
+        frame = sys._getframe(2)
+        while frame is not None and (os.path.dirname(os.path.abspath(frame.f_code.co_filename)) == BACKENDS_DIR
+                                     or os.path.basename(frame.f_code.co_filename) in HELPER_FILES):
+            frame = frame.f_back
+        if frame is None:
+            return "unknown"
+        return getattr(frame.f_code, "co_qualname", frame.f_code.co_name)
+
+    def record_execute(self, sql:str, seconds:float, rows:int, round_trips:int=1, failed:bool=False):
+        key, normalized = self.statement_key(sql)
+        caller = self.caller()
+        milliseconds = seconds * 1000
+        with self._stats_lock:
+            entry = self.entry(key, normalized)
+            entry["executions"] += 1
+            entry["failures"] += 1 if failed else 0
+            entry["execute_ms"] += milliseconds
+            entry["max_ms"] = max(entry["max_ms"], milliseconds)
+            entry["rows"] += max(rows, 0)
+            entry["round_trips"] += round_trips
+            entry["histogram"][bisect_left(BUCKETS_MS, milliseconds)] += 1
+            entry["callers"][caller] = entry["callers"].get(caller, 0) + 1
+        if milliseconds >= self.slow_threshold_ms:
+            self.log_slow(key, caller, "execute", milliseconds, max(rows, 0))
+        return key
+
+    def record_fetch(self, key:str, seconds:float, rows:int, round_trips:int):
+        milliseconds = seconds * 1000
+        with self._stats_lock:
+            entry = self._statements.get(key)
+            if entry is None:
+                return
+            entry["fetch_ms"] += milliseconds
+            entry["rows"] += rows
+            entry["round_trips"] += round_trips
+        if milliseconds >= self.slow_threshold_ms:
+            self.log_slow(key, None, "fetch", milliseconds, rows)
+
+    def log_slow(self, key:str, caller:str, phase:str, milliseconds:float, rows:int):
+        with self._stats_lock:
+            self._slow_count += 1
+            entry = self._statements.get(key)
+            sql = entry["sql"] if entry else None
+        if not self.slow_log:
+            return
+        record = {
+            "at": datetime.now().isoformat(timespec="milliseconds"),
+            "id": key,
+            "caller": caller,
+            "phase": phase,
+            "ms": round(milliseconds, 3),
+            "rows": rows,
+            "sql": sql
+        }
+        try:
+            with open(self.slow_log, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError:
+            pass
+
+    def percentile(self, histogram:list, percent:float):
+        total = sum(histogram)
+        if total == 0:
+            return 0.0
+        target = total * percent / 100
+        seen = 0
+        for i, count in enumerate(histogram):
+            seen += count
+            if seen >= target:
+                return BUCKETS_MS[i] if i < len(BUCKETS_MS) else None
+        return None
+
+    def snapshot(self, limit:int=None):
+        with self._stats_lock:
+            entries = [dict(entry, callers=dict(entry["callers"]), histogram=list(entry["histogram"]))
+                       for entry in self._statements.values() if entry["executions"]]
+            slow = self._slow_count
+
+        for entry in entries:
+            executions = entry["executions"]
+            entry["total_ms"] = round(entry["execute_ms"] + entry["fetch_ms"], 3)
+            entry["mean_ms"] = round(entry["total_ms"] / executions, 3)
+            entry["p50_ms"] = self.percentile(entry["histogram"], 50)
+            entry["p95_ms"] = self.percentile(entry["histogram"], 95)
+            entry["p99_ms"] = self.percentile(entry["histogram"], 99)
+            entry["execute_ms"] = round(entry["execute_ms"], 3)
+            entry["fetch_ms"] = round(entry["fetch_ms"], 3)
+            entry["max_ms"] = round(entry["max_ms"], 3)
+            entry["histogram"] = {f"<={bound}ms": count for bound, count in zip(BUCKETS_MS + ["inf"], entry["histogram"]) if count}
+        entries.sort(key=lambda entry: entry["total_ms"], reverse=True)
+
+        return {
+            "enabled": self.enabled,
+            "slow_threshold_ms": self.slow_threshold_ms,
+            "slow_queries": slow,
+            "statements": entries[:limit] if limit else entries
+        }
+
+    def dump(self, path:str, limit:int=None):
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(limit), f, indent=2, default=str)
+        except OSError as e:
+            raise QueryStatsError(f"Cannot write query statistics to '{path}': {e}")
+
+    def reset(self):
+        with self._stats_lock:
+            self._statements = {}
+            self._keys = {}
+            self._slow_count = 0
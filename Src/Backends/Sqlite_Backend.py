@@ -0,0 +1,194 @@
+import re
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+
+from Src.Backends.Backend import (Backend, BatchError, DUPLICATE, CHECK, NOT_NULL, TOO_LARGE, FOREIGN_KEY,
+                                  NO_TABLE, ALREADY_EXISTS)
+
+TRANSLATIONS = [
+    (re.compile(r"\bFETCH\s+FIRST\s+(:\w+|\d+)\s+ROWS\s+ONLY\b", re.IGNORECASE), r"LIMIT \1"),
+    (re.compile(r"\s+FOR\s+UPDATE\b.*$", re.IGNORECASE | re.DOTALL), ""),
+    (re.compile(r"\bSYSDATE\b", re.IGNORECASE), "datetime('now', 'localtime')"),
+    (re.compile(r"\bNVL\(", re.IGNORECASE), "IFNULL("),
+    (re.compile(r"\bLEAST\(", re.IGNORECASE), "MIN("),
+    (re.compile(r"\bGREATEST\(", re.IGNORECASE), "MAX("),
+    (re.compile(r"(?<![\w:]):(\d+)\b"), r"?\1")
+]
+
+WRITE_STATEMENT = re.compile(r"^\s*(INSERT|UPDATE|DELETE|CREATE|DROP|ALTER|REPLACE)\b|\bFOR\s+UPDATE\b", re.IGNORECASE)
+TRANSLATION_CACHE_SIZE = 1024
+DEFAULT_ARRAYSIZE = 100
+
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_converter("TIMESTAMP", lambda value: datetime.fromisoformat(value.decode()))
+
+_patterns = {}
+
+def regexp_like(value, pattern):
+    if value is None or pattern is None:
+        return None
+    compiled = _patterns.get(pattern)
+    if compiled is None:
+        compiled = _patterns[pattern] = re.compile(pattern)
+    return 1 if compiled.search(value) else 0
+
+class SqlitePool:
+    def __init__(self, database:str, pool_min:int, pool_max:int, pool_increment:int, wait_timeout:int, statement_cache:int):
+        self.database = database
+        self.uri = database == ":memory:"
+        if self.uri:
+            self.database = "file:halls_memory?mode=memory&cache=shared"
+        self.min = pool_min
+        self.max = pool_max
+        self.increment = pool_increment
+        self.wait_timeout = wait_timeout
+        self.statement_cache = statement_cache
+        self.opened = 0
+        self.busy = 0
+        self.closed = False
+        self._idle = []
+        self._busy = set()
+        self._condition = threading.Condition()
+        for _ in range(max(pool_min, 1)):
+            self._idle.append(self._connect())
+
+    def _connect(self):
+        connection = sqlite3.connect(self.database, uri=self.uri, timeout=max(self.wait_timeout, 5000) / 1000,
+                                     detect_types=sqlite3.PARSE_DECLTYPES, isolation_level=None,
+                                     check_same_thread=False, cached_statements=self.statement_cache)
+        connection.create_function("REGEXP_LIKE", 2, regexp_like, deterministic=True)
+        connection.execute("PRAGMA foreign_keys = ON")
+        if not self.uri:
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+        self.opened += 1
+        return connection
+
+    def acquire(self):
+        deadline = time.monotonic() + self.wait_timeout / 1000 if self.wait_timeout > 0 else None
+        with self._condition:
+            while not self.closed and not self._idle and self.opened >= self.max:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise sqlite3.OperationalError("Timed out waiting for a pooled connection")
+                self._condition.wait(remaining)
+            if self.closed:
+                raise sqlite3.OperationalError("Connection pool is closed")
+            connection = self._idle.pop() if self._idle else self._connect()
+            self._busy.add(connection)
+            self.busy += 1
+            return connection
+
+    def release(self, connection):
+        with self._condition:
+            if connection not in self._busy:
+                raise sqlite3.ProgrammingError("Connection is not acquired from this pool")
+        if connection.in_transaction:
+            connection.rollback()
+        with self._condition:
+            self._busy.discard(connection)
+            self.busy -= 1
+            self._idle.append(connection)
+            self._condition.notify()
+
+    def drop(self, connection):
+        try:
+            connection.close()
+        finally:
+            with self._condition:
+                if connection in self._busy:
+                    self._busy.discard(connection)
+                    self.busy -= 1
+                    self.opened -= 1
+                self._condition.notify()
+
+    def close(self, force:bool=False):
+        with self._condition:
+            if self._busy and not force:
+                raise sqlite3.OperationalError(f"Cannot close the pool while {len(self._busy)} connection(s) are busy")
+            for connection in self._idle + list(self._busy):
+                try:
+                    connection.close()
+                except sqlite3.Error:
+                    pass
+            self.opened = 0
+            self.busy = 0
+            self.closed = True
+            self._idle = []
+            self._busy = set()
+            self._condition.notify_all()
+
+class SqliteBackend(Backend):
+    name = "sqlite"
+    driver_errors = (sqlite3.Error,)
+
+    def __init__(self):
+        self._translations = {}
+
+    def create_pool(self, user, passwd, dsn, encoding, pool_min:int, pool_max:int, pool_increment:int, wait_timeout:int, statement_cache:int):
+        return SqlitePool(dsn, pool_min, pool_max, pool_increment, wait_timeout, statement_cache)
+
+    def classify(self, error):
+        message = str(error)
+        code = getattr(error, "sqlite_errorcode", None)
+        lowered = message.lower()
+        if "constraint failed" in lowered:
+            if "unique" in lowered:
+                return DUPLICATE, code, message
+            if "not null" in lowered:
+                return NOT_NULL, code, message
+            if "foreign key" in lowered:
+                return FOREIGN_KEY, code, message
+            if "too_large" in lowered:
+                return TOO_LARGE, code, message
+            if "check" in lowered:
+                return CHECK, code, message
+        if "no such table" in lowered:
+            return NO_TABLE, code, message
+        if "already exists" in lowered:
+            return ALREADY_EXISTS, code, message
+        return None, code, message
+
+    def translate(self, sql:str):
+        translated = self._translations.get(sql)
+        if translated is None:
+            translated = sql
+            for pattern, replacement in TRANSLATIONS:
+                translated = pattern.sub(replacement, translated)
+            if len(self._translations) >= TRANSLATION_CACHE_SIZE:
+                self._translations.clear()
+            self._translations[sql] = translated
+        return translated
+
+    def cursor(self, connection):
+        cursor = connection.cursor()
+        cursor.arraysize = DEFAULT_ARRAYSIZE
+        return cursor
+
+    def before_execute(self, connection, sql:str):
+        if not connection.in_transaction and WRITE_STATEMENT.search(sql):
+            connection.execute("BEGIN IMMEDIATE")
+
+    def insert_returning_id(self, cursor, sql:str, params, column:str):
+        cursor.execute(sql, params)
+        return int(cursor.lastrowid)
+
+    def insert_many_returning_ids(self, cursor, sql:str, rows:list, column:str):
+        ids = []
+        for row in rows:
+            cursor.execute(sql, row)
+            ids.append(int(cursor.lastrowid))
+        return ids
+
+    def executemany_batch_errors(self, cursor, sql:str, rows:list):
+        errors = []
+        for offset, row in enumerate(rows):
+            try:
+                cursor.execute(sql, row)
+            except sqlite3.DatabaseError as e:
+                kind, code, message = self.classify(e)
+                errors.append(BatchError(offset, kind, code, message))
+        return errors
@@ -0,0 +1,227 @@
+import argparse
+import json
+import sys
+
+from Src.Backends.Query_Stats import QueryStats
+from Src.Config.Config_load import load_config, load_paths, load_pool_config, load_import_config, load_export_config, load_cache_config, load_instrumentation_config, load_pricing_config, load_journal_config, load_ledger_config, load_reports_config
+from Src.Api_Server import ApiServer
+from Src.Config.Sql_load import migrate
+from Src.DBconnect import DBconnect
+from Src.Load_Generator import LoadGenerator
+from Src.Services.Export import EXPORTS, FORMATS
+from Src.Services.Operation_Service import OperationService
+from Src.Services.Pricing_Engine import PricingEngine
+from Src.Table_Gateways.Daily_Rollup import REPORTS
+from Src.Table_Gateways.Reference_Cache import ReferenceCache
+
+class CliError(Exception):
+    pass
+
+class Cli:
+    def __init__(self, path_cfg:str="config.ini"):
+        self.config_path = path_cfg
+        self.db = None
+        self.paths = None
+        self.import_batch_size = 1000
+        self.export_chunk_size = 5000
+        self.rollup_interval = 60.0
+        self.snapshot_interval = 3600.0
+        self.settle_seconds = 300
+        self.refresh_interval = 300.0
+
+    def setup(self):
+        try:
+            cfg = load_config(self.config_path)
+            pool_cfg = load_pool_config(self.config_path)
+            cache_cfg = load_cache_config(self.config_path)
+            instrumentation_cfg = load_instrumentation_config(self.config_path)
+            pricing_cfg = load_pricing_config(self.config_path)
+            self.paths = load_paths(self.config_path)
+            self.import_batch_size = load_import_config(self.config_path)["batch_size"]
+            self.export_chunk_size = load_export_config(self.config_path)["chunk_size"]
+            self.rollup_interval = load_journal_config(self.config_path)["rollup_interval"]
+            ledger_cfg = load_ledger_config(self.config_path)
+            self.snapshot_interval = ledger_cfg["snapshot_interval"]
+            self.settle_seconds = ledger_cfg["settle_seconds"]
+            self.refresh_interval = load_reports_config(self.config_path)["refresh_interval"]
+        except Exception as e:
+            raise CliError("Configuration error: " + str(e))
+
+        ReferenceCache(cache_cfg["ttl"])
+        PricingEngine().configure(pricing_cfg)
+        QueryStats().configure(instrumentation_cfg["enabled"], instrumentation_cfg["slow_threshold_ms"], instrumentation_cfg["slow_log"])
+        self.db = DBconnect(cfg["user"], cfg["password"], cfg["dsn"], cfg["encoding"],
+                            pool_cfg["min"], pool_cfg["max"], pool_cfg["increment"], pool_cfg["wait_timeout"], cfg["backend"], pool_cfg["statement_cache"])
+        self.db.create_pool()
+        with self.db.session() as connection:
+            migrate(connection, self.paths["migrations"])
+
+    def shutdown(self):
+        if self.db:
+            self.db.disconnect()
+
+    def parser(self):
+        parser = argparse.ArgumentParser(prog="main.py", description="Halls management system batch interface")
+        commands = parser.add_subparsers(dest="op", required=True)
+
+        reserve = commands.add_parser("reserve", help="create a reservation")
+        reserve.add_argument("--customer", type=int, required=True)
+        reserve.add_argument("--hall", type=int, action="append", required=True)
+        reserve.add_argument("--start", required=True, help="YYYY-MM-DD HH:MM")
+        reserve.add_argument("--end", required=True, help="YYYY-MM-DD HH:MM")
+        reserve.add_argument("--service", action="append", default=[], help="optional service as ID:HOURS")
+
+        pay = commands.add_parser("pay", help="pay a reservation from the customer's account")
+        pay.add_argument("--reservation", type=int, required=True)
+
+        cancel = commands.add_parser("cancel", help="delete a reservation")
+        cancel.add_argument("--reservation", type=int, required=True)
+
+        slots = commands.add_parser("slots", help="search free slots")
+        slots.add_argument("--sport", required=True)
+        slots.add_argument("--duration", type=float, required=True, help="hours")
+        slots.add_argument("--from", dest="window_from", required=True, help="YYYY-MM-DD HH:MM")
+        slots.add_argument("--to", dest="window_to", required=True, help="YYYY-MM-DD HH:MM")
+        slots.add_argument("--min-capacity", dest="min_capacity", type=int, default=0)
+        slots.add_argument("--customer", type=int, default=None, help="price the slots for this customer")
+
+        report = commands.add_parser("report", help="print the reservation summary")
+        report.add_argument("--exact", action="store_true", help="rebuild the rollups and the summary from base tables before reading")
+
+        revenue = commands.add_parser("revenue", help="revenue, booked hours and bookings from the daily rollups")
+        revenue.add_argument("--from", required=True, help="YYYY-MM-DD HH:MM")
+        revenue.add_argument("--to", required=True, help="YYYY-MM-DD HH:MM")
+        revenue.add_argument("--by", choices=list(REPORTS), default="hall")
+        revenue.add_argument("--refresh", action="store_true", help="refresh changed days before reading")
+
+        commands.add_parser("refresh_rollups", help="recompute the daily rollups of days changed since the last refresh")
+
+        utilization = commands.add_parser("utilization", help="hall occupancy by hour of day, weekday and month")
+        utilization.add_argument("--from", required=True, help="YYYY-MM-DD HH:MM")
+        utilization.add_argument("--to", required=True, help="YYYY-MM-DD HH:MM")
+        utilization.add_argument("--hall", type=int, action="append", default=[], help="defaults to all halls")
+
+        commands.add_parser("import", help="import customers, halls and services from the configured CSV files")
+
+        export = commands.add_parser("export", help="stream reservations and payments to CSV, Parquet or Arrow files")
+        export.add_argument("--table", dest="tables", action="append", choices=list(EXPORTS), help="defaults to all tables")
+        export.add_argument("--format", choices=list(FORMATS), default="csv")
+        export.add_argument("--directory", default=None, help="defaults to the configured export path")
+        export.add_argument("--from", default=None, help="YYYY-MM-DD HH:MM")
+        export.add_argument("--to", default=None, help="YYYY-MM-DD HH:MM")
+        export.add_argument("--after", default=None, help="resume after this key, e.g. 120 or 120,3 for one table")
+        export.add_argument("--resume", action="store_true", help="append to existing CSV files after their last row")
+
+        commands.add_parser("rollup", help="move journaled payment credits into the system account balance")
+
+        snapshot = commands.add_parser("snapshot", help="snapshot ledger balances of accounts with settled entries")
+        snapshot.add_argument("--settle-seconds", dest="settle_seconds", type=int, default=None, help="defaults to the configured value")
+
+        statement = commands.add_parser("statement", help="print ledger statements of cash accounts")
+        statement.add_argument("--account", dest="accounts", type=int, action="append", required=True)
+        statement.add_argument("--from", required=True, help="YYYY-MM-DD HH:MM")
+        statement.add_argument("--to", default=None, help="YYYY-MM-DD HH:MM, defaults to now")
+
+        commands.add_parser("ledger_check", help="list accounts whose balance disagrees with the ledger")
+
+        batch = commands.add_parser("batch", help="run JSON-lines operations from a file ('-' for stdin)")
+        batch.add_argument("file")
+        batch.add_argument("--query-stats", dest="query_stats", help="enable query instrumentation and write the statistics to this file")
+
+        serve = commands.add_parser("serve", help="serve the operations as an HTTP/JSON API")
+        serve.add_argument("--host", default="127.0.0.1")
+        serve.add_argument("--port", type=int, default=8080)
+        serve.add_argument("--workers", type=int, default=None, help="worker threads, defaults to the pool maximum")
+
+        loadtest = commands.add_parser("loadtest", help="drive a running API server and report latency percentiles")
+        loadtest.add_argument("--host", default="127.0.0.1")
+        loadtest.add_argument("--port", type=int, default=8080)
+        loadtest.add_argument("--concurrency", type=int, default=16)
+        loadtest.add_argument("--duration", type=float, default=10.0, help="seconds")
+        loadtest.add_argument("--write-ratio", dest="write_ratio", type=float, default=0.0, help="share of requests that create reservations")
+        loadtest.add_argument("--sport", default="FOOTBALL")
+        loadtest.add_argument("--target-rps", dest="target_rps", type=float, default=None)
+        loadtest.add_argument("--target-p99-ms", dest="target_p99_ms", type=float, default=None)
+        return parser
+
+    def run(self, argv:list):
+        args = vars(self.parser().parse_args(argv))
+        try:
+            if args["op"] == "loadtest":
+                return self.run_loadtest(args)
+            self.setup()
+            if args["op"] == "batch":
+                if args["query_stats"]:
+                    QueryStats().configure(True, QueryStats().slow_threshold_ms, QueryStats().slow_log)
+                try:
+                    return self.run_batch(args["file"])
+                finally:
+                    if args["query_stats"]:
+                        QueryStats().dump(args["query_stats"])
+            if args["op"] == "serve":
+                ApiServer(self.db, args["host"], args["port"], args["workers"], self.paths, self.import_batch_size,
+                          self.rollup_interval, self.snapshot_interval, self.settle_seconds, self.refresh_interval).serve()
+                return 0
+            if args["op"] == "snapshot" and args["settle_seconds"] is None:
+                args["settle_seconds"] = self.settle_seconds
+
+            with self.db.session() as connection:
+                return 0 if self.emit(1, args, connection) else 1
+        except Exception as e:
+            print(json.dumps({"ok": False, "error": str(e)}), file=sys.stderr)
+            return 1
+        finally:
+            self.shutdown()
+
+    def run_batch(self, file_path:str):
+        failed = 0
+        source = sys.stdin if file_path == "-" else open(file_path, encoding="utf-8")
+        try:
+            with self.db.session() as connection:
+                for line_number, line in enumerate(source, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        operation = json.loads(line)
+                    except ValueError as e:
+                        self.output({"line": line_number, "ok": False, "error": f"Invalid JSON: {e}"})
+                        failed += 1
+                        continue
+                    if not isinstance(operation, dict):
+                        self.output({"line": line_number, "ok": False, "error": "Operation must be a JSON object"})
+                        failed += 1
+                        continue
+                    if not self.emit(line_number, operation, connection):
+                        failed += 1
+        finally:
+            if source is not sys.stdin:
+                source.close()
+        return 0 if failed == 0 else 1
+
+    def run_loadtest(self, args:dict):
+        result = LoadGenerator(args["host"], args["port"], args["concurrency"], args["duration"],
+                               args["write_ratio"], args["sport"]).run()
+        passed = True
+        if args["target_rps"] is not None and result["throughput_rps"] < args["target_rps"]:
+            passed = False
+        if args["target_p99_ms"] is not None and result["p99_ms"] > args["target_p99_ms"]:
+            passed = False
+        self.output({"op": "loadtest", "ok": passed, "result": result})
+        return 0 if passed else 1
+
+    def emit(self, line_number:int, operation:dict, connection):
+        try:
+            result = self.execute(operation, connection)
+            self.output({"line": line_number, "op": operation.get("op"), "ok": True, "result": result})
+            return True
+        except Exception as e:
+            self.output({"line": line_number, "op": operation.get("op"), "ok": False, "error": str(e)})
+            return False
+
+    def output(self, record:dict):
+        print(json.dumps(record, default=str))
+
+    def execute(self, operation:dict, connection):
+        if operation.get("op") == "export":
+            operation = {"chunk_size": self.export_chunk_size, **operation}
+        return OperationService(connection, self.paths, self.import_batch_size).execute(operation)
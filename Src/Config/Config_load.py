@@ -15,6 +15,20 @@ def load_config(path="config.ini"):
         raise ConfigError("Missing [database] section in config file.")
 
     db = config["database"]
+    backend = db.get("backend", "oracle").strip().lower()
+
+    if backend == "sqlite":
+        if not db.get("database", "").strip():
+            raise ConfigError("Missing or empty 'database' in config file.")
+        return {
+            "backend": backend,
+            "user": None,
+            "password": None,
+            "dsn": db["database"].strip(),
+            "encoding": db.get("encoding", "UTF-8")
+        }
+    if backend != "oracle":
+        raise ConfigError(f"Unknown database backend '{backend}'.")
 
     required = ["user", "password", "host", "port", "service", "encoding"]
     for field in required:
@@ -31,6 +45,7 @@ def load_config(path="config.ini"):
     dsn = f"{db['host']}:{port}/{db['service']}"
 
     return {
+        "backend": backend,
         "user": db["user"],
         "password": db["password"],
         "dsn": dsn,
@@ -48,18 +63,284 @@ def load_paths(path="config.ini"):
         raise ConfigError("Missing [path] section in config file.")
 
     paths = config["path"]
-    required = ["db_code", "import_customer", "import_service", "import_hall"]
+    required = ["migrations", "import_customer", "import_service", "import_hall"]
     for field in required:
         if field not in paths or not paths[field].strip():
             raise ConfigError(f"Missing or empty '{field}' in config file.")
 
-    for path in paths.values():
-        if not os.path.isfile(path):
-            raise ConfigError(f"Path '{path}' does not exist.")
+    if not os.path.isdir(paths["migrations"]):
+        raise ConfigError(f"Path '{paths['migrations']}' does not exist.")
+    for field in ["import_customer", "import_service", "import_hall"]:
+        if not os.path.isfile(paths[field]):
+            raise ConfigError(f"Path '{paths[field]}' does not exist.")
 
     return {
-        "db_code": paths["db_code"],
+        "migrations": paths["migrations"],
         "import_customer": paths["import_customer"],
         "import_service": paths["import_service"],
-        "import_hall": paths["import_hall"]
-    }
\ No newline at end of file
+        "import_hall": paths["import_hall"],
+        "export": paths.get("export", "").strip() or "Export"
+    }
+
+def load_pool_config(path="config.ini"):
+    if not os.path.isfile(path):
+        raise ConfigError(f"Config file '{path}' not found.")
+
+    config = configparser.ConfigParser()
+    config.read(path)
+
+    if "pool" not in config:
+        return {
+            "min": 1,
+            "max": 4,
+            "increment": 1,
+            "wait_timeout": 0,
+            "statement_cache": 40
+        }
+
+    pool = config["pool"]
+
+    values = {}
+    for field, default in (("min", 1), ("max", 4), ("increment", 1), ("wait_timeout", 0), ("statement_cache", 40)):
+        try:
+            values[field] = int(pool.get(field, default))
+        except ValueError:
+            raise ConfigError(f"Pool '{field}' must be an integer.")
+
+    if values["min"] < 0 or values["max"] <= 0 or values["increment"] <= 0 or values["wait_timeout"] < 0 or values["statement_cache"] < 0:
+        raise ConfigError("Pool sizes must be positive integers.")
+    if values["min"] > values["max"]:
+        raise ConfigError("Pool 'min' cannot be larger than 'max'.")
+
+    return values
+
+
+def load_import_config(path="config.ini"):
+    if not os.path.isfile(path):
+        raise ConfigError(f"Config file '{path}' not found.")
+
+    config = configparser.ConfigParser()
+    config.read(path)
+
+    if "import" not in config:
+        return {
+            "batch_size": 1000
+        }
+
+    try:
+        batch_size = int(config["import"].get("batch_size", 1000))
+        if batch_size <= 0:
+            raise ValueError
+    except ValueError:
+        raise ConfigError("Import 'batch_size' must be a positive integer.")
+
+    return {
+        "batch_size": batch_size
+    }
+
+
+def load_export_config(path="config.ini"):
+    if not os.path.isfile(path):
+        raise ConfigError(f"Config file '{path}' not found.")
+
+    config = configparser.ConfigParser()
+    config.read(path)
+
+    if "export" not in config:
+        return {
+            "chunk_size": 5000
+        }
+
+    try:
+        chunk_size = int(config["export"].get("chunk_size", 5000))
+        if chunk_size <= 0:
+            raise ValueError
+    except ValueError:
+        raise ConfigError("Export 'chunk_size' must be a positive integer.")
+
+    return {
+        "chunk_size": chunk_size
+    }
+
+
+def load_cache_config(path="config.ini"):
+    if not os.path.isfile(path):
+        raise ConfigError(f"Config file '{path}' not found.")
+
+    config = configparser.ConfigParser()
+    config.read(path)
+
+    if "cache" not in config:
+        return {
+            "ttl": 300.0
+        }
+
+    try:
+        ttl = float(config["cache"].get("ttl", 300))
+        if ttl < 0:
+            raise ValueError
+    except ValueError:
+        raise ConfigError("Cache 'ttl' must be a non-negative number.")
+
+    return {
+        "ttl": ttl
+    }
+
+
+def load_journal_config(path="config.ini"):
+    if not os.path.isfile(path):
+        raise ConfigError(f"Config file '{path}' not found.")
+
+    config = configparser.ConfigParser()
+    config.read(path)
+
+    if "journal" not in config:
+        return {
+            "rollup_interval": 60.0
+        }
+
+    try:
+        rollup_interval = float(config["journal"].get("rollup_interval", 60))
+        if rollup_interval < 0:
+            raise ValueError
+    except ValueError:
+        raise ConfigError("Journal 'rollup_interval' must be a non-negative number.")
+
+    return {
+        "rollup_interval": rollup_interval
+    }
+
+
+def load_ledger_config(path="config.ini"):
+    if not os.path.isfile(path):
+        raise ConfigError(f"Config file '{path}' not found.")
+
+    config = configparser.ConfigParser()
+    config.read(path)
+
+    if "ledger" not in config:
+        return {
+            "snapshot_interval": 3600.0,
+            "settle_seconds": 300
+        }
+
+    try:
+        snapshot_interval = float(config["ledger"].get("snapshot_interval", 3600))
+        if snapshot_interval < 0:
+            raise ValueError
+    except ValueError:
+        raise ConfigError("Ledger 'snapshot_interval' must be a non-negative number.")
+    try:
+        settle_seconds = int(config["ledger"].get("settle_seconds", 300))
+        if settle_seconds < 0:
+            raise ValueError
+    except ValueError:
+        raise ConfigError("Ledger 'settle_seconds' must be a non-negative integer.")
+
+    return {
+        "snapshot_interval": snapshot_interval,
+        "settle_seconds": settle_seconds
+    }
+
+
+def load_reports_config(path="config.ini"):
+    if not os.path.isfile(path):
+        raise ConfigError(f"Config file '{path}' not found.")
+
+    config = configparser.ConfigParser()
+    config.read(path)
+
+    if "reports" not in config:
+        return {
+            "refresh_interval": 300.0
+        }
+
+    try:
+        refresh_interval = float(config["reports"].get("refresh_interval", 300))
+        if refresh_interval < 0:
+            raise ValueError
+    except ValueError:
+        raise ConfigError("Reports 'refresh_interval' must be a non-negative number.")
+
+    return {
+        "refresh_interval": refresh_interval
+    }
+
+
+def load_pricing_config(path="config.ini"):
+    if not os.path.isfile(path):
+        raise ConfigError(f"Config file '{path}' not found.")
+
+    config = configparser.ConfigParser()
+    config.read(path)
+
+    values = {
+        "peak_from": 17,
+        "peak_to": 22,
+        "peak_multiplier": 1.0,
+        "off_peak_multiplier": 1.0,
+        "weekend_multiplier": 1.0,
+        "team_discount": 0.0
+    }
+    if "pricing" not in config:
+        return values
+
+    pricing = config["pricing"]
+    peak_hours = pricing.get("peak_hours", "17-22")
+    try:
+        peak_from, peak_to = (int(hour) for hour in peak_hours.split("-"))
+        if not 0 <= peak_from <= peak_to <= 24:
+            raise ValueError
+    except ValueError:
+        raise ConfigError("Pricing 'peak_hours' must be FROM-TO whole hours between 0 and 24.")
+    values["peak_from"] = peak_from
+    values["peak_to"] = peak_to
+
+    for field in ("peak_multiplier", "off_peak_multiplier", "weekend_multiplier"):
+        try:
+            values[field] = float(pricing.get(field, 1.0))
+            if values[field] <= 0:
+                raise ValueError
+        except ValueError:
+            raise ConfigError(f"Pricing '{field}' must be a positive number.")
+    try:
+        values["team_discount"] = float(pricing.get("team_discount", 0.0))
+        if not 0 <= values["team_discount"] < 1:
+            raise ValueError
+    except ValueError:
+        raise ConfigError("Pricing 'team_discount' must be a number from 0 up to, but not including, 1.")
+
+    return values
+
+
+def load_instrumentation_config(path="config.ini"):
+    if not os.path.isfile(path):
+        raise ConfigError(f"Config file '{path}' not found.")
+
+    config = configparser.ConfigParser()
+    config.read(path)
+
+    if "instrumentation" not in config:
+        return {
+            "enabled": False,
+            "slow_threshold_ms": 100.0,
+            "slow_log": None
+        }
+
+    section = config["instrumentation"]
+    try:
+        enabled = section.getboolean("enabled", False)
+    except ValueError:
+        raise ConfigError("Instrumentation 'enabled' must be true or false.")
+    try:
+        slow_threshold_ms = float(section.get("slow_threshold_ms", 100))
+        if slow_threshold_ms < 0:
+            raise ValueError
+    except ValueError:
+        raise ConfigError("Instrumentation 'slow_threshold_ms' must be a non-negative number.")
+
+    return {
+        "enabled": enabled,
+        "slow_threshold_ms": slow_threshold_ms,
+        "slow_log": section.get("slow_log", "").strip() or None
+    }
@@ -1,31 +1,101 @@
-import cx_Oracle
+import os
+import re
 
-def load_sql(connection, path="db.sql", ):
+from Src.Backends.Backend import DatabaseError, NO_TABLE, ALREADY_EXISTS
+
+class MigrationError(Exception):
+    pass
+
+MIGRATION_FILE = re.compile(r"^(\d+)_(\w+)\.sql$")
+
+def read_migrations(path="Migrations"):
+    if not os.path.isdir(path):
+        raise MigrationError(f"Migrations directory '{path}' not found.")
+
+    migrations = []
+    for file_name in os.listdir(path):
+        match = MIGRATION_FILE.match(file_name)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), os.path.join(path, file_name)))
+    migrations.sort()
+
+    versions = [version for version, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise MigrationError("Duplicate migration version numbers.")
+    return migrations
+
+def split_statements(script:str):
+    statements = []
+    current = []
+    for line in script.splitlines():
+        if line.strip() == "/":
+            statement = "\n".join(current).strip()
+            if statement:
+                statements.append(statement)
+            current = []
+        else:
+            current.append(line)
+
+    if "\n".join(current).strip():
+        raise MigrationError("Statement is not terminated with a '/' line.")
+    return statements
+
+def current_version(cursor):
+    try:
+        cursor.execute("SELECT MAX(version) FROM schema_version")
+        return cursor.fetchone()[0] or 0
+    except DatabaseError as e:
+        if e.kind == NO_TABLE:
+            return None
+        raise
+
+def migrate(connection, path="Migrations"):
     try:
+        migrations = read_migrations(os.path.join(path, connection.backend.name))
         cursor = connection.cursor()
 
-        with open(path, "r", encoding="utf-8") as f:
-            sql_script = f.read()
+        version = current_version(cursor)
+        pending = [m for m in migrations if m[0] > (version or 0)]
+        if not pending:
+            cursor.close()
+            return version
+
+        adopting = version is None
+        if adopting:
+            cursor.execute("CREATE TABLE schema_version ("
+                           "version INT PRIMARY KEY, "
+                           "name VARCHAR(100) NOT NULL, "
+                           "applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)")
+
+        for migration_version, name, file_path in pending:
+            with open(file_path, "r", encoding="utf-8") as f:
+                statements = split_statements(f.read())
 
-        for statement in sql_script.split(";"):
-            stmt = statement.strip()
-            if not stmt:
-                continue
+            for statement in statements:
+                try:
+                    cursor.execute(statement)
+                except DatabaseError as e:
+                    if adopting and migration_version == 1 and e.kind == ALREADY_EXISTS:
+                        continue
+                    raise MigrationError(f"Migration {migration_version}_{name} failed: {e.message}")
 
-            try:
-                cursor.execute(stmt)
-            except cx_Oracle.DatabaseError as e:
-                error_obj, = e.args
-                if error_obj.code == 955:
-                    continue
-                else:
-                    raise cx_Oracle.DatabaseError(e)
+            cursor.execute("INSERT INTO schema_version (version, name) VALUES (:version, :name)",
+                           {
+                               "version": migration_version,
+                               "name": name
+                           })
+            connection.commit()
+            version = migration_version
 
-        connection.commit()
         cursor.close()
-        return True
+        return version
 
-    except cx_Oracle.DatabaseError as e:
-        raise Exception(f'Database error: {e}')
+    except MigrationError:
+        connection.rollback()
+        raise
+    except DatabaseError as e:
+        connection.rollback()
+        raise MigrationError(f'Database error: {e.message}')
     except Exception as e:
-        raise Exception(f'Error: {e}')
\ No newline at end of file
+        connection.rollback()
+        raise MigrationError(f'Error: {e}')
@@ -1,5 +1,11 @@
 import threading
-import cx_Oracle
+import time
+from contextlib import contextmanager
+
+from Src.Backends.Backend import Connection, get_backend
+
+class DBconnectError(Exception):
+    pass
 
 class DBconnect:
     _lock = threading.Lock()
@@ -11,7 +17,7 @@ class DBconnect:
                 cls._instance = super(DBconnect, cls).__new__(cls)
         return cls._instance
 
-    def __init__(self, user, passwd, dsn, encoding="UTF-8"):
+    def __init__(self, user, passwd, dsn, encoding="UTF-8", pool_min:int=1, pool_max:int=4, pool_increment:int=1, wait_timeout:int=0, backend:str="oracle", statement_cache:int=40):
         if getattr(self, "_initialized", False):
             return
 
@@ -19,13 +25,90 @@ class DBconnect:
         self.passwd = passwd
         self.dsn = dsn
         self.encoding = encoding
-        self.connection = None
+        self.pool_min = pool_min
+        self.pool_max = pool_max
+        self.pool_increment = pool_increment
+        self.wait_timeout = wait_timeout
+        self.statement_cache = statement_cache
+        self.backend = get_backend(backend)
+        self.pool = None
+        self._stats_lock = threading.Lock()
+        self._acquired = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._initialized = True
+
+    def create_pool(self):
+        if self.pool is not None:
+            return self.pool
+
+        try:
+            self.pool = self.backend.create_pool(self.user, self.passwd, self.dsn, self.encoding,
+                                                 self.pool_min, self.pool_max, self.pool_increment, self.wait_timeout,
+                                                 self.statement_cache)
+        except self.backend.driver_errors as e:
+            raise DBconnectError(f"Cannot create session pool: {self.backend.error(e).message}")
+        return self.pool
+
+    def acquire(self):
+        if self.pool is None:
+            raise DBconnectError("Session pool is not created")
+
+        started = time.perf_counter()
+        try:
+            connection = self.pool.acquire()
+        except self.backend.driver_errors as e:
+            raise DBconnectError(f"Cannot acquire session: {self.backend.error(e).message}")
+        waited = time.perf_counter() - started
+
+        with self._stats_lock:
+            self._acquired += 1
+            self._wait_total += waited
+            if waited > self._wait_max:
+                self._wait_max = waited
+        return Connection(self.backend, connection, self.statement_cache)
+
+    def release(self, connection):
+        if self.pool is None or connection is None:
+            return
+        connection.close_statements()
+        try:
+            self.pool.release(connection.raw)
+        except self.backend.driver_errors:
+            self.pool.drop(connection.raw)
+
+    @contextmanager
+    def session(self):
+        connection = self.acquire()
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def stats(self):
+        if self.pool is None:
+            raise DBconnectError("Session pool is not created")
+
+        with self._stats_lock:
+            acquired = self._acquired
+            wait_total = self._wait_total
+            wait_max = self._wait_max
 
-    def connect(self):
-        self.connection = cx_Oracle.connect(user=self.user, password=self.passwd, dsn=self.dsn, encoding=self.encoding)
-        return self.connection
+        return {
+            "backend": self.backend.name,
+            "min": self.pool.min,
+            "max": self.pool.max,
+            "increment": self.pool.increment,
+            "open": self.pool.opened,
+            "busy": self.pool.busy,
+            "acquired": acquired,
+            "wait_total_ms": round(wait_total * 1000, 3),
+            "wait_avg_ms": round(wait_total * 1000 / acquired, 3) if acquired else 0.0,
+            "wait_max_ms": round(wait_max * 1000, 3),
+            "statement_cache": self.statement_cache
+        }
 
     def disconnect(self):
-        if self.connection:
-            self.connection.close()
-            self.connection = None
\ No newline at end of file
+        if self.pool:
+            self.pool.close(force=True)
+            self.pool = None
@@ -0,0 +1,132 @@
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timedelta
+
+class LoadGeneratorError(Exception):
+    pass
+
+class LoadGenerator:
+    def __init__(self, host:str="127.0.0.1", port:int=8080, concurrency:int=16, duration:float=10.0, write_ratio:float=0.0, sport:str="FOOTBALL"):
+        if concurrency <= 0 or duration <= 0:
+            raise LoadGeneratorError("Concurrency and duration must be positive")
+        self.host = host
+        self.port = port
+        self.concurrency = concurrency
+        self.duration = duration
+        self.write_ratio = write_ratio
+        self.sport = sport
+        self.customer_ids = []
+        self.hall_ids = []
+
+    def run(self):
+        return asyncio.run(self._run())
+
+    async def _run(self):
+        if self.write_ratio > 0:
+            await self.load_ids()
+
+        latencies = []
+        statuses = {}
+        failures = [0]
+        started = time.perf_counter()
+        deadline = started + self.duration
+        await asyncio.gather(*(self.client(deadline, latencies, statuses, failures) for _ in range(self.concurrency)))
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        server_errors = sum(count for status, count in statuses.items() if status >= 500)
+        return {
+            "requests": len(latencies),
+            "duration_s": round(elapsed, 3),
+            "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+            "p50_ms": self.percentile(latencies, 50),
+            "p95_ms": self.percentile(latencies, 95),
+            "p99_ms": self.percentile(latencies, 99),
+            "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+            "statuses": {str(status): count for status, count in sorted(statuses.items())},
+            "errors": server_errors + failures[0]
+        }
+
+    def percentile(self, latencies:list, percent:float):
+        if not latencies:
+            return 0.0
+        position = min(len(latencies) - 1, int(round(percent / 100 * (len(latencies) - 1))))
+        return round(latencies[position] * 1000, 3)
+
+    async def load_ids(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            status, customers = await self.request(reader, writer, "GET", "/customers?limit=1000")
+            status_halls, halls = await self.request(reader, writer, "GET", "/halls")
+        finally:
+            writer.close()
+        if status != 200 or status_halls != 200:
+            raise LoadGeneratorError("Cannot read customers and halls for the write mix")
+        self.customer_ids = [c["id"] for c in customers]
+        self.hall_ids = [h["id"] for h in halls]
+        if not self.customer_ids or not self.hall_ids:
+            raise LoadGeneratorError("Write mix needs at least one customer and one hall")
+
+    async def client(self, deadline:float, latencies:list, statuses:dict, failures:list):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            while time.perf_counter() < deadline:
+                method, path, body = self.next_request()
+                started = time.perf_counter()
+                try:
+                    status, _ = await self.request(reader, writer, method, path, body)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    failures[0] += 1
+                    writer.close()
+                    reader, writer = await asyncio.open_connection(self.host, self.port)
+                    continue
+                latencies.append(time.perf_counter() - started)
+                statuses[status] = statuses.get(status, 0) + 1
+        finally:
+            writer.close()
+
+    def next_request(self):
+        if self.write_ratio > 0 and random.random() < self.write_ratio:
+            start = datetime.now().replace(minute=0, second=0, microsecond=0) + timedelta(days=random.randint(1, 365), hours=random.randint(0, 23))
+            return "POST", "/reservations", {
+                "customer": random.choice(self.customer_ids),
+                "hall": [random.choice(self.hall_ids)],
+                "start": f"{start:%Y-%m-%d %H:%M}",
+                "end": f"{start + timedelta(hours=1):%Y-%m-%d %H:%M}"
+            }
+
+        choice = random.random()
+        if choice < 0.4:
+            day = datetime.now().replace(hour=16, minute=0, second=0, microsecond=0) + timedelta(days=random.randint(1, 7))
+            return "GET", (f"/availability?sport={self.sport}&duration=2"
+                           f"&from={day:%Y-%m-%d}%20{day:%H:%M}&to={day:%Y-%m-%d}%2022:00"), None
+        if choice < 0.7:
+            return "GET", "/halls", None
+        if choice < 0.9:
+            return "GET", "/report", None
+        return "GET", "/customers?limit=50", None
+
+    async def request(self, reader, writer, method:str, path:str, body:dict=None):
+        payload = json.dumps(body).encode("utf-8") if body is not None else b""
+        writer.write((f"{method} {path} HTTP/1.1\r\n"
+                      f"Host: {self.host}\r\n"
+                      "Content-Type: application/json\r\n"
+                      f"Content-Length: {len(payload)}\r\n\r\n").encode("latin-1") + payload)
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed by server")
+        status = int(status_line.split()[1])
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value.strip())
+        data = await reader.readexactly(length) if length else b""
+        return status, json.loads(data) if data else None
@@ -0,0 +1,113 @@
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+from Src.Backends.Backend import DatabaseError
+
+class AvailabilityIndexError(Exception):
+    pass
+
+class AvailabilityIndex:
+    _lock = threading.Lock()
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super(AvailabilityIndex, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self, max_age:float=300.0, busy_trust:float=30.0):
+        if getattr(self, "_initialized", False):
+            return
+
+        self.max_age = max_age
+        self.busy_trust = busy_trust
+        self._index_lock = threading.RLock()
+        self._starts = {}
+        self._ends = {}
+        self._ids = {}
+        self._by_reservation = {}
+        self._loaded_at = None
+        self._initialized = True
+
+    def load(self, connection):
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT rh.hall_id, r.id, r.start_time, r.end_time "
+                           "FROM reservation r JOIN reservation_hall rh ON rh.reservation_id = r.id "
+                           "WHERE r.status <> 'CANCELLED' AND r.end_time > SYSDATE "
+                           "ORDER BY rh.hall_id, r.start_time")
+            rows = cursor.fetchall()
+            cursor.close()
+        except DatabaseError as e:
+            raise AvailabilityIndexError(f'Availability index database error: {e.message}')
+
+        starts, ends, ids, by_reservation = {}, {}, {}, {}
+        for hall_id, reservation_id, start_time, end_time in rows:
+            starts.setdefault(hall_id, []).append(start_time)
+            ends.setdefault(hall_id, []).append(end_time)
+            ids.setdefault(hall_id, []).append(reservation_id)
+            by_reservation.setdefault(reservation_id, []).append((hall_id, start_time))
+
+        with self._index_lock:
+            self._starts = starts
+            self._ends = ends
+            self._ids = ids
+            self._by_reservation = by_reservation
+            self._loaded_at = time.monotonic()
+
+    def ensure_loaded(self, connection):
+        with self._index_lock:
+            fresh = self._loaded_at is not None and time.monotonic() - self._loaded_at < self.max_age
+        if not fresh:
+            self.load(connection)
+
+    def trusts_busy(self):
+        with self._index_lock:
+            return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.busy_trust
+
+    def invalidate(self):
+        with self._index_lock:
+            self._loaded_at = None
+
+    def is_free(self, hall_id:int, time_from:datetime, time_to:datetime):
+        with self._index_lock:
+            starts = self._starts.get(hall_id)
+            if not starts:
+                return True
+            position = bisect_left(starts, time_to)
+            return position == 0 or self._ends[hall_id][position - 1] <= time_from
+
+    def busy_intervals(self, hall_id:int, time_from:datetime, time_to:datetime):
+        with self._index_lock:
+            starts = self._starts.get(hall_id, [])
+            ends = self._ends.get(hall_id, [])
+            first = max(bisect_right(starts, time_from) - 1, 0)
+            last = bisect_left(starts, time_to)
+            return [(starts[i], ends[i]) for i in range(first, last) if ends[i] > time_from]
+
+    def add(self, reservation_id:int, hall_ids, time_from:datetime, time_to:datetime):
+        with self._index_lock:
+            for hall_id in hall_ids:
+                starts = self._starts.setdefault(hall_id, [])
+                position = bisect_right(starts, time_from)
+                starts.insert(position, time_from)
+                self._ends.setdefault(hall_id, []).insert(position, time_to)
+                self._ids.setdefault(hall_id, []).insert(position, reservation_id)
+                self._by_reservation.setdefault(reservation_id, []).append((hall_id, time_from))
+
+    def remove(self, reservation_id:int):
+        with self._index_lock:
+            for hall_id, time_from in self._by_reservation.pop(reservation_id, []):
+                starts = self._starts[hall_id]
+                ids = self._ids[hall_id]
+                position = bisect_left(starts, time_from)
+                while position < len(starts) and starts[position] == time_from:
+                    if ids[position] == reservation_id:
+                        del starts[position]
+                        del self._ends[hall_id][position]
+                        del ids[position]
+                        break
+                    position += 1
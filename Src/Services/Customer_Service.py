@@ -1,7 +1,7 @@
-import cx_Oracle
-
+from Src.Backends.Backend import DatabaseError
 from Src.Table_Gateways.Cash_Account import CashAccount, CashAccountError
 from Src.Table_Gateways.Customer import Customer, CustomerError
+from Src.Table_Gateways.Paging import PAGE_SIZE, iter_pages
 
 
 class CustomerServiceException(Exception):
@@ -21,22 +21,21 @@ class CustomerService:
             raise CustomerServiceException(f'{e}')
         except CashAccountError as e:
             raise CustomerServiceException(f'{e}')
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
-            raise CustomerServiceException(f'Error in database while creating customer and his account: {error_obj.message}')
+        except DatabaseError as e:
+            raise CustomerServiceException(f'Error in database while creating customer and his account: {e.message}')
         except Exception as e:
             raise CustomerServiceException(f'Unexpected error while creating customer and his account:{e}')
 
     def read_customers_and_balance(self):
+        return [row for page in self.iter_customers_and_balance() for row in page]
+
+    def iter_customers_and_balance(self, page_size:int=PAGE_SIZE, after:tuple=None):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(
-                "SELECT  c.id, c.name , c.email , ca.balance, ca.id "
-                "FROM customer c JOIN cash_account ca ON c.account_id = ca.id ORDER BY c.id"
-            )
-            return cursor.fetchall()
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
-            raise CustomerServiceException(f'Customer service database error: {error_obj.message}')
+            yield from iter_pages(self.connection,
+                                  "SELECT  c.id, c.name , c.email , ca.balance, ca.id "
+                                  "FROM customer c JOIN cash_account ca ON c.account_id = ca.id",
+                                  [("c.id", 0)], page_size=page_size, after=after)
+        except DatabaseError as e:
+            raise CustomerServiceException(f'Customer service database error: {e.message}')
         except Exception as e:
             raise CustomerServiceException(f'Customer service error: {e}')
\ No newline at end of file
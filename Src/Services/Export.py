@@ -0,0 +1,172 @@
+import csv
+import os
+from datetime import datetime
+
+from Src.Backends.Backend import DatabaseError
+from Src.Table_Gateways.Paging import iter_pages
+
+class ExportError(Exception):
+    pass
+
+FORMATS = {
+    "csv": ".csv",
+    "parquet": ".parquet",
+    "arrow": ".arrow"
+}
+
+EXPORTS = {
+    "reservation": {
+        "select": "SELECT r.id, r.customer_id, r.start_time, r.end_time, r.status, r.total_price FROM reservation r",
+        "columns": [("id", int), ("customer_id", int), ("start_time", datetime), ("end_time", datetime), ("status", str), ("total_price", float)],
+        "keys": [("r.id", 0)],
+        "date": "r.start_time"
+    },
+    "reservation_hall": {
+        "select": "SELECT rh.reservation_id, rh.hall_id FROM reservation_hall rh JOIN reservation r ON r.id = rh.reservation_id",
+        "columns": [("reservation_id", int), ("hall_id", int)],
+        "keys": [("rh.reservation_id", 0), ("rh.hall_id", 1)],
+        "date": "r.start_time"
+    },
+    "reservation_service": {
+        "select": "SELECT rs.reservation_id, rs.service_id, rs.hours, rs.amount FROM reservation_service rs JOIN reservation r ON r.id = rs.reservation_id",
+        "columns": [("reservation_id", int), ("service_id", int), ("hours", float), ("amount", float)],
+        "keys": [("rs.reservation_id", 0), ("rs.service_id", 1)],
+        "date": "r.start_time"
+    },
+    "payment": {
+        "select": "SELECT p.id, p.reservation_id, p.amount, p.paid_at FROM payment p",
+        "columns": [("id", int), ("reservation_id", int), ("amount", float), ("paid_at", datetime)],
+        "keys": [("p.id", 0)],
+        "date": "p.paid_at"
+    }
+}
+
+TAIL_BLOCK = 4096
+
+def last_line(path:str):
+    with open(path, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        data = b""
+        while position > 0:
+            step = min(TAIL_BLOCK, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+            lines = data.rstrip(b"\r\n").splitlines()
+            if len(lines) > 1 or (position == 0 and lines):
+                return lines[-1].decode("utf-8")
+    return None
+
+class Export:
+    def __init__(self, connection, chunk_size:int=5000):
+        if chunk_size <= 0:
+            raise ExportError("Chunk size must be a positive integer")
+        self.connection = connection
+        self.chunk_size = chunk_size
+
+    def export(self, table:str, path:str, file_format:str="csv", date_from:datetime=None, date_to:datetime=None, after:tuple=None, resume:bool=False):
+        spec = EXPORTS.get(table)
+        if spec is None:
+            raise ExportError(f"Unknown export table: {table}")
+        if file_format not in FORMATS:
+            raise ExportError(f"Unknown export format: {file_format}")
+        if date_from and date_to and date_from >= date_to:
+            raise ExportError("Export start date must be before its end date")
+        if after is not None and len(after) != len(spec["keys"]):
+            raise ExportError(f"Table {table} resumes after {len(spec['keys'])} key value(s)")
+
+        append = False
+        if resume:
+            if file_format != "csv":
+                raise ExportError("Only CSV exports can be resumed in place, pass the last exported key instead")
+            if after is None and os.path.isfile(path) and last_line(path) is not None:
+                after = self.last_exported(spec, path)
+                append = True
+
+        conditions = []
+        params = {}
+        if date_from:
+            conditions.append(f"{spec['date']} >= :date_from")
+            params["date_from"] = date_from
+        if date_to:
+            conditions.append(f"{spec['date']} < :date_to")
+            params["date_to"] = date_to
+
+        try:
+            pages = iter_pages(self.connection, spec["select"], spec["keys"], params, " AND ".join(conditions),
+                               self.chunk_size, tuple(after) if after is not None else None)
+            if file_format == "csv":
+                rows, last = self.write_csv(spec, path, pages, append)
+            else:
+                rows, last = self.write_arrow(spec, path, pages, file_format)
+        except ExportError:
+            raise
+        except DatabaseError as e:
+            raise ExportError(f'Export database error: {e.message}')
+        except OSError as e:
+            raise ExportError(f"Cannot write export file '{path}': {e}")
+        except Exception as e:
+            raise ExportError(f'Export error: {e}')
+
+        return {
+            "table": table,
+            "format": file_format,
+            "path": path,
+            "rows": rows,
+            "last": list(last) if last is not None else (list(after) if after is not None else None)
+        }
+
+    def last_exported(self, spec:dict, path:str):
+        line = last_line(path)
+        if line is None:
+            return None
+        row = next(csv.reader([line]))
+        if row == [name for name, _ in spec["columns"]]:
+            return None
+        try:
+            return tuple(spec["columns"][position][1](row[position]) for _, position in spec["keys"])
+        except (IndexError, ValueError):
+            raise ExportError(f"Cannot resume '{path}': its last line is not an exported row")
+
+    def write_csv(self, spec:dict, path:str, pages, append:bool):
+        rows = 0
+        last = None
+        with open(path, "a" if append else "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            if not append:
+                writer.writerow([name for name, _ in spec["columns"]])
+            for page in pages:
+                writer.writerows(page)
+                rows += len(page)
+                last = tuple(page[-1][position] for _, position in spec["keys"])
+        return rows, last
+
+    def write_arrow(self, spec:dict, path:str, pages, file_format:str):
+        try:
+            import pyarrow
+            import pyarrow.ipc
+            import pyarrow.parquet
+        except ImportError:
+            raise ExportError("Parquet and Arrow exports need the optional 'pyarrow' package")
+
+        types = {int: pyarrow.int64(), float: pyarrow.float64(), str: pyarrow.string(), datetime: pyarrow.timestamp("s")}
+        schema = pyarrow.schema([(name, types[kind]) for name, kind in spec["columns"]])
+        rows = 0
+        last = None
+        if file_format == "parquet":
+            writer = pyarrow.parquet.ParquetWriter(path, schema)
+        else:
+            writer = pyarrow.ipc.new_file(path, schema)
+        try:
+            for page in pages:
+                columns = list(zip(*page))
+                batch = pyarrow.record_batch([pyarrow.array(column, type=field.type) for column, field in zip(columns, schema)], schema=schema)
+                if file_format == "parquet":
+                    writer.write_table(pyarrow.Table.from_batches([batch]))
+                else:
+                    writer.write_batch(batch)
+                rows += len(page)
+                last = tuple(page[-1][position] for _, position in spec["keys"])
+        finally:
+            writer.close()
+        return rows, last
@@ -1,57 +1,94 @@
 import csv
-import cx_Oracle
 
-from Src.Table_Gateways.Cash_Account import CashAccount
+from Src.Backends.Backend import DatabaseError, IntegrityError, DUPLICATE
+from Src.Table_Gateways.Cash_Account import CashAccount, CashAccountError
+from Src.Table_Gateways.Reference_Cache import ReferenceCache
+from Src.Unit_Of_Work import UnitOfWork
 
 
 class ImportingError(Exception):
     pass
 
 class Import:
-    def __init__(self, connection):
+    def __init__(self, connection, batch_size:int=1000):
+        if batch_size <= 0:
+            raise ImportingError("Batch size must be a positive integer")
         self.connection = connection
+        self.batch_size = batch_size
 
     def import_csv(self, table:str, csv_path:str):
         try:
-            cursor = self.connection.cursor()
+            with UnitOfWork(self.connection) as uow:
+                rejected = self._import_file(uow.connection, table, csv_path)
+            ReferenceCache().invalidate(table)
+            return [(line, message) for line, _, message in rejected]
+        except ImportingError:
+            raise
+        except CashAccountError as e:
+            raise ImportingError(f'Import error: {e}')
+        except IntegrityError as e:
+            if e.kind == DUPLICATE:
+                raise ImportingError("Already exists")
+            else:
+                raise ImportingError(f'Import error: {e.message} {table}')
+        except DatabaseError as e:
+            raise ImportingError(f'Import database error: {e.message}')
+        except Exception as e:
+            raise ImportingError(f'Import error: {e}')
 
-            with open(csv_path, newline="", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
+    def _import_file(self, connection, table:str, csv_path:str):
+        cursor = connection.cursor()
+        rejected = []
+        total = 0
 
-                if not reader.fieldnames:
-                    raise ImportingError("CSV file has no header")
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
 
-                columns = reader.fieldnames
+            if not reader.fieldnames:
+                raise ImportingError("CSV file has no header")
 
-                if table == "customer":
-                    columns = ["account_id"] + columns
+            columns = reader.fieldnames
 
-                cols = ", ".join(columns)
-                placeholders = ", ".join(f":{c}" for c in columns)
+            if table == "customer":
+                columns = ["account_id"] + columns
 
-                sql = f"INSERT INTO {table} ({cols}) VALUES ({placeholders})"
+            cols = ", ".join(columns)
+            placeholders = ", ".join(f":{c}" for c in columns)
 
-                for row in reader:
-                    if table == "customer":
-                        account = CashAccount(self.connection)
-                        account_id = account.create()
-                        row["account_id"] = account_id
+            sql = f"INSERT INTO {table} ({cols}) VALUES ({placeholders})"
 
-                    cursor.execute(sql, row)
+            rows = []
+            lines = []
+            for row in reader:
+                rows.append(row)
+                lines.append(reader.line_num)
+                if len(rows) >= self.batch_size:
+                    rejected += self._import_batch(connection, table, cursor, sql, rows, lines)
+                    total += len(rows)
+                    rows = []
+                    lines = []
 
-            self.connection.commit()
-            cursor.close()
-        except cx_Oracle.IntegrityError as e:
-            error, = e.args
-            self.connection.rollback()
-            if error.code == 1:
-                raise ImportingError("Already exists")
-            else:
-                raise ImportingError(f'Import error: {error.message} {table}')
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
-            self.connection.rollback()
-            raise ImportingError(f'Import database error: {error_obj.message}')
-        except Exception as e:
-            self.connection.rollback()
-            raise ImportingError(f'Import error: {e}')
\ No newline at end of file
+            if rows:
+                rejected += self._import_batch(connection, table, cursor, sql, rows, lines)
+                total += len(rows)
+
+        if total and len(rejected) == total and all(kind == DUPLICATE for _, kind, _ in rejected):
+            raise ImportingError("Already exists")
+
+        cursor.close()
+        return rejected
+
+    def _import_batch(self, connection, table:str, cursor, sql:str, rows:list, lines:list):
+        account = None
+        if table == "customer":
+            account = CashAccount(connection)
+            account_ids = account.create_many(len(rows))
+            for row, account_id in zip(rows, account_ids):
+                row["account_id"] = account_id
+
+        errors = cursor.executemany_batch_errors(sql, rows)
+
+        if account is not None and errors:
+            account.delete_many([rows[error.offset]["account_id"] for error in errors])
+
+        return [(lines[error.offset], error.kind, error.message) for error in errors]
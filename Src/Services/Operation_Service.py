@@ -0,0 +1,219 @@
+import os
+from datetime import datetime, timedelta
+
+from Src.Services.Customer_Service import CustomerService
+from Src.Services.Export import Export, EXPORTS, FORMATS
+from Src.Services.Import import Import
+from Src.Services.Reservation_Service import ReservationService
+from Src.Services.Utilization import Utilization
+from Src.Table_Gateways.Cash_Account import CashAccount
+from Src.Table_Gateways.Customer import Customer
+from Src.Table_Gateways.Daily_Rollup import DailyRollup, REPORTS
+from Src.Table_Gateways.Hall import Hall
+from Src.Table_Gateways.Ledger import Ledger
+from Src.Table_Gateways.Paging import PAGE_SIZE
+from Src.Table_Gateways.Reservation import Reservation
+from Src.Table_Gateways.Service import Service
+
+class OperationServiceException(Exception):
+    pass
+
+DATETIME_FORMAT = "%Y-%m-%d %H:%M"
+
+REPORT_LABELS = ["total_reservations", "active_reservations", "min_reservation_price", "max_reservation_price",
+                 "avg_reservation_price", "total_paid_amount", "total_payments", "avg_payment",
+                 "unique_customers", "used_halls", "used_services", "total_service_hours"]
+
+class OperationService:
+    def __init__(self, connection, paths:dict=None, import_batch_size:int=1000):
+        self.connection = connection
+        self.paths = paths
+        self.import_batch_size = import_batch_size
+
+    def execute(self, operation:dict):
+        op = operation.get("op")
+        try:
+            if op == "reserve":
+                return self.reserve(operation)
+            if op == "pay":
+                return self.pay(operation)
+            if op == "cancel":
+                ReservationService(self.connection).delete_reservation(int(operation["reservation"]))
+                return {"reservation": int(operation["reservation"])}
+            if op == "slots":
+                return self.slots(operation)
+            if op == "quote":
+                return self.quote(operation)
+            if op == "utilization":
+                return self.utilization(operation)
+            if op == "report":
+                return dict(zip(REPORT_LABELS, ReservationService(self.connection).report(bool(operation.get("exact", False)))))
+            if op == "revenue":
+                return self.revenue(operation)
+            if op == "refresh_rollups":
+                return {"days": DailyRollup(self.connection).refresh()}
+            if op == "customers":
+                return self.customers(operation)
+            if op == "halls":
+                return [{"id": h[0], "name": h[1], "sport_type": h[2], "hourly_rate": h[3], "capacity": h[4]} for h in Hall(self.connection).read_all()]
+            if op == "services":
+                return [{"id": s[0], "name": s[1], "price_per_hour": s[2], "optional": bool(s[3])} for s in Service(self.connection).read_all()]
+            if op == "import":
+                return self.import_all()
+            if op == "export":
+                return self.export(operation)
+            if op == "rollup":
+                return self.rollup()
+            if op == "system_account":
+                return self.system_account()
+            if op == "snapshot":
+                return self.snapshot(operation)
+            if op == "statement":
+                return self.statement(operation)
+            if op == "ledger_check":
+                return [{"account_id": m[0], "balance": m[1], "ledger_balance": m[2]} for m in Ledger(self.connection).mismatches()]
+        except (KeyError, TypeError, ValueError) as e:
+            raise OperationServiceException(f"Invalid operation arguments: {e}")
+        raise OperationServiceException(f"Unknown operation: {op}")
+
+    def reserve(self, operation:dict):
+        start_dt = self.parse_datetime(operation["start"])
+        end_dt = self.parse_datetime(operation["end"])
+        all_halls = {hall[0]: hall for hall in Hall(self.connection).read_all()}
+        service_gateway = Service(self.connection)
+        services_not_optional = service_gateway.read_not_optional()
+        halls = self.pick_halls(all_halls, operation["hall"])
+        chosen_services = self.pick_services(service_gateway, operation.get("service", []))
+
+        reservation_id = ReservationService(self.connection).create_reservation(int(operation["customer"]), start_dt, end_dt, chosen_services, services_not_optional, halls)
+        return {"reservation": reservation_id}
+
+    def quote(self, operation:dict):
+        all_halls = {hall[0]: hall for hall in Hall(self.connection).read_all()}
+        service_gateway = Service(self.connection)
+        hall_sets = operation["halls"] if isinstance(operation["halls"], list) else [operation["halls"]]
+        hall_sets = [self.pick_halls(all_halls, hall_set) for hall_set in hall_sets]
+        slots = [(self.parse_datetime(start), self.parse_datetime(end)) for start, end in operation["slots"]]
+        customer_id = int(operation["customer"]) if operation.get("customer") is not None else None
+
+        quotes = ReservationService(self.connection).quote(customer_id, hall_sets, slots,
+                                                           self.pick_services(service_gateway, operation.get("service", [])),
+                                                           service_gateway.read_not_optional())
+        return [{"halls": q[0], "start": q[1], "end": q[2], "price": q[3]} for q in quotes]
+
+    def pick_halls(self, all_halls:dict, hall_ids):
+        hall_ids = hall_ids if isinstance(hall_ids, list) else [hall_ids]
+        halls = {}
+        for hall_id in hall_ids:
+            if int(hall_id) not in all_halls:
+                raise OperationServiceException(f"Unknown hall id: {hall_id}")
+            halls[int(hall_id)] = all_halls[int(hall_id)]
+        return halls
+
+    def pick_services(self, service_gateway:Service, services):
+        optional = {service[0]: service for service in service_gateway.read_optional()}
+        chosen_services = {}
+        if isinstance(services, dict):
+            services = [f"{service_id}:{hours}" for service_id, hours in services.items()]
+        for service in services:
+            service_id, _, hours = str(service).partition(":")
+            if int(service_id) not in optional:
+                raise OperationServiceException(f"Unknown optional service id: {service_id}")
+            chosen_services[int(service_id)] = float(hours or 1) * optional[int(service_id)][2]
+        return chosen_services
+
+    def pay(self, operation:dict):
+        reservation = Reservation(self.connection).read(int(operation["reservation"]))
+        if reservation is None:
+            raise OperationServiceException(f"Unknown reservation id: {operation['reservation']}")
+        if reservation[4] == "CONFIRMED":
+            raise OperationServiceException(f"Reservation {reservation[0]} is already paid")
+        customer = Customer(self.connection).read_by_id(reservation[1])
+        if customer is None:
+            raise OperationServiceException("Reservation has no customer")
+
+        ReservationService(self.connection).pay_and_transfer(reservation[0], customer[1], reservation[5])
+        return {"reservation": reservation[0], "amount": reservation[5]}
+
+    def rollup(self):
+        credits, amount = CashAccount(self.connection).rollup_system_credits()
+        return {"credits": credits, "amount": amount, **self.system_account()}
+
+    def system_account(self):
+        balance, pending = CashAccount(self.connection).read_system_balance()
+        return {"balance": balance, "pending": pending}
+
+    def snapshot(self, operation:dict):
+        snapshots, taken_through = Ledger(self.connection).take_snapshot(int(operation.get("settle_seconds", 300)))
+        return {"snapshots": snapshots, "taken_through": taken_through}
+
+    def statement(self, operation:dict):
+        accounts = operation["accounts"] if isinstance(operation["accounts"], list) else [operation["accounts"]]
+        date_to = self.parse_datetime(operation["to"]) if operation.get("to") else None
+        return Ledger(self.connection).statements([int(account) for account in accounts], self.parse_datetime(operation["from"]), date_to)
+
+    def utilization(self, operation:dict):
+        hall_ids = operation.get("hall") or []
+        hall_ids = hall_ids if isinstance(hall_ids, list) else [hall_ids]
+        return Utilization(self.connection).report(self.parse_datetime(operation["from"]), self.parse_datetime(operation["to"]),
+                                                   [int(hall_id) for hall_id in hall_ids])
+
+    def revenue(self, operation:dict):
+        by = operation.get("by") or "hall"
+        if by not in REPORTS:
+            raise OperationServiceException(f"Unknown revenue grouping: {by}")
+        date_from = self.parse_datetime(operation["from"])
+        date_to = self.parse_datetime(operation["to"])
+        rows, pending = ReservationService(self.connection).revenue(date_from, date_to, by, bool(operation.get("refresh", False)))
+        if by == "day":
+            rows = [{"day": r[0], "bookings": r[1], "booked_hours": round(r[2], 2), "revenue": round(r[3], 2)} for r in rows]
+        else:
+            rows = [{f"{by}_id": r[0], by: r[1], "bookings": r[2], "booked_hours": round(r[3], 2), "revenue": round(r[4], 2)} for r in rows]
+        return {"from": date_from, "to": date_to, "by": by, "pending_days": pending, "rows": rows}
+
+    def slots(self, operation:dict):
+        window = (self.parse_datetime(operation["window_from"]), self.parse_datetime(operation["window_to"]))
+        customer_id = int(operation["customer"]) if operation.get("customer") is not None else None
+        slots = ReservationService(self.connection).find_free_slots(operation["sport"], timedelta(hours=float(operation["duration"])), window,
+                                                                    min_capacity=int(operation.get("min_capacity", 0)), customer_id=customer_id)
+        return [{"hall_id": s[0], "hall": s[1], "start": s[2], "end": s[3], "price": s[4]} for s in slots]
+
+    def customers(self, operation:dict):
+        after = operation.get("after")
+        pages = CustomerService(self.connection).iter_customers_and_balance(int(operation.get("limit", PAGE_SIZE)),
+                                                                            (int(after),) if after is not None else None)
+        page = next(pages, [])
+        return [{"id": c[0], "name": c[1], "email": c[2], "balance": c[3], "account_id": c[4]} for c in page]
+
+    def import_all(self):
+        if self.paths is None:
+            raise OperationServiceException("Import paths are not configured")
+        import_class = Import(self.connection, self.import_batch_size)
+        return {table: import_class.import_csv(table, self.paths[f"import_{table}"]) for table in ("customer", "hall", "service")}
+
+    def export(self, operation:dict):
+        tables = operation.get("tables") or list(EXPORTS)
+        tables = tables if isinstance(tables, list) else [tables]
+        file_format = operation.get("format") or "csv"
+        directory = operation.get("directory") or (self.paths or {}).get("export")
+        if not directory:
+            raise OperationServiceException("Export directory is not configured")
+        after = operation.get("after")
+        if after is not None:
+            if len(tables) != 1:
+                raise OperationServiceException("Resuming after a key needs exactly one table")
+            after = tuple(int(value) for value in (after.split(",") if isinstance(after, str) else after))
+        date_from = self.parse_datetime(operation["from"]) if operation.get("from") else None
+        date_to = self.parse_datetime(operation["to"]) if operation.get("to") else None
+
+        os.makedirs(directory, exist_ok=True)
+        exporter = Export(self.connection, int(operation.get("chunk_size") or 5000))
+        return [exporter.export(table, os.path.join(directory, table + FORMATS.get(file_format, "")), file_format,
+                                date_from, date_to, after, bool(operation.get("resume", False)))
+                for table in tables]
+
+    def parse_datetime(self, value:str):
+        try:
+            return datetime.strptime(value, DATETIME_FORMAT)
+        except ValueError:
+            raise OperationServiceException(f"Invalid date and time '{value}', expected YYYY-MM-DD HH:MM")
@@ -0,0 +1,99 @@
+import threading
+from array import array
+from datetime import datetime
+
+class PricingEngineError(Exception):
+    pass
+
+WEEK_HOURS = 7 * 24
+MONDAY = datetime(2001, 1, 1)
+
+DEFAULT_RULES = {
+    "peak_from": 17,
+    "peak_to": 22,
+    "peak_multiplier": 1.0,
+    "off_peak_multiplier": 1.0,
+    "weekend_multiplier": 1.0,
+    "team_discount": 0.0
+}
+
+class PricingEngine:
+    _lock = threading.Lock()
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super(PricingEngine, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self, rules:dict=None):
+        if getattr(self, "_initialized", False):
+            return
+
+        self.configure(rules or DEFAULT_RULES)
+        self._initialized = True
+
+    def configure(self, rules:dict):
+        rules = {**DEFAULT_RULES, **rules}
+        if not 0 <= rules["peak_from"] <= rules["peak_to"] <= 24:
+            raise PricingEngineError("Peak hours must satisfy 0 <= peak_from <= peak_to <= 24")
+        for name in ("peak_multiplier", "off_peak_multiplier", "weekend_multiplier"):
+            if rules[name] <= 0:
+                raise PricingEngineError(f"Pricing '{name}' must be positive")
+        if not 0 <= rules["team_discount"] < 1:
+            raise PricingEngineError("Pricing 'team_discount' must be at least 0 and below 1")
+
+        multipliers = array("d")
+        for hour in range(WEEK_HOURS):
+            day, hour_of_day = divmod(hour, 24)
+            rate = rules["peak_multiplier"] if rules["peak_from"] <= hour_of_day < rules["peak_to"] else rules["off_peak_multiplier"]
+            multipliers.append(rate * (rules["weekend_multiplier"] if day >= 5 else 1.0))
+        cumulative = array("d", [0.0])
+        for multiplier in multipliers:
+            cumulative.append(cumulative[-1] + multiplier)
+
+        self.rules = rules
+        self._tables = (multipliers, cumulative, 1 - rules["team_discount"])
+
+    @property
+    def team_discount(self):
+        return self.rules["team_discount"]
+
+    def _weight(self, tables:tuple, moment:datetime):
+        multipliers, cumulative, _ = tables
+        weeks, hours = divmod((moment - MONDAY).total_seconds() / 3600, WEEK_HOURS)
+        hour = min(int(hours), WEEK_HOURS - 1)
+        return weeks * cumulative[WEEK_HOURS] + cumulative[hour] + multipliers[hour] * (hours - hour)
+
+    def weighted_hours(self, start_time:datetime, end_time:datetime):
+        tables = self._tables
+        return self._weight(tables, end_time) - self._weight(tables, start_time)
+
+    def rate_factor(self, start_time:datetime, end_time:datetime):
+        hours = (end_time - start_time).total_seconds() / 3600
+        if hours <= 0:
+            raise PricingEngineError("Start time must be before end time")
+        return self.weighted_hours(start_time, end_time) / hours
+
+    def quote_many(self, candidates):
+        tables = self._tables
+        team_factor = tables[2]
+        weights = {}
+        prices = []
+        for hall_rate, start_time, end_time, hourly_rate, fixed_amount, team in candidates:
+            if start_time >= end_time:
+                raise PricingEngineError("Start time must be before end time")
+            start_weight = weights.get(start_time)
+            if start_weight is None:
+                start_weight = weights[start_time] = self._weight(tables, start_time)
+            end_weight = weights.get(end_time)
+            if end_weight is None:
+                end_weight = weights[end_time] = self._weight(tables, end_time)
+            hours = (end_time - start_time).total_seconds() / 3600
+            price = hall_rate * (end_weight - start_weight) + hourly_rate * hours + fixed_amount
+            prices.append(round(price * team_factor if team else price, 2))
+        return prices
+
+    def quote(self, hall_rate:float, start_time:datetime, end_time:datetime, hourly_rate:float=0.0, fixed_amount:float=0.0, team:bool=False):
+        return self.quote_many([(hall_rate, start_time, end_time, hourly_rate, fixed_amount, team)])[0]
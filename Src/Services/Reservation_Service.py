@@ -1,167 +1,410 @@
-from datetime import datetime
-import cx_Oracle
+import heapq
+import math
+import time
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
 
+from Src.Backends.Backend import DatabaseError
+from Src.Services.Availability_Index import AvailabilityIndex
+from Src.Services.Pricing_Engine import PricingEngine
 from Src.Table_Gateways.Cash_Account import CashAccount, CashAccountError
-from Src.Table_Gateways.Hall import Hall
+from Src.Table_Gateways.Customer import Customer
+from Src.Table_Gateways.Daily_Rollup import DailyRollup, DailyRollupError
+from Src.Table_Gateways.Hall import Hall, HallError
+from Src.Table_Gateways.Paging import PAGE_SIZE, iter_pages
 from Src.Table_Gateways.Payment import Payment, PaymentException
 from Src.Table_Gateways.Reservation import Reservation, ReservationException
 from Src.Table_Gateways.Reservation_Hall import ReservationHall, ReservationHallException
 from Src.Table_Gateways.Reservation_Service import ServiceReservation
+from Src.Table_Gateways.Reservation_Summary import ReservationSummary, ReservationSummaryException
+from Src.Table_Gateways.Service import Service
+from Src.Unit_Of_Work import UnitOfWork, UnitOfWorkError
 
 class ReservationServiceException(Exception):
     pass
 
+SERIES_RULES = {
+    "WEEKLY": timedelta(weeks=1),
+    "BIWEEKLY": timedelta(weeks=2)
+}
+
 class ReservationService:
     def __init__(self, connection):
         self.connection = connection
 
     def create_reservation(self, customer_id:int, start_time:datetime, end_time:datetime, optional_services:dict, not_optional_services, halls:dict):
         try:
-            available = self.check_halls(halls, start_time, end_time)
-            if type(available) is str:
-                raise Exception(f"Hall {available} is unavailable in selected time")
-            total_price = self.calc_price(optional_services, not_optional_services, halls, end_time, start_time)
+            if self.connection.backend.stored_procedures:
+                return self.book_on_server(customer_id, start_time, end_time, optional_services, halls)
+
+            team = self.is_team(customer_id)
+            total_price = self.calc_price(optional_services, not_optional_services, halls, end_time, start_time, team)
+            amounts = self.service_amounts(optional_services, not_optional_services, start_time, end_time, team)
+            hours = int((end_time - start_time).total_seconds() / 3600)
 
-            reservation = Reservation(self.connection)
-            reservation_id = reservation.create(customer_id, start_time, end_time, total_price)
+            with UnitOfWork(self.connection) as uow:
+                Hall(uow.connection).lock(list(halls.keys()))
+                available = self.check_halls(halls, start_time, end_time)
+                if type(available) is str:
+                    raise ReservationServiceException(f"Hall {available} is unavailable in selected time")
 
-            combined_services = {}
-            for service in optional_services.keys():
-                combined_services[service] = optional_services[service]
-            for service in not_optional_services:
-                combined_services[service[0]] = service[1]
+                reservation = Reservation(uow.connection)
+                reservation_id = reservation.create(customer_id, start_time, end_time, total_price)
 
-            hours = int((end_time - start_time).total_seconds() / 3600)
-            service_reservation = ServiceReservation(self.connection)
-            for service in combined_services.keys():
-                service_reservation.create(reservation_id, service, hours)
+                service_reservation = ServiceReservation(uow.connection)
+                service_reservation.create_many([(reservation_id, service, hours, amount) for service, amount in amounts.items()])
 
-            reservation_hall = ReservationHall(self.connection)
-            for hall in halls.keys():
-                reservation_hall.create(reservation_id, hall)
+                reservation_hall = ReservationHall(uow.connection)
+                reservation_hall.create_many([(reservation_id, hall) for hall in halls.keys()])
+
+            AvailabilityIndex().add(reservation_id, halls.keys(), start_time, end_time)
+            return reservation_id
         except ReservationException as e:
             raise ReservationServiceException(f'{e}')
         except ReservationServiceException as e:
             raise ReservationServiceException(f'{e}')
         except ReservationHallException as e:
             raise ReservationServiceException(f'{e}')
-        except cx_Oracle.DatabaseError as e:
+        except HallError as e:
+            raise ReservationServiceException(f'{e}')
+        except UnitOfWorkError as e:
+            raise ReservationServiceException(f'{e}')
+        except DatabaseError as e:
             raise ReservationServiceException(f'Reservation service database error: {e}')
         except Exception as e:
             raise ReservationServiceException(f'Unexpected error while creating reservation {e}')
 
-    def pay_and_transfer(self, reservation_id:int, account_id:int, amount:float, ):
-        payment = None
-        payment_id = None
+    def book_on_server(self, customer_id:int, start_time:datetime, end_time:datetime, optional_services:dict, halls:dict):
+        index = AvailabilityIndex()
+        index.ensure_loaded(self.connection)
+        for hall_id in halls:
+            if not index.is_free(hall_id, start_time, end_time):
+                available = self.check_halls(halls, start_time, end_time)
+                if type(available) is str:
+                    raise ReservationServiceException(f"Hall {available} is unavailable in selected time")
+                break
+
+        engine = PricingEngine()
+        reservation_id, conflict = Reservation(self.connection).book(customer_id, start_time, end_time, list(halls.keys()), optional_services,
+                                                                     engine.rate_factor(start_time, end_time), engine.team_discount)
+        if conflict:
+            index.invalidate()
+            raise ReservationServiceException(f"Hall {conflict} is unavailable in selected time")
+
+        index.add(reservation_id, halls.keys(), start_time, end_time)
+        return reservation_id
+
+    def create_reservation_series(self, customer_id:int, start_time:datetime, end_time:datetime, rule:str, until:date, exceptions:list, optional_services:dict, not_optional_services, halls:dict, skip_conflicts:bool=True):
+        if rule.upper() not in SERIES_RULES:
+            raise ReservationServiceException(f"Invalid series rule: {rule}")
+        if start_time >= end_time:
+            raise ReservationServiceException("Start time must be before end time")
+
         try:
-            payment = Payment(self.connection)
-            payment_id = payment.create(reservation_id, amount)
-            if payment_id is None:
-                raise PaymentException("Payment not created")
+            customer = Customer(self.connection).read_by_id(customer_id)
+            if customer is None or customer[5] != 'TEAM':
+                raise ReservationServiceException("Recurring reservations are available only for TEAM customers")
+
+            skipped = set(exceptions)
+            step = SERIES_RULES[rule.upper()]
+            if end_time - start_time >= step:
+                raise ReservationServiceException("Reservation is longer than the series interval")
+            occurrences = []
+            occurrence_from, occurrence_to = start_time, end_time
+            while occurrence_from.date() <= until:
+                occurrences.append((occurrence_from, occurrence_to))
+                occurrence_from += step
+                occurrence_to += step
+            if not occurrences:
+                raise ReservationServiceException("Series has no occurrences")
+
+            total_price = self.calc_price(optional_services, not_optional_services, halls, end_time, start_time, True)
+            hours = int((end_time - start_time).total_seconds() / 3600)
+            amounts = self.service_amounts(optional_services, not_optional_services, start_time, end_time, True)
+
+            with UnitOfWork(self.connection) as uow:
+                Hall(uow.connection).lock(list(halls.keys()))
+                busy = {}
+                reservation_hall = ReservationHall(uow.connection)
+                for hall_id, busy_from, busy_to in reservation_hall.read_busy_between(list(halls.keys()), occurrences[0][0], occurrences[-1][1]):
+                    starts, max_ends = busy.setdefault(hall_id, ([], []))
+                    starts.append(busy_from)
+                    max_ends.append(max(busy_to, max_ends[-1]) if max_ends else busy_to)
+
+                report = []
+                accepted = []
+                for occurrence_from, occurrence_to in occurrences:
+                    if occurrence_from.date() in skipped:
+                        report.append([occurrence_from, occurrence_to, "SKIPPED", "Excluded from series", None])
+                        continue
+                    conflict = None
+                    for hall_id, hall_data in halls.items():
+                        starts, max_ends = busy.get(hall_id, ([], []))
+                        position = bisect_left(starts, occurrence_to)
+                        if position > 0 and max_ends[position - 1] > occurrence_from:
+                            conflict = hall_data[1]
+                            break
+                    if conflict is not None:
+                        report.append([occurrence_from, occurrence_to, "CONFLICT", f"Hall {conflict} is unavailable", None])
+                    else:
+                        report.append([occurrence_from, occurrence_to, "OK", "", None])
+                        accepted.append(report[-1])
 
-            account = CashAccount(self.connection)
-            account.transfer_to_system_account(amount, account_id)
+                has_conflicts = any(r[2] == "CONFLICT" for r in report)
+                if has_conflicts and not skip_conflicts:
+                    for row in accepted:
+                        row[2], row[3] = "NOT_BOOKED", "Series has conflicts"
+                    return [tuple(r) for r in report]
+                if not accepted:
+                    return [tuple(r) for r in report]
 
-            reservation = Reservation(self.connection)
-            reservation.update("status", "CONFIRMED", reservation_id)
+                reservation = Reservation(uow.connection)
+                reservation_ids = reservation.create_many(customer_id, [(r[0], r[1]) for r in accepted], total_price)
+
+                ServiceReservation(uow.connection).create_many(
+                    [(reservation_id, service_id, hours, amount) for reservation_id in reservation_ids for service_id, amount in amounts.items()])
+                ReservationHall(uow.connection).create_many(
+                    [(reservation_id, hall_id) for reservation_id in reservation_ids for hall_id in halls.keys()])
+
+            index = AvailabilityIndex()
+            for row, reservation_id in zip(accepted, reservation_ids):
+                row[4] = reservation_id
+                index.add(reservation_id, halls.keys(), row[0], row[1])
+            return [tuple(r) for r in report]
+        except ReservationServiceException:
+            raise
+        except ReservationException as e:
+            raise ReservationServiceException(f'{e}')
+        except ReservationHallException as e:
+            raise ReservationServiceException(f'{e}')
+        except HallError as e:
+            raise ReservationServiceException(f'{e}')
+        except UnitOfWorkError as e:
+            raise ReservationServiceException(f'{e}')
+        except DatabaseError as e:
+            raise ReservationServiceException(f'Reservation service database error: {e}')
+        except Exception as e:
+            raise ReservationServiceException(f'Unexpected error while creating reservation series {e}')
+
+    def delete_reservation(self, reservation_id:int):
+        try:
+            with UnitOfWork(self.connection) as uow:
+                reservation = Reservation(uow.connection)
+                reservation.lock(reservation_id)
+                reservation.delete(reservation_id)
+            AvailabilityIndex().remove(reservation_id)
+        except ReservationException as e:
+            raise ReservationServiceException(f'{e}')
+        except UnitOfWorkError as e:
+            raise ReservationServiceException(f'{e}')
+        except Exception as e:
+            raise ReservationServiceException(f'Unexpected error while deleting reservation {e}')
+
+    def pay_and_transfer(self, reservation_id:int, account_id:int, amount:float):
+        try:
+            with UnitOfWork(self.connection) as uow:
+                Reservation(uow.connection).confirm(reservation_id)
+                payment_id = Payment(uow.connection).create(reservation_id, amount)
+                CashAccount(uow.connection).transfer_to_system_account(amount, account_id, payment_id)
+        except ReservationException as e:
+            raise ReservationServiceException(f'{e}')
         except PaymentException as e:
             raise ReservationServiceException(f'{e}')
         except CashAccountError as e:
-            if payment and payment_id:
-                payment.delete(payment_id)
             raise ReservationServiceException(f'{e}')
-        except cx_Oracle.DatabaseError as e:
+        except UnitOfWorkError as e:
+            raise ReservationServiceException(f'{e}')
+        except DatabaseError as e:
             raise ReservationServiceException(f'Payment database error: {e}')
         except Exception as e:
             raise ReservationServiceException(f'Unexpected error while paying reservation {e}')
 
     def read_available_halls(self):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT * FROM free_halls_view")
+            cursor = self.connection.execute("SELECT * FROM free_halls_view")
             return cursor.fetchall()
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
-            raise ReservationServiceException(f'Reservation service database error: {error_obj.message}')
+        except DatabaseError as e:
+            raise ReservationServiceException(f'Reservation service database error: {e.message}')
         except Exception as e:
             raise ReservationServiceException(f'Reservation service error: {e}')
 
     def read_reservation_detail(self):
+        return [row for page in self.iter_reservation_detail() for row in page]
+
+    def iter_reservation_detail(self, page_size:int=PAGE_SIZE, after:tuple=None):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT * FROM reservation_details_view")
-            return cursor.fetchall()
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
-            raise ReservationServiceException(f'Reservation service database error: {error_obj.message}')
+            yield from iter_pages(self.connection, "SELECT * FROM reservation_details_view",
+                                  [("start_time", 1), ("reservation_id", 0), ("hall_id", 8)], page_size=page_size, after=after)
+        except DatabaseError as e:
+            raise ReservationServiceException(f'Reservation service database error: {e.message}')
         except Exception as e:
             raise ReservationServiceException(f'Reservation service error: {e}')
 
     def read_id_name_email(self):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT r.id AS reservation_id, c.name AS customer_name, c.email AS customer_email FROM reservation r JOIN customer c ON c.id = r.customer_id")
+            cursor = self.connection.execute("SELECT r.id AS reservation_id, c.name AS customer_name, c.email AS customer_email FROM reservation r JOIN customer c ON c.id = r.customer_id")
             return cursor.fetchall()
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
-            raise ReservationServiceException(f'Reservation service database error: {error_obj.message}')
+        except DatabaseError as e:
+            raise ReservationServiceException(f'Reservation service database error: {e.message}')
         except Exception as e:
             raise ReservationServiceException(f'Reservation service error: {e}')
 
     def read_not_paid(self):
+        return [row for page in self.iter_not_paid() for row in page]
+
+    def iter_not_paid(self, page_size:int=PAGE_SIZE, after:tuple=None):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(
-                "SELECT r.id AS reservation_id, "
-                "c.id AS customer_id, "
-                "c.account_id AS account_id, "
-                "c.name AS customer_name, "
-                "c.email AS customer_email, "
-                "r.total_price "
-                "FROM reservation r "
-                "JOIN customer c ON c.id = r.customer_id "
-                "LEFT JOIN payment p ON p.reservation_id = r.id "
-                "WHERE p.id IS NULL"
-            )
-            return cursor.fetchall()
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
-            raise ReservationServiceException(f'Reservation service database error: {error_obj.message}')
+            yield from iter_pages(self.connection,
+                                  "SELECT r.id AS reservation_id, "
+                                  "c.id AS customer_id, "
+                                  "c.account_id AS account_id, "
+                                  "c.name AS customer_name, "
+                                  "c.email AS customer_email, "
+                                  "r.total_price "
+                                  "FROM reservation r "
+                                  "JOIN customer c ON c.id = r.customer_id "
+                                  "LEFT JOIN payment p ON p.reservation_id = r.id",
+                                  [("r.id", 0)], where="p.id IS NULL", page_size=page_size, after=after)
+        except DatabaseError as e:
+            raise ReservationServiceException(f'Reservation service database error: {e.message}')
+        except Exception as e:
+            raise ReservationServiceException(f'Reservation service error: {e}')
+
+    def report(self, exact:bool=False):
+        try:
+            summary = ReservationSummary(self.connection)
+            if exact:
+                DailyRollup(self.connection).rebuild()
+            data = summary.read()
+            if data is None:
+                raise ReservationServiceException("Reservation summary is missing")
+            if data[12] is None:
+                DailyRollup(self.connection).refresh()
+                data = summary.read()
+            return data[:12]
+        except ReservationServiceException:
+            raise
+        except DailyRollupError as e:
+            raise ReservationServiceException(f'{e}')
+        except ReservationSummaryException as e:
+            raise ReservationServiceException(f'{e}')
         except Exception as e:
             raise ReservationServiceException(f'Reservation service error: {e}')
 
-    def report(self):
+    def revenue(self, date_from:datetime, date_to:datetime, by:str="hall", refresh:bool=False):
+        if date_from >= date_to:
+            raise ReservationServiceException("Revenue report start must be before its end")
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT * FROM reservation_summary_view")
-            return cursor.fetchone()
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
-            raise ReservationServiceException(f'Reservation service database error: {error_obj.message}')
+            rollup = DailyRollup(self.connection)
+            if refresh:
+                rollup.refresh()
+            return rollup.read(by, date_from, date_to), rollup.pending_days(date_from, date_to)
+        except DailyRollupError as e:
+            raise ReservationServiceException(f'{e}')
         except Exception as e:
             raise ReservationServiceException(f'Reservation service error: {e}')
 
     def check_halls(self, halls:dict, time_from:datetime, time_to:datetime):
-        hall = Hall(self.connection)
-        available_halls = hall.read_available_in_date(time_from, time_to)
-        if type(available_halls) is list:
-            for hall_id, hall_data in halls.items():
-                if hall_id not in available_halls:
-                    return hall_data[1]
+        index = AvailabilityIndex()
+        index.ensure_loaded(self.connection)
+        hinted_busy = [hall_id for hall_id in halls if not index.is_free(hall_id, time_from, time_to)]
+        if hinted_busy and index.trusts_busy():
+            return halls[hinted_busy[0]][1]
 
+        busy = {row[0] for row in Hall(self.connection).read_busy(list(halls.keys()), time_from, time_to)}
+        if busy != set(hinted_busy):
+            index.invalidate()
+        for hall_id, hall_data in halls.items():
+            if hall_id in busy:
+                return hall_data[1]
         return True
 
-    def calc_price(self, services_optional:dict, services_not_optional, halls:dict, end_time:datetime, start_time:datetime):
-        reservation_price = 0
-        hours = (end_time - start_time).total_seconds() / 3600
+    def find_free_slots(self, sport_type:str, duration:timedelta, window, granularity:timedelta=timedelta(minutes=30), min_capacity:int=0, limit:int=20, time_budget:float=0.5, customer_id:int=None):
+        if duration <= timedelta(0) or granularity <= timedelta(0):
+            raise ReservationServiceException("Duration and granularity must be positive")
+
+        try:
+            windows = [window] if isinstance(window[0], datetime) else list(window)
+            halls = [h for h in Hall(self.connection).read_all() if h[2] == sport_type.upper() and h[4] >= min_capacity]
+            hourly_rate = sum(service[2] for service in Service(self.connection).read_not_optional())
+            team = self.is_team(customer_id) if customer_id is not None else False
+            index = AvailabilityIndex()
+            index.ensure_loaded(self.connection)
+        except Exception as e:
+            raise ReservationServiceException(f'Reservation service error: {e}')
+
+        slots_needed = math.ceil(duration / granularity)
+        deadline = time.perf_counter() + time_budget
+        now = datetime.now()
+        candidates = []
 
-        for hall in halls.values():
-            reservation_price += hall[3] * hours
+        for window_from, window_to in windows:
+            if window_from < now:
+                window_from += math.ceil((now - window_from) / granularity) * granularity
+            slot_count = int((window_to - window_from) // granularity)
+            if slot_count < slots_needed:
+                continue
 
-        for services_not_optional in services_not_optional:
-            reservation_price += services_not_optional[2] * hours
+            for hall in halls:
+                free = self._free_slot_mask(index, hall[0], window_from, window_to, granularity, slot_count)
+                starts = self._run_starts(free, slots_needed)
+                while starts:
+                    lowest = starts & -starts
+                    position = lowest.bit_length() - 1
+                    slot_from = window_from + position * granularity
+                    candidates.append((slot_from, hall[4], hall[3], hall[0], hall[1], slot_from + slots_needed * granularity))
+                    starts ^= lowest
 
-        for services_optional in services_optional.values():
-            reservation_price += services_optional
+                if time.perf_counter() > deadline:
+                    break
+            if time.perf_counter() > deadline:
+                break
+
+        best = heapq.nsmallest(limit, candidates)
+        prices = PricingEngine().quote_many([(c[2], c[0], c[5], hourly_rate, 0.0, team) for c in best])
+        return [(c[3], c[4], c[0], c[5], price) for c, price in zip(best, prices)]
+
+    def _free_slot_mask(self, index:AvailabilityIndex, hall_id:int, window_from:datetime, window_to:datetime, granularity:timedelta, slot_count:int):
+        busy = 0
+        for busy_from, busy_to in index.busy_intervals(hall_id, window_from, window_to):
+            first = max(0, (busy_from - window_from) // granularity)
+            last = min(slot_count, math.ceil((busy_to - window_from) / granularity))
+            if last > first:
+                busy |= ((1 << (last - first)) - 1) << first
+        return ((1 << slot_count) - 1) & ~busy
+
+    def _run_starts(self, free:int, slots_needed:int):
+        starts = free
+        run = 1
+        while run < slots_needed and starts:
+            step = min(run, slots_needed - run)
+            starts &= starts >> step
+            run += step
+        return starts
+
+    def is_team(self, customer_id:int):
+        if PricingEngine().team_discount == 0:
+            return False
+        customer = Customer(self.connection).read_by_id(customer_id)
+        return customer is not None and customer[5] == 'TEAM'
+
+    def quote(self, customer_id:int, hall_sets:list, slots:list, optional_services:dict, not_optional_services):
+        hourly_rate = sum(service[2] for service in not_optional_services)
+        fixed_amount = sum(optional_services.values())
+        team = self.is_team(customer_id) if customer_id is not None else False
+        candidates = [(halls, start_time, end_time) for halls in hall_sets for start_time, end_time in slots]
+        prices = PricingEngine().quote_many([(sum(hall[3] for hall in halls.values()), start_time, end_time, hourly_rate, fixed_amount, team)
+                                             for halls, start_time, end_time in candidates])
+        return [(list(halls.keys()), start_time, end_time, price) for (halls, start_time, end_time), price in zip(candidates, prices)]
+
+    def service_amounts(self, optional_services:dict, not_optional_services, start_time:datetime, end_time:datetime, team:bool=False):
+        hours = (end_time - start_time).total_seconds() / 3600
+        amounts = dict(optional_services)
+        for service in not_optional_services:
+            amounts[service[0]] = service[2] * hours
+        factor = 1 - PricingEngine().team_discount if team else 1
+        return {service_id: round(amount * factor, 2) for service_id, amount in amounts.items()}
 
-        return reservation_price
\ No newline at end of file
+    def calc_price(self, services_optional:dict, services_not_optional, halls:dict, end_time:datetime, start_time:datetime, team:bool=False):
+        return PricingEngine().quote(sum(hall[3] for hall in halls.values()), start_time, end_time,
+                                     sum(service[2] for service in services_not_optional), sum(services_optional.values()), team)
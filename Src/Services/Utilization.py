@@ -0,0 +1,161 @@
+from array import array
+from datetime import datetime, timedelta
+from itertools import accumulate
+from operator import add
+
+from Src.Backends.Backend import DatabaseError
+from Src.Table_Gateways.Hall import Hall
+
+class UtilizationError(Exception):
+    pass
+
+HOURS_PER_DAY = 24
+HOURS_PER_WEEK = 7 * 24
+FETCH_SIZE = 1000
+WEEKDAYS = ["MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN"]
+
+class Utilization:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def report(self, date_from:datetime, date_to:datetime, hall_ids:list=None):
+        start = date_from.replace(minute=0, second=0, microsecond=0)
+        end = date_to.replace(minute=0, second=0, microsecond=0)
+        if end < date_to:
+            end += timedelta(hours=1)
+        if start >= end:
+            raise UtilizationError("Report start must be before its end")
+
+        hours = int((end - start).total_seconds() // 3600)
+        layout = self.layout(start, hours)
+        try:
+            halls = {hall[0]: hall for hall in Hall(self.connection).read_all()}
+        except Exception as e:
+            raise UtilizationError(f'Utilization error: {e}')
+        selected = sorted(set(hall_ids)) if hall_ids else sorted(halls)
+        for hall_id in selected:
+            if hall_id not in halls:
+                raise UtilizationError(f"Unknown hall id: {hall_id}")
+
+        report = {}
+        for hall_id, occupancy, revenue in self.occupancy(start, end, hours, selected):
+            report[hall_id] = self.summarize(halls[hall_id], occupancy, revenue, layout)
+        empty = array("d", bytes(8 * hours))
+        return {
+            "from": start,
+            "to": end,
+            "hours": hours,
+            "halls": [report.get(hall_id) or self.summarize(halls[hall_id], empty, empty, layout) for hall_id in selected]
+        }
+
+    def occupancy(self, start:datetime, end:datetime, hours:int, hall_ids:list):
+        if not hall_ids:
+            return
+        placeholders = ", ".join(f":h{i}" for i in range(len(hall_ids)))
+        params = {f"h{i}": hall_id for i, hall_id in enumerate(hall_ids)}
+        params.update(date_from=start, date_to=end)
+        try:
+            cursor = self.connection.cursor()
+            cursor.set_fetch_size(FETCH_SIZE)
+            cursor.execute("SELECT rh.hall_id, r.start_time, r.end_time, r.total_price, "
+                           "(SELECT COUNT(*) FROM reservation_hall x WHERE x.reservation_id = r.id) "
+                           "FROM reservation r JOIN reservation_hall rh ON rh.reservation_id = r.id "
+                           f"WHERE rh.hall_id IN ({placeholders}) AND r.start_time < :date_to AND r.end_time > :date_from "
+                           "ORDER BY rh.hall_id",
+                           params)
+
+            current = None
+            for hall_id, start_time, end_time, total_price, hall_count in cursor:
+                if hall_id != current:
+                    if current is not None:
+                        yield current, self.collapse(occupied, occupied_partial), self.collapse(earned, earned_partial)
+                    current = hall_id
+                    occupied, occupied_partial = array("d", bytes(8 * (hours + 1))), array("d", bytes(8 * hours))
+                    earned, earned_partial = array("d", bytes(8 * (hours + 1))), array("d", bytes(8 * hours))
+
+                duration = (end_time - start_time).total_seconds() / 3600
+                first = max((start_time - start).total_seconds() / 3600, 0.0)
+                last = min((end_time - start).total_seconds() / 3600, float(hours))
+                self.spread(occupied, occupied_partial, first, last, 1.0)
+                self.spread(earned, earned_partial, first, last, (total_price or 0) / max(hall_count, 1) / duration)
+            if current is not None:
+                yield current, self.collapse(occupied, occupied_partial), self.collapse(earned, earned_partial)
+            cursor.close()
+        except DatabaseError as e:
+            raise UtilizationError(f'Utilization database error: {e.message}')
+
+    def spread(self, difference:array, partial:array, first:float, last:float, weight:float):
+        first_hour = int(first)
+        last_hour = int(last)
+        if first_hour == last_hour:
+            partial[first_hour] += (last - first) * weight
+            return
+        partial[first_hour] += (first_hour + 1 - first) * weight
+        difference[first_hour + 1] += weight
+        difference[last_hour] -= weight
+        if last_hour < len(partial):
+            partial[last_hour] += (last - last_hour) * weight
+
+    def collapse(self, difference:array, partial:array):
+        return array("d", map(add, accumulate(difference[:len(partial)]), partial))
+
+    def layout(self, start:datetime, hours:int):
+        months = []
+        month_start = start.replace(day=1, hour=0)
+        while month_start < start + timedelta(hours=hours):
+            month_end = (month_start + timedelta(days=32)).replace(day=1)
+            first = max(int((month_start - start).total_seconds() // 3600), 0)
+            last = min(int((month_end - start).total_seconds() // 3600), hours)
+            months.append((month_start.strftime("%Y-%m"), first, last))
+            month_start = month_end
+
+        hour_offset = start.hour
+        week_offset = start.weekday() * HOURS_PER_DAY + start.hour
+        return {
+            "hour_offsets": [(hour - hour_offset) % HOURS_PER_DAY for hour in range(HOURS_PER_DAY)],
+            "week_offsets": [(hour - week_offset) % HOURS_PER_WEEK for hour in range(HOURS_PER_WEEK)],
+            "months": months,
+            "hours": hours
+        }
+
+    def summarize(self, hall:tuple, occupancy:array, revenue:array, layout:dict):
+        hours = layout["hours"]
+        by_hour = []
+        for offset in layout["hour_offsets"]:
+            available = len(range(offset, hours, HOURS_PER_DAY))
+            by_hour.append(self.percent(sum(occupancy[offset::HOURS_PER_DAY]), available))
+
+        week_occupied = [sum(occupancy[offset::HOURS_PER_WEEK]) for offset in layout["week_offsets"]]
+        week_available = [len(range(offset, hours, HOURS_PER_WEEK)) for offset in layout["week_offsets"]]
+        by_weekday = {}
+        for day, name in enumerate(WEEKDAYS):
+            hours_of_day = slice(day * HOURS_PER_DAY, (day + 1) * HOURS_PER_DAY)
+            by_weekday[name] = self.percent(sum(week_occupied[hours_of_day]), sum(week_available[hours_of_day]))
+
+        by_month = {}
+        for label, first, last in layout["months"]:
+            occupied = sum(occupancy[first:last])
+            earned = sum(revenue[first:last])
+            by_month[label] = {
+                "occupancy_pct": self.percent(occupied, last - first),
+                "occupied_hours": round(occupied, 2),
+                "revenue": round(earned, 2),
+                "revenue_per_hour": round(earned / occupied, 2) if occupied else None
+            }
+
+        occupied = sum(occupancy)
+        earned = sum(revenue)
+        return {
+            "hall_id": hall[0],
+            "hall": hall[1],
+            "occupied_hours": round(occupied, 2),
+            "occupancy_pct": self.percent(occupied, hours),
+            "revenue": round(earned, 2),
+            "revenue_per_hour": round(earned / occupied, 2) if occupied else None,
+            "by_hour": by_hour,
+            "by_weekday": by_weekday,
+            "by_month": by_month
+        }
+
+    def percent(self, occupied:float, available:int):
+        return round(100 * occupied / available, 1) if available else None
@@ -1,4 +1,6 @@
-import cx_Oracle
+from Src.Backends.Backend import DatabaseError, IntegrityError, DUPLICATE, CHECK, NOT_NULL, TOO_LARGE
+from Src.Table_Gateways.Ledger import Ledger, DEPOSIT, WITHDRAWAL
+from Src.Table_Gateways.Paging import PAGE_SIZE, iter_pages
 
 class CashAccountError(Exception):
     pass
@@ -13,42 +15,71 @@ class CashAccount:
         if balance < 0:
             raise CashAccountError('Balance cannot be negative')
 
+        try:
+            account_id = self.connection.insert_returning_id("INSERT INTO CASH_ACCOUNT (BALANCE, ACCOUNT_TYPE) VALUES (:balance, :account_type)",
+                                                             {
+                                                                 'balance': balance,
+                                                                 'account_type': account_type.upper()
+                                                             })
+            if balance > 0:
+                Ledger(self.connection).record(DEPOSIT, balance, None, account_id)
+            self.connection.commit()
+            return account_id
+        except IntegrityError as e:
+            self.connection.rollback()
+            if e.kind == DUPLICATE:
+                raise CashAccountError("Cash Account database integrity error: Cash Account with duplicate data in database")
+            elif e.kind == CHECK:
+                raise CashAccountError("Cash Account database integrity error: Invalid values")
+            elif e.kind == NOT_NULL:
+                raise CashAccountError("Cash Account database integrity error: Cannot insert NULL values")
+            elif e.kind == TOO_LARGE:
+                raise CashAccountError("Cash Account database integrity error: Too large value")
+            else:
+                raise CashAccountError(f'Cash Account database integrity error: {e.message}')
+        except DatabaseError as e:
+            self.connection.rollback()
+            raise CashAccountError(f'Cash account database error: {e.message}')
+        except Exception as e:
+            self.connection.rollback()
+            raise CashAccountError(f'Cash account error: {e}')
+
+    def create_many(self, count:int, balance:float=0.0, account_type:str='CUSTOMER'):
+        if account_type.upper() not in ['CUSTOMER', 'SYSTEM']:
+            raise CashAccountError('Invalid account type')
+        if balance < 0:
+            raise CashAccountError('Balance cannot be negative')
+        if count <= 0:
+            return []
+
         try:
             cursor = self.connection.cursor()
-            account_id_var = cursor.var(cx_Oracle.NUMBER)
-            cursor.execute("INSERT INTO CASH_ACCOUNT (BALANCE, ACCOUNT_TYPE) VALUES (:balance, :account_type) RETURNING id INTO :id",
-                           {
-                               'balance': balance,
-                               'account_type': account_type.upper(),
-                                'id' : account_id_var
-                           })
+            account_ids = cursor.insert_many_returning_ids("INSERT INTO CASH_ACCOUNT (BALANCE, ACCOUNT_TYPE) VALUES (:1, :2)",
+                                                           [(balance, account_type.upper())] * count)
+            Ledger(self.connection).record_many(DEPOSIT, [(balance, None, account_id, None) for account_id in account_ids])
             self.connection.commit()
-            account_id = account_id_var.getvalue()[0]
-            return int(account_id)
-        except cx_Oracle.IntegrityError as e:
-            error, = e.args
+            return account_ids
+        except IntegrityError as e:
             self.connection.rollback()
-            if error.code == 1:
+            if e.kind == DUPLICATE:
                 raise CashAccountError("Cash Account database integrity error: Cash Account with duplicate data in database")
-            elif error.code == 2290:
+            elif e.kind == CHECK:
                 raise CashAccountError("Cash Account database integrity error: Invalid values")
-            elif error.code == 1400:
+            elif e.kind == NOT_NULL:
                 raise CashAccountError("Cash Account database integrity error: Cannot insert NULL values")
-            elif error.code == 1438 or error.code == 12899:
+            elif e.kind == TOO_LARGE:
                 raise CashAccountError("Cash Account database integrity error: Too large value")
             else:
-                raise CashAccountError(f'Cash Account database integrity error: {error.message}')
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
+                raise CashAccountError(f'Cash Account database integrity error: {e.message}')
+        except DatabaseError as e:
             self.connection.rollback()
-            raise CashAccountError(f'Cash account database error: {error_obj.message}')
+            raise CashAccountError(f'Cash account database error: {e.message}')
         except Exception as e:
             self.connection.rollback()
             raise CashAccountError(f'Cash account error: {e}')
 
     def update(self, balance:float, id:int, operation:str='+'):
         try:
-            cursor = self.connection.cursor()
             if operation == '+':
                 sql = "UPDATE CASH_ACCOUNT SET BALANCE = BALANCE + :balance WHERE id = :id"
             elif operation == '-':
@@ -56,117 +87,172 @@ class CashAccount:
             else:
                 raise ValueError("Invalid operation")
 
-            cursor.execute(sql, {"balance": balance, "id": id})
+            cursor = self.connection.execute(sql, {"balance": balance, "id": id})
+            if cursor.rowcount != 1:
+                self.connection.rollback()
+                raise CashAccountError(f"Cash account {id} does not exist")
+            if operation == '+':
+                Ledger(self.connection).record(DEPOSIT, balance, None, id)
+            else:
+                Ledger(self.connection).record(WITHDRAWAL, balance, id, None)
             self.connection.commit()
-        except cx_Oracle.IntegrityError as e:
-            error, = e.args
+        except CashAccountError:
+            raise
+        except IntegrityError as e:
             self.connection.rollback()
-            if error.code == 1:
+            if e.kind == DUPLICATE:
                 raise CashAccountError("Cash Account database integrity error: Cash Account with duplicate data in database")
-            elif error.code == 2290:
+            elif e.kind == CHECK:
                 raise CashAccountError("Cash Account database integrity error: Invalid values")
-            elif error.code == 1400:
+            elif e.kind == NOT_NULL:
                 raise CashAccountError("Cash Account database integrity error: Cannot insert NULL values")
-            elif error.code == 1438 or error.code == 12899:
+            elif e.kind == TOO_LARGE:
                 raise CashAccountError("Cash Account database integrity error: Too large value")
             else:
-                raise CashAccountError(f'Cash Account database integrity error: {error.message}')
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
+                raise CashAccountError(f'Cash Account database integrity error: {e.message}')
+        except DatabaseError as e:
             self.connection.rollback()
-            raise CashAccountError(f'Cash account database error: {error_obj.message}')
+            raise CashAccountError(f'Cash account database error: {e.message}')
         except Exception as e:
             self.connection.rollback()
             raise CashAccountError(f'Cash account error: {e}')
 
     def delete(self, id:int):
+        try:
+            self.connection.execute("DELETE FROM CASH_ACCOUNT WHERE id = :id",
+                                    {
+                                        'id': id
+                                    })
+            self.connection.commit()
+        except DatabaseError as e:
+            self.connection.rollback()
+            raise CashAccountError(f'Cash account database error: {e.message}')
+        except Exception as e:
+            self.connection.rollback()
+            raise CashAccountError(f'Cash account error: {e}')
+
+    def delete_many(self, ids:list):
+        if not ids:
+            return
         try:
             cursor = self.connection.cursor()
-            cursor.execute("DELETE FROM CASH_ACCOUNT WHERE id = :id",
-                           {
-                               'id': id
-                           })
+            cursor.executemany("DELETE FROM CASH_ACCOUNT WHERE id = :id",
+                               [{'id': id} for id in ids])
             self.connection.commit()
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
+        except DatabaseError as e:
             self.connection.rollback()
-            raise CashAccountError(f'Cash account database error: {error_obj.message}')
+            raise CashAccountError(f'Cash account database error: {e.message}')
         except Exception as e:
             self.connection.rollback()
             raise CashAccountError(f'Cash account error: {e}')
 
     def check_balance(self, id:int, amount:float):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT COUNT(*) FROM cash_account WHERE id = :account_id AND balance >= :amount",
-                           {
-                               'account_id': id,
-                               'amount': amount
-                           })
+            cursor = self.connection.execute("SELECT COUNT(*) FROM cash_account WHERE id = :account_id AND balance >= :amount",
+                                             {
+                                                 'account_id': id,
+                                                 'amount': amount
+                                             })
             boolean = cursor.fetchone()[0]
             return boolean == 1
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
-            raise CashAccountError(f'Cash account database error: {error_obj.message}')
+        except DatabaseError as e:
+            raise CashAccountError(f'Cash account database error: {e.message}')
         except Exception as e:
             raise CashAccountError(f'Cash account error: {e}')
 
-    def transfer_to_system_account(self, amount:float, id_from:int):
+    def transfer_to_system_account(self, amount:float, id_from:int, reference_id:int=None):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("UPDATE CASH_ACCOUNT SET BALANCE = BALANCE - :amount WHERE id = :id",
-                           {
-                               'amount': amount,
-                               'id': id_from
-                           })
-            cursor.execute("UPDATE CASH_ACCOUNT SET BALANCE = BALANCE + :amount WHERE ACCOUNT_TYPE = 'SYSTEM'",
-                           {
-                               'amount': amount
-                           })
+            cursor = self.connection.execute("UPDATE CASH_ACCOUNT SET BALANCE = BALANCE - :amount WHERE id = :id AND BALANCE >= :amount",
+                                             {
+                                                 'amount': amount,
+                                                 'id': id_from
+                                             })
+            if cursor.rowcount != 1:
+                self.connection.rollback()
+                raise CashAccountError("Insufficient funds on customer's account")
+            self.connection.execute("INSERT INTO SYSTEM_CREDIT (AMOUNT) VALUES (:amount)",
+                                    {
+                                        'amount': amount
+                                    })
+            Ledger(self.connection).record_payment(amount, id_from, reference_id)
             self.connection.commit()
             return True
-        except cx_Oracle.IntegrityError as e:
-            error, = e.args
+        except CashAccountError:
+            raise
+        except IntegrityError as e:
             self.connection.rollback()
-            if error.code == 1:
+            if e.kind == DUPLICATE:
                 raise CashAccountError("Cash Account database integrity error: Cash Account with duplicate data in database")
-            elif error.code == 2290:
+            elif e.kind == CHECK:
                 raise CashAccountError("Cash Account database integrity error: Invalid values")
-            elif error.code == 1400:
+            elif e.kind == NOT_NULL:
                 raise CashAccountError("Cash Account database integrity error: Cannot insert NULL values")
-            elif error.code == 1438 or error.code == 12899:
+            elif e.kind == TOO_LARGE:
                 raise CashAccountError("Cash Account database integrity error: Too large value")
             else:
-                raise CashAccountError(f'Cash Account database integrity error: {error.message}')
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
+                raise CashAccountError(f'Cash Account database integrity error: {e.message}')
+        except DatabaseError as e:
             self.connection.rollback()
-            raise CashAccountError(f'Cash account database error: {error_obj.message}')
+            raise CashAccountError(f'Cash account database error: {e.message}')
         except Exception as e:
             self.connection.rollback()
             raise CashAccountError(f'Cash account error: {e}')
 
+    def rollup_system_credits(self):
+        try:
+            cursor = self.connection.execute("UPDATE SYSTEM_CREDIT SET ROLLED_UP = 1 WHERE ROLLED_UP = 0")
+            if cursor.rowcount == 0:
+                self.connection.commit()
+                return 0, 0.0
+            cursor = self.connection.execute("SELECT COUNT(*), NVL(SUM(AMOUNT), 0) FROM SYSTEM_CREDIT WHERE ROLLED_UP = 1")
+            credits, amount = cursor.fetchone()
+            self.connection.execute("UPDATE CASH_ACCOUNT SET BALANCE = BALANCE + :amount WHERE ACCOUNT_TYPE = 'SYSTEM'",
+                                    {
+                                        'amount': amount
+                                    })
+            self.connection.execute("DELETE FROM SYSTEM_CREDIT WHERE ROLLED_UP = 1")
+            self.connection.commit()
+            return credits, amount
+        except DatabaseError as e:
+            self.connection.rollback()
+            raise CashAccountError(f'Cash account database error: {e.message}')
+        except Exception as e:
+            self.connection.rollback()
+            raise CashAccountError(f'Cash account error: {e}')
+
+    def read_system_balance(self):
+        try:
+            cursor = self.connection.execute("SELECT a.BALANCE, (SELECT NVL(SUM(c.AMOUNT), 0) FROM SYSTEM_CREDIT c) "
+                                             "FROM CASH_ACCOUNT a WHERE a.ACCOUNT_TYPE = 'SYSTEM'")
+            return cursor.fetchone()
+        except DatabaseError as e:
+            raise CashAccountError(f'Cash account database error: {e.message}')
+        except Exception as e:
+            raise CashAccountError(f'Cash account error: {e}')
+
     def read(self, id:int):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT * FROM CASH_ACCOUNT WHERE id = :id",
-                           {
-                               'id': id
-                           })
+            cursor = self.connection.execute("SELECT * FROM CASH_ACCOUNT WHERE id = :id",
+                                             {
+                                                 'id': id
+                                             })
             return cursor.fetchone()
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
-            raise CashAccountError(f'Cash account database error: {error_obj.message}')
+        except DatabaseError as e:
+            raise CashAccountError(f'Cash account database error: {e.message}')
         except Exception as e:
             raise CashAccountError(f'Cash account error: {e}')
 
+    def iter_all(self, page_size:int=PAGE_SIZE, after:tuple=None):
+        try:
+            yield from iter_pages(self.connection, "SELECT * FROM CASH_ACCOUNT", [("id", 0)], page_size=page_size, after=after)
+        except DatabaseError as e:
+            raise CashAccountError(f'Cash account database error: {e.message}')
+
     def read_all(self):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT * FROM CASH_ACCOUNT")
+            cursor = self.connection.execute("SELECT * FROM CASH_ACCOUNT")
             return cursor.fetchall()
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
-            raise CashAccountError(f'Cash account database error: {error_obj.message}')
+        except DatabaseError as e:
+            raise CashAccountError(f'Cash account database error: {e.message}')
         except Exception as e:
             raise CashAccountError(f'Cash account error: {e}')
\ No newline at end of file
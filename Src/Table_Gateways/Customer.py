@@ -1,4 +1,5 @@
-import cx_Oracle
+from Src.Backends.Backend import DatabaseError, IntegrityError, DUPLICATE, CHECK, NOT_NULL, TOO_LARGE
+from Src.Table_Gateways.Paging import PAGE_SIZE, iter_pages
 
 class CustomerError(Exception):
     pass
@@ -9,34 +10,31 @@ class Customer:
 
     def create(self, id_acc:int, name:str, email:str, phone:str, customer_type:str):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("INSERT INTO Customer (account_id, name, email, phone, customer_type) "
-                           "VALUES (:account_id, :name, :email, :phone, :customer_type)",
-                           {
-                               "account_id": id_acc,
-                               "name": name,
-                                "email": email,
-                                "phone": phone,
-                                "customer_type": customer_type
-                            })
+            self.connection.execute("INSERT INTO Customer (account_id, name, email, phone, customer_type) "
+                                    "VALUES (:account_id, :name, :email, :phone, :customer_type)",
+                                    {
+                                        "account_id": id_acc,
+                                        "name": name,
+                                         "email": email,
+                                         "phone": phone,
+                                         "customer_type": customer_type
+                                     })
             self.connection.commit()
-        except cx_Oracle.IntegrityError as e:
-            error, = e.args
+        except IntegrityError as e:
             self.connection.rollback()
-            if error.code == 1:
+            if e.kind == DUPLICATE:
                 raise CustomerError("Customer database integrity error: Customer with duplicate data in database")
-            elif error.code == 2290:
+            elif e.kind == CHECK:
                 raise CustomerError("Customer database integrity error: Invalid values")
-            elif error.code == 1400:
+            elif e.kind == NOT_NULL:
                 raise CustomerError("Customer database integrity error: Cannot insert NULL values")
-            elif error.code == 1438 or error.code == 12899:
+            elif e.kind == TOO_LARGE:
                 raise CustomerError("Customer database integrity error: Too large value")
             else:
-                raise CustomerError(f'Customer database integrity error: {error.message}')
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
+                raise CustomerError(f'Customer database integrity error: {e.message}')
+        except DatabaseError as e:
             self.connection.rollback()
-            raise CustomerError(f'Customer database error: {error_obj.message}')
+            raise CustomerError(f'Customer database error: {e.message}')
 
         except Exception as e:
             self.connection.rollback()
@@ -44,30 +42,27 @@ class Customer:
 
     def update(self, attribute:str, value, email:str):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(f"UPDATE CUSTOMER SET {attribute} = :value WHERE email = :email",
-                           {
-                               "value": value,
-                               "email": email
-                           })
+            self.connection.execute(f"UPDATE CUSTOMER SET {attribute} = :value WHERE email = :email",
+                                    {
+                                        "value": value,
+                                        "email": email
+                                    })
             self.connection.commit()
-        except cx_Oracle.IntegrityError as e:
-            error, = e.args
+        except IntegrityError as e:
             self.connection.rollback()
-            if error.code == 1:
+            if e.kind == DUPLICATE:
                 raise CustomerError("Customer database integrity error: Customer with duplicate data in database")
-            elif error.code == 2290:
+            elif e.kind == CHECK:
                 raise CustomerError("Customer database integrity error: Invalid values")
-            elif error.code == 1400:
+            elif e.kind == NOT_NULL:
                 raise CustomerError("Customer database integrity error: Cannot insert NULL values")
-            elif error.code == 1438 or error.code == 12899:
+            elif e.kind == TOO_LARGE:
                 raise CustomerError("Customer database integrity error: Too large value")
             else:
-                raise CustomerError(f'Customer database integrity error: {error.message}')
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
+                raise CustomerError(f'Customer database integrity error: {e.message}')
+        except DatabaseError as e:
             self.connection.rollback()
-            raise CustomerError(f'Customer database error: {error_obj.message}')
+            raise CustomerError(f'Customer database error: {e.message}')
 
         except Exception as e:
             self.connection.rollback()
@@ -75,16 +70,14 @@ class Customer:
 
     def delete(self, email:str):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(f"DELETE FROM CUSTOMER WHERE EMAIL = :email",
-                           {
-                               "email": email
-                            })
+            self.connection.execute(f"DELETE FROM CUSTOMER WHERE EMAIL = :email",
+                                    {
+                                        "email": email
+                                     })
             self.connection.commit()
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
+        except DatabaseError as e:
             self.connection.rollback()
-            raise CustomerError(f'Customer database error: {error_obj.message}')
+            raise CustomerError(f'Customer database error: {e.message}')
 
         except Exception as e:
             self.connection.rollback()
@@ -92,25 +85,39 @@ class Customer:
 
     def read(self, email:str):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT * FROM CUSTOMER WHERE email = :email",
-                           {
-                               'email': email
-                           })
+            cursor = self.connection.execute("SELECT * FROM CUSTOMER WHERE email = :email",
+                                             {
+                                                 'email': email
+                                             })
             return cursor.fetchone()
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
-            raise CustomerError(f'Customer database error: {error_obj.message}')
+        except DatabaseError as e:
+            raise CustomerError(f'Customer database error: {e.message}')
         except Exception as e:
             raise CustomerError(f'Customer error: {e}')
 
+    def read_by_id(self, customer_id:int):
+        try:
+            cursor = self.connection.execute("SELECT * FROM CUSTOMER WHERE id = :id",
+                                             {
+                                                 'id': customer_id
+                                             })
+            return cursor.fetchone()
+        except DatabaseError as e:
+            raise CustomerError(f'Customer database error: {e.message}')
+        except Exception as e:
+            raise CustomerError(f'Customer error: {e}')
+
+    def iter_all(self, page_size:int=PAGE_SIZE, after:tuple=None):
+        try:
+            yield from iter_pages(self.connection, "SELECT * FROM CUSTOMER", [("id", 0)], page_size=page_size, after=after)
+        except DatabaseError as e:
+            raise CustomerError(f'Customer database error: {e.message}')
+
     def read_all(self):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT * FROM CUSTOMER")
+            cursor = self.connection.execute("SELECT * FROM CUSTOMER")
             return cursor.fetchall()
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
-            raise CustomerError(f'Customer database error: {error_obj.message}')
+        except DatabaseError as e:
+            raise CustomerError(f'Customer database error: {e.message}')
         except Exception as e:
             raise CustomerError(f'Customer error: {e}')
\ No newline at end of file
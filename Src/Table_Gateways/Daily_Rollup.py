@@ -0,0 +1,223 @@
+from datetime import datetime, timedelta
+
+from Src.Backends.Backend import DatabaseError
+from Src.Table_Gateways.Reservation_Summary import ReservationSummary, ReservationSummaryException
+from Src.Unit_Of_Work import UnitOfWork, UnitOfWorkError
+
+class DailyRollupError(Exception):
+    pass
+
+FETCH_SIZE = 1000
+
+REPORTS = {
+    "hall": ("SELECT u.hall_id, h.name, SUM(u.bookings), SUM(u.booked_hours), SUM(u.revenue) "
+             "FROM daily_hall_usage u LEFT JOIN hall h ON h.id = u.hall_id "
+             "WHERE u.day >= :date_from AND u.day < :date_to GROUP BY u.hall_id, h.name ORDER BY u.hall_id"),
+    "service": ("SELECT u.service_id, s.name, SUM(u.bookings), SUM(u.booked_hours), SUM(u.revenue) "
+                "FROM daily_service_usage u LEFT JOIN service s ON s.id = u.service_id "
+                "WHERE u.day >= :date_from AND u.day < :date_to GROUP BY u.service_id, s.name ORDER BY u.service_id"),
+    "day": ("SELECT u.day, u.reservations, u.booked_hours, u.revenue FROM daily_reservation_usage u "
+            "WHERE u.day >= :date_from AND u.day < :date_to ORDER BY u.day")
+}
+
+CLAIMED_DAYS = "SELECT day FROM rollup_dirty_day WHERE claimed = 1"
+
+def day_of(moment:datetime):
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+def day_ranges(days:list):
+    ranges = []
+    for day in sorted(days):
+        if ranges and ranges[-1][1] == day:
+            ranges[-1][1] = day + timedelta(days=1)
+        else:
+            ranges.append([day, day + timedelta(days=1)])
+    return ranges
+
+def add(totals:dict, key, values:tuple):
+    current = totals.get(key)
+    totals[key] = values if current is None else tuple(a + b for a, b in zip(current, values))
+
+class DailyRollup:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def refresh(self):
+        try:
+            with UnitOfWork(self.connection) as uow:
+                connection = uow.connection
+                cursor = connection.execute("UPDATE rollup_dirty_day SET claimed = 1 WHERE claimed = 0")
+                if cursor.rowcount == 0:
+                    return 0
+                summary = ReservationSummary(connection)
+                summary.lock()
+
+                cursor = connection.execute("SELECT DISTINCT day FROM rollup_dirty_day WHERE claimed = 1")
+                days = {day_of(row[0]) for row in cursor.fetchall()}
+                cursor = connection.execute("SELECT NVL(SUM(reservations), 0), NVL(SUM(active_reservations), 0), NVL(SUM(priced_reservations), 0), "
+                                            "NVL(SUM(revenue), 0), NVL(SUM(service_hours), 0), NVL(SUM(payments), 0), NVL(SUM(paid_amount), 0) "
+                                            f"FROM daily_reservation_usage WHERE day IN ({CLAIMED_DAYS})")
+                previous = cursor.fetchone()
+
+                rows = self.recompute(connection, day_ranges(days))
+                self.write(connection, rows, f" WHERE day IN ({CLAIMED_DAYS})")
+                summary.apply_rollup(*(round(after - before, 2) for after, before in zip(self.totals(rows[0]), previous)))
+                connection.execute("DELETE FROM rollup_dirty_day WHERE claimed = 1")
+            return len(days)
+        except ReservationSummaryException as e:
+            raise DailyRollupError(f'{e}')
+        except UnitOfWorkError as e:
+            raise DailyRollupError(f'Daily rollup error: {e}')
+        except DatabaseError as e:
+            raise DailyRollupError(f'Daily rollup database error: {e.message}')
+        except Exception as e:
+            raise DailyRollupError(f'Daily rollup error: {e}')
+
+    def rebuild(self):
+        try:
+            with UnitOfWork(self.connection) as uow:
+                connection = uow.connection
+                connection.execute("UPDATE rollup_dirty_day SET claimed = 1 WHERE claimed = 0")
+                summary = ReservationSummary(connection)
+                summary.lock()
+
+                cursor = connection.execute("SELECT start_time FROM reservation ORDER BY start_time FETCH FIRST 1 ROWS ONLY")
+                first = cursor.fetchone()
+                cursor = connection.execute("SELECT start_time FROM reservation ORDER BY start_time DESC FETCH FIRST 1 ROWS ONLY")
+                last = cursor.fetchone()
+                ranges = [[day_of(first[0]), day_of(last[0]) + timedelta(days=1)]] if first is not None else []
+                rows = self.recompute(connection, ranges)
+                self.write(connection, rows, "")
+                summary.replace(*self.totals(rows[0]))
+                connection.execute("DELETE FROM rollup_dirty_day WHERE claimed = 1")
+            return len(rows[0])
+        except ReservationSummaryException as e:
+            raise DailyRollupError(f'{e}')
+        except UnitOfWorkError as e:
+            raise DailyRollupError(f'Daily rollup error: {e}')
+        except DatabaseError as e:
+            raise DailyRollupError(f'Daily rollup database error: {e.message}')
+        except Exception as e:
+            raise DailyRollupError(f'Daily rollup error: {e}')
+
+    def recompute(self, connection, ranges:list):
+        reservations, payments, halls, services = {}, {}, {}, {}
+        for date_from, date_to in ranges:
+            self.aggregate_reservations(connection, reservations, date_from, date_to)
+            self.aggregate_payments(connection, payments, date_from, date_to)
+            self.aggregate_halls(connection, halls, date_from, date_to)
+            self.aggregate_services(connection, services, date_from, date_to)
+        reservation_rows = []
+        for day, (count, active, priced, hours, revenue, service_hours) in reservations.items():
+            paid_count, paid_amount = payments.get(day, (0, 0))
+            reservation_rows.append((day, count, active, priced, round(hours, 2), round(revenue, 2), round(service_hours, 2),
+                                     paid_count, round(paid_amount, 2)))
+        hall_rows = [(day, hall_id, bookings, round(hours, 2), round(revenue, 2))
+                     for (day, hall_id), (bookings, hours, revenue) in halls.items()]
+        service_rows = [(day, service_id, bookings, round(hours, 2), round(revenue, 2))
+                        for (day, service_id), (bookings, hours, revenue) in services.items()]
+        return reservation_rows, hall_rows, service_rows
+
+    def write(self, connection, rows:tuple, where:str):
+        reservation_rows, hall_rows, service_rows = rows
+        for table in ("daily_reservation_usage", "daily_hall_usage", "daily_service_usage"):
+            connection.execute(f"DELETE FROM {table}{where}")
+        cursor = connection.cursor()
+        if reservation_rows:
+            cursor.executemany("INSERT INTO daily_reservation_usage (day, reservations, active_reservations, priced_reservations, "
+                               "booked_hours, revenue, service_hours, payments, paid_amount) VALUES (:1, :2, :3, :4, :5, :6, :7, :8, :9)",
+                               reservation_rows)
+        if hall_rows:
+            cursor.executemany("INSERT INTO daily_hall_usage (day, hall_id, bookings, booked_hours, revenue) VALUES (:1, :2, :3, :4, :5)", hall_rows)
+        if service_rows:
+            cursor.executemany("INSERT INTO daily_service_usage (day, service_id, bookings, booked_hours, revenue) VALUES (:1, :2, :3, :4, :5)", service_rows)
+        cursor.close()
+
+    def totals(self, reservation_rows:list):
+        return [sum(row[column] for row in reservation_rows) for column in (1, 2, 3, 5, 6, 7, 8)]
+
+    def aggregate_reservations(self, connection, totals:dict, date_from:datetime, date_to:datetime):
+        cursor = connection.cursor()
+        cursor.set_fetch_size(FETCH_SIZE)
+        cursor.execute("SELECT r.start_time, r.end_time, r.status, r.total_price, "
+                       "(SELECT NVL(SUM(rs.hours), 0) FROM reservation_service rs WHERE rs.reservation_id = r.id) "
+                       "FROM reservation r WHERE r.start_time >= :date_from AND r.start_time < :date_to",
+                       {
+                           "date_from": date_from,
+                           "date_to": date_to
+                       })
+        for start_time, end_time, status, total_price, service_hours in cursor:
+            add(totals, day_of(start_time), (1, 1 if status != "CANCELLED" else 0, 1 if total_price is not None else 0,
+                                             (end_time - start_time).total_seconds() / 3600, total_price or 0, service_hours))
+        cursor.close()
+
+    def aggregate_payments(self, connection, totals:dict, date_from:datetime, date_to:datetime):
+        cursor = connection.cursor()
+        cursor.set_fetch_size(FETCH_SIZE)
+        cursor.execute("SELECT r.start_time, p.amount FROM payment p JOIN reservation r ON r.id = p.reservation_id "
+                       "WHERE r.start_time >= :date_from AND r.start_time < :date_to",
+                       {
+                           "date_from": date_from,
+                           "date_to": date_to
+                       })
+        for start_time, amount in cursor:
+            add(totals, day_of(start_time), (1, amount))
+        cursor.close()
+
+    def aggregate_halls(self, connection, totals:dict, date_from:datetime, date_to:datetime):
+        cursor = connection.cursor()
+        cursor.set_fetch_size(FETCH_SIZE)
+        cursor.execute("SELECT rh.hall_id, r.start_time, r.end_time, r.total_price, "
+                       "(SELECT COUNT(*) FROM reservation_hall x WHERE x.reservation_id = r.id) "
+                       "FROM reservation r JOIN reservation_hall rh ON rh.reservation_id = r.id "
+                       "WHERE r.start_time >= :date_from AND r.start_time < :date_to",
+                       {
+                           "date_from": date_from,
+                           "date_to": date_to
+                       })
+        for hall_id, start_time, end_time, total_price, hall_count in cursor:
+            add(totals, (day_of(start_time), hall_id), (1, (end_time - start_time).total_seconds() / 3600,
+                                                         (total_price or 0) / max(hall_count, 1)))
+        cursor.close()
+
+    def aggregate_services(self, connection, totals:dict, date_from:datetime, date_to:datetime):
+        cursor = connection.cursor()
+        cursor.set_fetch_size(FETCH_SIZE)
+        cursor.execute("SELECT rs.service_id, r.start_time, rs.hours, NVL(rs.amount, 0) "
+                       "FROM reservation r JOIN reservation_service rs ON rs.reservation_id = r.id "
+                       "WHERE r.start_time >= :date_from AND r.start_time < :date_to",
+                       {
+                           "date_from": date_from,
+                           "date_to": date_to
+                       })
+        for service_id, start_time, hours, amount in cursor:
+            add(totals, (day_of(start_time), service_id), (1, hours, amount))
+        cursor.close()
+
+    def read(self, by:str, date_from:datetime, date_to:datetime):
+        if by not in REPORTS:
+            raise DailyRollupError(f"Unknown rollup grouping: {by}")
+        try:
+            cursor = self.connection.execute(REPORTS[by],
+                                             {
+                                                 "date_from": day_of(date_from),
+                                                 "date_to": date_to
+                                             })
+            return cursor.fetchall()
+        except DatabaseError as e:
+            raise DailyRollupError(f'Daily rollup database error: {e.message}')
+        except Exception as e:
+            raise DailyRollupError(f'Daily rollup error: {e}')
+
+    def pending_days(self, date_from:datetime, date_to:datetime):
+        try:
+            cursor = self.connection.execute("SELECT COUNT(DISTINCT day) FROM rollup_dirty_day WHERE day >= :date_from AND day < :date_to",
+                                             {
+                                                 "date_from": day_of(date_from),
+                                                 "date_to": date_to
+                                             })
+            return cursor.fetchone()[0]
+        except DatabaseError as e:
+            raise DailyRollupError(f'Daily rollup database error: {e.message}')
+        except Exception as e:
+            raise DailyRollupError(f'Daily rollup error: {e}')
@@ -1,6 +1,7 @@
 from datetime import datetime
 
-import cx_Oracle
+from Src.Backends.Backend import DatabaseError, IntegrityError, DUPLICATE, CHECK, NOT_NULL, TOO_LARGE
+from Src.Table_Gateways.Reference_Cache import ReferenceCache
 
 class HallError(Exception):
     pass
@@ -11,33 +12,31 @@ class Hall:
 
     def create(self, name:str, sport_type:str, hourly_rate:float, capacity:int):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("INSERT INTO Hall (name, sport_type, hourly_rate, capacity) "
-                           "VALUES (:name, :sport_type, :hourly_rate, :capacity)",
-                           {
-                               "name": name,
-                               "sport_type": sport_type,
-                               "hourly_rate": hourly_rate,
-                               "capacity": capacity
-                            })
+            self.connection.execute("INSERT INTO Hall (name, sport_type, hourly_rate, capacity) "
+                                    "VALUES (:name, :sport_type, :hourly_rate, :capacity)",
+                                    {
+                                        "name": name,
+                                        "sport_type": sport_type,
+                                        "hourly_rate": hourly_rate,
+                                        "capacity": capacity
+                                     })
             self.connection.commit()
-        except cx_Oracle.IntegrityError as e:
-            error, = e.args
+            self.connection.after_commit(ReferenceCache().invalidate, "hall")
+        except IntegrityError as e:
             self.connection.rollback()
-            if error.code == 1:
+            if e.kind == DUPLICATE:
                 raise HallError("Hall database integrity error: Hall with duplicate data in database")
-            elif error.code == 2290:
+            elif e.kind == CHECK:
                 raise HallError("Hall database integrity error: Invalid values")
-            elif error.code == 1400:
+            elif e.kind == NOT_NULL:
                 raise HallError("Hall database integrity error: Cannot insert NULL values")
-            elif error.code == 1438 or error.code == 12899:
+            elif e.kind == TOO_LARGE:
                 raise HallError("Hall database integrity error: Too large value")
             else:
-                raise HallError(f'Hall database integrity error: {error.message}')
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
+                raise HallError(f'Hall database integrity error: {e.message}')
+        except DatabaseError as e:
             self.connection.rollback()
-            raise HallError(f'Hall database error: {error_obj.message}')
+            raise HallError(f'Hall database error: {e.message}')
 
         except Exception as e:
             self.connection.rollback()
@@ -45,90 +44,119 @@ class Hall:
 
     def update(self, attribute:str, value, name):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(f"UPDATE Hall SET {attribute} = :value WHERE name = :name",
-                           {
-                               "value": value,
-                               "name": name
-                           })
+            self.connection.execute(f"UPDATE Hall SET {attribute} = :value WHERE name = :name",
+                                    {
+                                        "value": value,
+                                        "name": name
+                                    })
             self.connection.commit()
-        except cx_Oracle.IntegrityError as e:
-            error, = e.args
+            self.connection.after_commit(ReferenceCache().invalidate, "hall")
+        except IntegrityError as e:
             self.connection.rollback()
-            if error.code == 1:
+            if e.kind == DUPLICATE:
                 raise HallError("Hall database integrity error: Hall with duplicate data in database")
-            elif error.code == 2290:
+            elif e.kind == CHECK:
                 raise HallError("Hall database integrity error: Invalid values")
-            elif error.code == 1400:
+            elif e.kind == NOT_NULL:
                 raise HallError("Hall database integrity error: Cannot insert NULL values")
-            elif error.code == 1438 or error.code == 12899:
+            elif e.kind == TOO_LARGE:
                 raise HallError("Hall database integrity error: Too large value")
             else:
-                raise HallError(f'Hall database integrity error: {error.message}')
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
+                raise HallError(f'Hall database integrity error: {e.message}')
+        except DatabaseError as e:
             self.connection.rollback()
-            raise HallError(f'Hall database error: {error_obj.message}')
+            raise HallError(f'Hall database error: {e.message}')
         except Exception as e:
             self.connection.rollback()
             raise HallError(f'Hall error: {e}')
 
     def delete(self, name:str):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(f"DELETE FROM Hall WHERE name = :name",
-                           {
-                               "name": name
-                           })
+            self.connection.execute(f"DELETE FROM Hall WHERE name = :name",
+                                    {
+                                        "name": name
+                                    })
             self.connection.commit()
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
+            self.connection.after_commit(ReferenceCache().invalidate, "hall")
+        except DatabaseError as e:
             self.connection.rollback()
-            raise HallError(f'Hall database error: {error_obj.message}')
+            raise HallError(f'Hall database error: {e.message}')
         except Exception as e:
             self.connection.rollback()
             raise HallError(f'Hall error: {e}')
 
     def read(self, name:str):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT * FROM Hall WHERE name = :name",
-                           {
-                               'name': name
-                           })
+            cursor = self.connection.execute("SELECT * FROM Hall WHERE name = :name",
+                                             {
+                                                 'name': name
+                                             })
             return cursor.fetchone()
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
-            raise HallError(f'Hall database error: {error_obj.message}')
+        except DatabaseError as e:
+            raise HallError(f'Hall database error: {e.message}')
+        except Exception as e:
+            raise HallError(f'Hall error: {e}')
+
+    def lock(self, hall_ids:list):
+        if not hall_ids:
+            return []
+        try:
+            hall_binds = {f"hall_{i}": hall_id for i, hall_id in enumerate(sorted(hall_ids))}
+            cursor = self.connection.execute(f"SELECT id FROM Hall WHERE id IN ({', '.join(':' + name for name in hall_binds)}) "
+                                             "ORDER BY id FOR UPDATE",
+                                             hall_binds)
+            return [row[0] for row in cursor.fetchall()]
+        except DatabaseError as e:
+            self.connection.rollback()
+            raise HallError(f'Hall database error: {e.message}')
+        except Exception as e:
+            self.connection.rollback()
+            raise HallError(f'Hall error: {e}')
+
+    def read_busy(self, hall_ids:list, time_from:datetime, time_to:datetime):
+        if not hall_ids:
+            return []
+        try:
+            hall_binds = {f"hall_{i}": hall_id for i, hall_id in enumerate(hall_ids)}
+            cursor = self.connection.execute(f"SELECT h.id, h.name FROM hall h WHERE h.id IN ({', '.join(':' + name for name in hall_binds)}) "
+                                             "AND EXISTS (SELECT 1 FROM reservation r JOIN reservation_hall rh ON rh.reservation_id = r.id "
+                                             "WHERE rh.hall_id = h.id AND r.status <> 'CANCELLED' AND :start_time < r.end_time AND :end_time > r.start_time)",
+                                             {
+                                                 **hall_binds,
+                                                 "start_time": time_from,
+                                                 "end_time": time_to
+                                             })
+            return cursor.fetchall()
+        except DatabaseError as e:
+            raise HallError(f'Hall database error: {e.message}')
         except Exception as e:
             raise HallError(f'Hall error: {e}')
 
     def read_available_in_date(self, time_from:datetime, tim_to:datetime):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT h.id, h.name FROM hall h WHERE NOT EXISTS("
-                           "SELECT 1 FROM reservation r JOIN reservation_hall rh ON rh.reservation_id = r.id "
-                           "WHERE rh.hall_id = h.id AND r.status <> 'CANCELLED' AND :start_time < r.end_time AND :end_time > r.start_time)",
-            {
-                ":start_time": time_from,
-                ":end_time": tim_to
-            })
+            cursor = self.connection.execute("SELECT h.id, h.name FROM hall h WHERE NOT EXISTS("
+                                             "SELECT 1 FROM reservation r JOIN reservation_hall rh ON rh.reservation_id = r.id "
+                                             "WHERE rh.hall_id = h.id AND r.status <> 'CANCELLED' AND :start_time < r.end_time AND :end_time > r.start_time)",
+                                             {
+                                                 "start_time": time_from,
+                                                 "end_time": tim_to
+                                             })
             rows = cursor.fetchall()
             result = {r[0]: r[1] for r in rows}
             return result
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
-            raise HallError(f'Hall database error: {error_obj.message}')
+        except DatabaseError as e:
+            raise HallError(f'Hall database error: {e.message}')
         except Exception as e:
             raise HallError(f'Hall error: {e}')
 
     def read_all(self):
+        return ReferenceCache().get("hall", "all", self._read_all)
+
+    def _read_all(self):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT * FROM Hall")
+            cursor = self.connection.execute("SELECT * FROM Hall")
             return cursor.fetchall()
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
-            raise HallError(f'Hall database error: {error_obj.message}')
+        except DatabaseError as e:
+            raise HallError(f'Hall database error: {e.message}')
         except Exception as e:
             raise HallError(f'Hall error: {e}')
\ No newline at end of file
@@ -0,0 +1,240 @@
+from datetime import datetime, timedelta
+
+from Src.Backends.Backend import DatabaseError, IntegrityError, DUPLICATE, CHECK, NOT_NULL, TOO_LARGE, FOREIGN_KEY
+
+class LedgerError(Exception):
+    pass
+
+OPENING = "OPENING"
+DEPOSIT = "DEPOSIT"
+WITHDRAWAL = "WITHDRAWAL"
+PAYMENT = "PAYMENT"
+
+EPOCH = datetime(1970, 1, 1)
+END_OF_TIME = datetime(9999, 12, 31)
+IN_LIST_SIZE = 500
+
+LAST_SNAPSHOT = ("(SELECT MAX(m.taken_through) FROM balance_snapshot m "
+                 "WHERE m.account_id = a.id AND m.taken_through <= :as_of)")
+
+BALANCE_AS_OF = (f"NVL((SELECT s.balance FROM balance_snapshot s WHERE s.account_id = a.id AND s.taken_through = {LAST_SNAPSHOT}), 0) + "
+                 "(SELECT NVL(SUM(e.amount), 0) FROM ledger_entry e WHERE e.account_id = a.id "
+                 f"AND e.created_at > NVL({LAST_SNAPSHOT}, :epoch) AND e.created_at <= :as_of)")
+
+def chunks(values:list, size:int=IN_LIST_SIZE):
+    for offset in range(0, len(values), size):
+        yield values[offset:offset + size]
+
+def in_list(values:list):
+    return ", ".join(f":a{i}" for i in range(len(values))), {f"a{i}": value for i, value in enumerate(values)}
+
+class Ledger:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def record(self, kind:str, amount:float, debit_account_id:int, credit_account_id:int, reference_id:int=None):
+        if amount <= 0:
+            raise LedgerError(f"Invalid transfer amount: {amount}")
+
+        try:
+            transfer_id = self.connection.insert_returning_id("INSERT INTO ledger_transfer (kind, amount, reference_id) "
+                                                              "VALUES (:kind, :amount, :reference_id)",
+                                                              {
+                                                                  "kind": kind,
+                                                                  "amount": amount,
+                                                                  "reference_id": reference_id
+                                                              })
+            self.connection.execute("INSERT INTO ledger_entry (transfer_id, account_id, amount) "
+                                    "SELECT :transfer_id, :debit_account_id, -:amount FROM dual UNION ALL "
+                                    "SELECT :transfer_id, :credit_account_id, :amount FROM dual",
+                                    {
+                                        "transfer_id": transfer_id,
+                                        "debit_account_id": debit_account_id,
+                                        "credit_account_id": credit_account_id,
+                                        "amount": amount
+                                    })
+            self.connection.commit()
+            return transfer_id
+        except IntegrityError as e:
+            self.connection.rollback()
+            raise LedgerError(self.integrity_message(e))
+        except DatabaseError as e:
+            self.connection.rollback()
+            raise LedgerError(f'Ledger database error: {e.message}')
+        except Exception as e:
+            self.connection.rollback()
+            raise LedgerError(f'Ledger error: {e}')
+
+    def record_payment(self, amount:float, account_id:int, reference_id:int=None):
+        if amount <= 0:
+            raise LedgerError(f"Invalid transfer amount: {amount}")
+
+        try:
+            transfer_id = self.connection.insert_returning_id("INSERT INTO ledger_transfer (kind, amount, reference_id) "
+                                                              "VALUES (:kind, :amount, :reference_id)",
+                                                              {
+                                                                  "kind": PAYMENT,
+                                                                  "amount": amount,
+                                                                  "reference_id": reference_id
+                                                              })
+            self.connection.execute("INSERT INTO ledger_entry (transfer_id, account_id, amount) "
+                                    "SELECT :transfer_id, :account_id, -:amount FROM dual UNION ALL "
+                                    "SELECT :transfer_id, id, :amount FROM cash_account WHERE account_type = 'SYSTEM'",
+                                    {
+                                        "transfer_id": transfer_id,
+                                        "account_id": account_id,
+                                        "amount": amount
+                                    })
+            self.connection.commit()
+            return transfer_id
+        except IntegrityError as e:
+            self.connection.rollback()
+            raise LedgerError(self.integrity_message(e))
+        except DatabaseError as e:
+            self.connection.rollback()
+            raise LedgerError(f'Ledger database error: {e.message}')
+        except Exception as e:
+            self.connection.rollback()
+            raise LedgerError(f'Ledger error: {e}')
+
+    def record_many(self, kind:str, transfers:list):
+        transfers = [transfer for transfer in transfers if transfer[0] > 0]
+        if not transfers:
+            return []
+
+        try:
+            cursor = self.connection.cursor()
+            transfer_ids = cursor.insert_many_returning_ids("INSERT INTO ledger_transfer (kind, amount, reference_id) VALUES (:1, :2, :3)",
+                                                            [(kind, amount, reference_id) for amount, _, _, reference_id in transfers])
+            legs = []
+            for transfer_id, (amount, debit_account_id, credit_account_id, _) in zip(transfer_ids, transfers):
+                legs.append((transfer_id, debit_account_id, -amount))
+                legs.append((transfer_id, credit_account_id, amount))
+            cursor.executemany("INSERT INTO ledger_entry (transfer_id, account_id, amount) VALUES (:1, :2, :3)", legs)
+            self.connection.commit()
+            return transfer_ids
+        except IntegrityError as e:
+            self.connection.rollback()
+            raise LedgerError(self.integrity_message(e))
+        except DatabaseError as e:
+            self.connection.rollback()
+            raise LedgerError(f'Ledger database error: {e.message}')
+        except Exception as e:
+            self.connection.rollback()
+            raise LedgerError(f'Ledger error: {e}')
+
+    def integrity_message(self, e:IntegrityError):
+        if e.kind == DUPLICATE:
+            return "Ledger database integrity error: Transfer with duplicate data in database"
+        elif e.kind == CHECK:
+            return "Ledger database integrity error: Invalid values"
+        elif e.kind == NOT_NULL:
+            return "Ledger database integrity error: Cannot insert NULL values"
+        elif e.kind == TOO_LARGE:
+            return "Ledger database integrity error: Too large value"
+        elif e.kind == FOREIGN_KEY:
+            return "Ledger database integrity error: Transfer does not exist"
+        return f'Ledger database integrity error: {e.message}'
+
+    def balances(self, account_ids:list, as_of:datetime=None):
+        as_of = as_of or END_OF_TIME
+        balances = {}
+        try:
+            for chunk in chunks(list(account_ids)):
+                placeholders, params = in_list(chunk)
+                cursor = self.connection.cursor()
+                cursor.execute(f"SELECT a.id, {BALANCE_AS_OF} FROM cash_account a WHERE a.id IN ({placeholders})",
+                               dict(params, as_of=as_of, epoch=EPOCH))
+                for account_id, balance in cursor:
+                    balances[account_id] = round(balance, 2)
+                cursor.close()
+            return balances
+        except DatabaseError as e:
+            raise LedgerError(f'Ledger database error: {e.message}')
+        except Exception as e:
+            raise LedgerError(f'Ledger error: {e}')
+
+    def balance(self, account_id:int, as_of:datetime=None):
+        balances = self.balances([account_id], as_of)
+        if account_id not in balances:
+            raise LedgerError(f"Cash account {account_id} does not exist")
+        return balances[account_id]
+
+    def statements(self, account_ids:list, date_from:datetime, date_to:datetime=None):
+        date_to = date_to or datetime.now()
+        if date_from >= date_to:
+            raise LedgerError("Statement start must be before its end")
+
+        openings = self.balances(account_ids, date_from)
+        statements = {account_id: {"account_id": account_id, "opening": balance, "entries": [], "closing": balance}
+                      for account_id, balance in openings.items()}
+        try:
+            for chunk in chunks(list(statements)):
+                placeholders, params = in_list(chunk)
+                cursor = self.connection.cursor()
+                cursor.execute("SELECT e.account_id, e.created_at, t.kind, e.amount, t.reference_id, e.transfer_id "
+                               "FROM ledger_entry e JOIN ledger_transfer t ON t.id = e.transfer_id "
+                               f"WHERE e.account_id IN ({placeholders}) AND e.created_at > :date_from AND e.created_at <= :date_to "
+                               "ORDER BY e.account_id, e.created_at, e.id",
+                               dict(params, date_from=date_from, date_to=date_to))
+                for account_id, created_at, kind, amount, reference_id, transfer_id in cursor:
+                    statement = statements[account_id]
+                    statement["closing"] = round(statement["closing"] + amount, 2)
+                    statement["entries"].append({
+                        "at": created_at,
+                        "kind": kind,
+                        "amount": amount,
+                        "balance": statement["closing"],
+                        "reference_id": reference_id,
+                        "transfer_id": transfer_id
+                    })
+                cursor.close()
+            return [statements[account_id] for account_id in account_ids if account_id in statements]
+        except DatabaseError as e:
+            raise LedgerError(f'Ledger database error: {e.message}')
+        except Exception as e:
+            raise LedgerError(f'Ledger error: {e}')
+
+    def take_snapshot(self, settle_seconds:int=300):
+        cutoff = (datetime.now() - timedelta(seconds=settle_seconds)).replace(microsecond=0)
+        try:
+            cursor = self.connection.execute("INSERT INTO balance_snapshot (account_id, taken_through, balance) "
+                                             f"SELECT a.id, :cutoff, {BALANCE_AS_OF} FROM cash_account a "
+                                             "WHERE EXISTS (SELECT 1 FROM ledger_entry e WHERE e.account_id = a.id AND e.created_at <= :cutoff "
+                                             "AND e.created_at > NVL((SELECT MAX(m.taken_through) FROM balance_snapshot m WHERE m.account_id = a.id), :epoch))",
+                                             {
+                                                 "cutoff": cutoff,
+                                                 "as_of": cutoff,
+                                                 "epoch": EPOCH
+                                             })
+            snapshots = cursor.rowcount
+            self.connection.commit()
+            return snapshots, cutoff
+        except IntegrityError as e:
+            self.connection.rollback()
+            if e.kind == DUPLICATE:
+                raise LedgerError(f"Ledger snapshot through {cutoff} already exists")
+            raise LedgerError(self.integrity_message(e))
+        except DatabaseError as e:
+            self.connection.rollback()
+            raise LedgerError(f'Ledger database error: {e.message}')
+        except Exception as e:
+            self.connection.rollback()
+            raise LedgerError(f'Ledger error: {e}')
+
+    def mismatches(self):
+        try:
+            cursor = self.connection.execute("SELECT a.id, a.balance + CASE WHEN a.account_type = 'SYSTEM' "
+                                             "THEN (SELECT NVL(SUM(c.amount), 0) FROM system_credit c) ELSE 0 END, "
+                                             f"{BALANCE_AS_OF} FROM cash_account a",
+                                             {
+                                                 "as_of": END_OF_TIME,
+                                                 "epoch": EPOCH
+                                             })
+            return [(account_id, round(balance, 2), round(ledger_balance, 2))
+                    for account_id, balance, ledger_balance in cursor.fetchall()
+                    if abs(balance - ledger_balance) >= 0.005]
+        except DatabaseError as e:
+            raise LedgerError(f'Ledger database error: {e.message}')
+        except Exception as e:
+            raise LedgerError(f'Ledger error: {e}')
@@ -0,0 +1,37 @@
+PAGE_SIZE = 500
+
+def iter_pages(connection, select:str, keys:list, params:dict=None, where:str="", page_size:int=PAGE_SIZE, after:tuple=None):
+    last = after
+    while True:
+        conditions = [where] if where else []
+        binds = dict(params or {})
+        if last is not None:
+            conditions.append(seek_condition(keys, last, binds))
+        binds["page_size"] = page_size
+
+        sql = select
+        if conditions:
+            sql += " WHERE " + " AND ".join(f"({c})" for c in conditions)
+        sql += " ORDER BY " + ", ".join(column for column, _ in keys) + " FETCH FIRST :page_size ROWS ONLY"
+
+        cursor = connection.cursor()
+        cursor.set_fetch_size(page_size)
+        cursor.execute(sql, binds)
+        rows = cursor.fetchall()
+        cursor.close()
+
+        if not rows:
+            return
+        yield rows
+        if len(rows) < page_size:
+            return
+        last = tuple(rows[-1][position] for _, position in keys)
+
+def seek_condition(keys:list, last:tuple, binds:dict):
+    alternatives = []
+    for i, (column, _) in enumerate(keys):
+        equal = [f"{keys[j][0]} = :seek_{j}" for j in range(i)]
+        alternatives.append(" AND ".join(equal + [f"{column} > :seek_{i}"]))
+    for i, value in enumerate(last):
+        binds[f"seek_{i}"] = value
+    return " OR ".join(f"({a})" for a in alternatives)
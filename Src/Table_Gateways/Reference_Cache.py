@@ -0,0 +1,63 @@
+import threading
+import time
+
+class ReferenceCache:
+    _lock = threading.Lock()
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super(ReferenceCache, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self, ttl:float=300.0):
+        if getattr(self, "_initialized", False):
+            return
+
+        self.ttl = ttl
+        self._cache_lock = threading.Lock()
+        self._entries = {}
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._initialized = True
+
+    def get(self, namespace:str, key:str, loader):
+        now = time.monotonic()
+        with self._cache_lock:
+            entry = self._entries.get((namespace, key))
+            if entry is not None and entry[1] > now:
+                self._hits += 1
+                return list(entry[0])
+            self._misses += 1
+            generation = self._generation
+
+        value = loader()
+        with self._cache_lock:
+            if generation == self._generation:
+                self._entries[(namespace, key)] = (value, now + self.ttl)
+        return list(value)
+
+    def invalidate(self, namespace:str=None):
+        with self._cache_lock:
+            self._invalidations += 1
+            self._generation += 1
+            if namespace is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == namespace]:
+                del self._entries[key]
+
+    def stats(self):
+        with self._cache_lock:
+            lookups = self._hits + self._misses
+            return {
+                "ttl": self.ttl,
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 3) if lookups else 0.0,
+                "invalidations": self._invalidations
+            }
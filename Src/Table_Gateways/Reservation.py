@@ -1,5 +1,7 @@
 from datetime import datetime
-import cx_Oracle
+
+from Src.Backends.Backend import DatabaseError, IntegrityError, DUPLICATE, CHECK, NOT_NULL, TOO_LARGE
+from Src.Table_Gateways.Paging import PAGE_SIZE, iter_pages
 
 class ReservationException(Exception):
     pass
@@ -16,112 +18,223 @@ class Reservation:
         if total_price <= 0:
             raise ReservationException(f"Invalid total price: {total_price}")
 
+        try:
+            reservation_id = self.connection.insert_returning_id("INSERT INTO Reservation (customer_id, start_time, end_time, total_price, status) "
+                                                                 "VALUES (:customer_id, :start_time, :end_time, :total_price, :status)",
+                                                                 {
+                                                                     "customer_id": customer_id,
+                                                                     "start_time": start_time,
+                                                                     "end_time": end_time,
+                                                                     "total_price": total_price,
+                                                                     "status": status
+                                                                 })
+            self.connection.commit()
+            return reservation_id
+        except IntegrityError as e:
+            self.connection.rollback()
+            if e.kind == DUPLICATE:
+                raise ReservationException("Reservation database integrity error: Reservation with duplicate data in database")
+            elif e.kind == CHECK:
+                raise ReservationException("Reservation database integrity error: Invalid values")
+            elif e.kind == NOT_NULL:
+                raise ReservationException("Reservation database integrity error: Cannot insert NULL values")
+            elif e.kind == TOO_LARGE:
+                raise ReservationException("Reservation database integrity error: Too large value")
+            else:
+                raise ReservationException(f'Reservation database integrity error: {e.message}')
+        except DatabaseError as e:
+            self.connection.rollback()
+            raise ReservationException(f'Reservation database error: {e.message}')
+        except Exception as e:
+            self.connection.rollback()
+            raise ReservationException(f'Reservation error: {e}')
+
+    def create_many(self, customer_id:int, intervals:list, total_price:float=0, status:str="CREATED"):
+        now = datetime.now()
+        for start_time, end_time in intervals:
+            if start_time < now:
+                raise ReservationException("Reservation start time must be in the future")
+            if start_time >= end_time:
+                raise ReservationException("Start time must be before end time")
+        if total_price <= 0:
+            raise ReservationException(f"Invalid total price: {total_price}")
+        if not intervals:
+            return []
+
         try:
             cursor = self.connection.cursor()
-            new_id = cursor.var(cx_Oracle.NUMBER)
-            cursor.execute("INSERT INTO Reservation (customer_id, start_time, end_time, total_price, status) "
-                           "VALUES (:customer_id, :start_time, :end_time, :total_price, :status) "
-                           "RETURNING id INTO :new_id",
+            reservation_ids = cursor.insert_many_returning_ids("INSERT INTO Reservation (customer_id, start_time, end_time, total_price, status) "
+                                                               "VALUES (:1, :2, :3, :4, :5)",
+                                                               [(customer_id, start_time, end_time, total_price, status) for start_time, end_time in intervals])
+            self.connection.commit()
+            return reservation_ids
+        except IntegrityError as e:
+            self.connection.rollback()
+            if e.kind == DUPLICATE:
+                raise ReservationException("Reservation database integrity error: Reservation with duplicate data in database")
+            elif e.kind == CHECK:
+                raise ReservationException("Reservation database integrity error: Invalid values")
+            elif e.kind == NOT_NULL:
+                raise ReservationException("Reservation database integrity error: Cannot insert NULL values")
+            elif e.kind == TOO_LARGE:
+                raise ReservationException("Reservation database integrity error: Too large value")
+            else:
+                raise ReservationException(f'Reservation database integrity error: {e.message}')
+        except DatabaseError as e:
+            self.connection.rollback()
+            raise ReservationException(f'Reservation database error: {e.message}')
+        except Exception as e:
+            self.connection.rollback()
+            raise ReservationException(f'Reservation error: {e}')
+
+    def book(self, customer_id:int, start_time:datetime, end_time:datetime, hall_ids:list, optional_services:dict, rate_factor:float=1.0, team_discount:float=0.0):
+        if start_time < datetime.now():
+            raise ReservationException("Reservation start time must be in the future")
+        if start_time >= end_time:
+            raise ReservationException("Start time must be before end time")
+        if not hall_ids:
+            raise ReservationException("At least one hall must be selected")
+
+        try:
+            cursor = self.connection.cursor()
+            reservation_id = cursor.var(int)
+            total_price = cursor.var(float)
+            conflict = cursor.var(str)
+            commit = "" if self.connection.transactional else " COMMIT;"
+            cursor.execute("BEGIN reservation_api.book(:customer_id, :start_time, :end_time, :hall_ids, :service_ids, :service_amounts, "
+                           f":rate_factor, :team_discount, :reservation_id, :total_price, :conflict);{commit} END;",
                            {
                                "customer_id": customer_id,
                                "start_time": start_time,
                                "end_time": end_time,
+                               "hall_ids": cursor.array(int, sorted(hall_ids)),
+                               "service_ids": cursor.array(int, list(optional_services.keys())),
+                               "service_amounts": cursor.array(float, list(optional_services.values())),
+                               "rate_factor": rate_factor,
+                               "team_discount": team_discount,
+                               "reservation_id": reservation_id,
                                "total_price": total_price,
-                               "status": status,
-                               "new_id": new_id
-                           }
-            )
-            self.connection.commit()
-            reservation_id = int(new_id.getvalue()[0])
-            return reservation_id
-        except cx_Oracle.IntegrityError as e:
-            error, = e.args
+                               "conflict": conflict
+                           })
+            if conflict.getvalue():
+                return None, conflict.getvalue()
+            return int(reservation_id.getvalue()), None
+        except IntegrityError as e:
             self.connection.rollback()
-            if error.code == 1:
+            if e.kind == DUPLICATE:
                 raise ReservationException("Reservation database integrity error: Reservation with duplicate data in database")
-            elif error.code == 2290:
+            elif e.kind == CHECK:
                 raise ReservationException("Reservation database integrity error: Invalid values")
-            elif error.code == 1400:
+            elif e.kind == NOT_NULL:
                 raise ReservationException("Reservation database integrity error: Cannot insert NULL values")
-            elif error.code == 1438 or error.code == 12899:
+            elif e.kind == TOO_LARGE:
                 raise ReservationException("Reservation database integrity error: Too large value")
             else:
-                raise ReservationException(f'Reservation database integrity error: {error.message}')
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
+                raise ReservationException(f'Reservation database integrity error: {e.message}')
+        except DatabaseError as e:
+            self.connection.rollback()
+            raise ReservationException(f'Reservation database error: {e.message}')
+        except Exception as e:
+            self.connection.rollback()
+            raise ReservationException(f'Reservation error: {e}')
+
+    def confirm(self, reservation_id:int):
+        try:
+            cursor = self.connection.execute("UPDATE Reservation SET status = 'CONFIRMED' WHERE id = :id AND status = 'CREATED'",
+                                             {
+                                                 "id": reservation_id
+                                             })
+            if cursor.rowcount != 1:
+                self.connection.rollback()
+                raise ReservationException(f"Reservation {reservation_id} does not exist or is already paid")
+            self.connection.commit()
+        except ReservationException:
+            raise
+        except DatabaseError as e:
+            self.connection.rollback()
+            raise ReservationException(f'Reservation database error: {e.message}')
+        except Exception as e:
             self.connection.rollback()
-            raise ReservationException(f'Reservation database error: {error_obj.message}')
+            raise ReservationException(f'Reservation error: {e}')
+
+    def lock(self, reservation_id:int):
+        try:
+            cursor = self.connection.execute("SELECT id FROM Reservation WHERE id = :id FOR UPDATE",
+                                             {
+                                                 "id": reservation_id
+                                             })
+            return cursor.fetchone() is not None
+        except DatabaseError as e:
+            self.connection.rollback()
+            raise ReservationException(f'Reservation database error: {e.message}')
         except Exception as e:
             self.connection.rollback()
             raise ReservationException(f'Reservation error: {e}')
 
     def update(self, attribute:str, value, reservation_id:int):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(f"UPDATE Reservation SET {attribute} = :value WHERE id = :id",
-                           {
-                               "value": value,
-                               "id": reservation_id
-                           })
+            self.connection.execute(f"UPDATE Reservation SET {attribute} = :value WHERE id = :id",
+                                    {
+                                        "value": value,
+                                        "id": reservation_id
+                                    })
             self.connection.commit()
-        except cx_Oracle.IntegrityError as e:
-            error, = e.args
+        except IntegrityError as e:
             self.connection.rollback()
-            if error.code == 1:
+            if e.kind == DUPLICATE:
                 raise ReservationException("Reservation database integrity error: Reservation with duplicate data in database")
-            elif error.code == 2290:
+            elif e.kind == CHECK:
                 raise ReservationException("Reservation database integrity error: Invalid values")
-            elif error.code == 1400:
+            elif e.kind == NOT_NULL:
                 raise ReservationException("Reservation database integrity error: Cannot insert NULL values")
-            elif error.code == 1438 or error.code == 12899:
+            elif e.kind == TOO_LARGE:
                 raise ReservationException("Reservation database integrity error: Too large value")
             else:
-                raise ReservationException(f'Reservation database integrity error: {error.message}')
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
+                raise ReservationException(f'Reservation database integrity error: {e.message}')
+        except DatabaseError as e:
             self.connection.rollback()
-            raise ReservationException(f'Reservation database error: {error_obj.message}')
+            raise ReservationException(f'Reservation database error: {e.message}')
         except Exception as e:
             self.connection.rollback()
             raise ReservationException(f'Reservation error: {e}')
 
     def delete(self, reservation_id:int):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(f"DELETE FROM Reservation WHERE id = :id",
-                           {
-                               "id": reservation_id
-                           })
+            self.connection.execute(f"DELETE FROM Reservation WHERE id = :id",
+                                    {
+                                        "id": reservation_id
+                                    })
             self.connection.commit()
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
+        except DatabaseError as e:
             self.connection.rollback()
-            raise ReservationException(f'Reservation database error: {error_obj.message}')
+            raise ReservationException(f'Reservation database error: {e.message}')
         except Exception as e:
             self.connection.rollback()
             raise ReservationException(f'Reservation error: {e}')
 
     def read(self, reservation_id:int):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT * FROM Reservation WHERE id = :reservation_id",
-                           {
-                               'id': reservation_id
-                           })
+            cursor = self.connection.execute("SELECT * FROM Reservation WHERE id = :reservation_id",
+                                             {
+                                                 'reservation_id': reservation_id
+                                             })
             return cursor.fetchone()
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
-            raise ReservationException(f'Reservation database error: {error_obj.message}')
+        except DatabaseError as e:
+            raise ReservationException(f'Reservation database error: {e.message}')
         except Exception as e:
             raise ReservationException(f'Reservation error: {e}')
 
+    def iter_all(self, page_size:int=PAGE_SIZE, after:tuple=None):
+        try:
+            yield from iter_pages(self.connection, "SELECT * FROM Reservation", [("id", 0)], page_size=page_size, after=after)
+        except DatabaseError as e:
+            raise ReservationException(f'Reservation database error: {e.message}')
+
     def read_all(self):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT * FROM Reservation")
+            cursor = self.connection.execute("SELECT * FROM Reservation")
             return cursor.fetchall()
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
-            raise ReservationException(f'Reservation database error: {error_obj.message}')
+        except DatabaseError as e:
+            raise ReservationException(f'Reservation database error: {e.message}')
         except Exception as e:
             raise ReservationException(f'Reservation error: {e}')
\ No newline at end of file
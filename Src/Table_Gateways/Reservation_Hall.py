@@ -1,4 +1,7 @@
-import cx_Oracle
+from datetime import datetime
+
+from Src.Backends.Backend import DatabaseError
+from Src.Table_Gateways.Paging import PAGE_SIZE, iter_pages
 
 class ReservationHallException(Exception):
     pass
@@ -8,77 +11,110 @@ class ReservationHall:
         self.connection = connection
 
     def create(self, reservation_id:int, hall_id:int):
+        try:
+            self.connection.execute("INSERT INTO Reservation_Hall (reservation_id, hall_id) "
+                                    "VALUES (:reservation_id, :hall_id)",
+                                    {
+                                        "reservation_id": reservation_id,
+                                        "hall_id": hall_id
+                                     })
+            self.connection.commit()
+        except DatabaseError as e:
+            self.connection.rollback()
+            raise ReservationHallException(f'Reservation hall database error: {e.message}')
+        except Exception as e:
+            self.connection.rollback()
+            raise ReservationHallException(f'Reservation hall error: {e}')
+
+    def create_many(self, rows:list):
+        if not rows:
+            return
         try:
             cursor = self.connection.cursor()
-            cursor.execute("INSERT INTO Reservation_Hall (reservation_id, hall_id) "
-                           "VALUES (:reservation_id, :hall_id)",
-                           {
-                               "reservation_id": reservation_id,
-                               "hall_id": hall_id
-                            })
+            cursor.executemany("INSERT INTO Reservation_Hall (reservation_id, hall_id) "
+                               "VALUES (:reservation_id, :hall_id)",
+                               [{"reservation_id": reservation_id, "hall_id": hall_id} for reservation_id, hall_id in rows])
             self.connection.commit()
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
+        except DatabaseError as e:
             self.connection.rollback()
-            raise ReservationHallException(f'Reservation hall database error: {error_obj.message}')
+            raise ReservationHallException(f'Reservation hall database error: {e.message}')
         except Exception as e:
             self.connection.rollback()
             raise ReservationHallException(f'Reservation hall error: {e}')
 
     def update(self, reservation_id:int, hall_id:int):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("UPDATE Reservation_Hall SET hall_id = :hall_id WHERE reservation_id = :reservation_id",
-                           {
-                               "reservation_id": reservation_id,
-                               "hall_id": hall_id
-                           })
+            self.connection.execute("UPDATE Reservation_Hall SET hall_id = :hall_id WHERE reservation_id = :reservation_id",
+                                    {
+                                        "reservation_id": reservation_id,
+                                        "hall_id": hall_id
+                                    })
             self.connection.commit()
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
+        except DatabaseError as e:
             self.connection.rollback()
-            raise ReservationHallException(f'Reservation hall database error: {error_obj.message}')
+            raise ReservationHallException(f'Reservation hall database error: {e.message}')
         except Exception as e:
             self.connection.rollback()
             raise ReservationHallException(f'Reservation hall error: {e}')
 
     def delete(self, reservation_id:int):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(f"DELETE FROM Reservation_Hall WHERE reservation_id = :reservation_id",
-                           {
-                               "reservation_id": reservation_id
-                           })
+            self.connection.execute(f"DELETE FROM Reservation_Hall WHERE reservation_id = :reservation_id",
+                                    {
+                                        "reservation_id": reservation_id
+                                    })
             self.connection.commit()
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
+        except DatabaseError as e:
             self.connection.rollback()
-            raise ReservationHallException(f'Reservation hall database error: {error_obj.message}')
+            raise ReservationHallException(f'Reservation hall database error: {e.message}')
         except Exception as e:
             self.connection.rollback()
             raise ReservationHallException(f'Reservation hall error: {e}')
 
     def read(self, reservation_id:int):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT * FROM Reservation_Hall WHERE reservation_id = :reservation_id",
-                           {
-                               'reservation_id': reservation_id
-                           })
+            cursor = self.connection.execute("SELECT * FROM Reservation_Hall WHERE reservation_id = :reservation_id",
+                                             {
+                                                 'reservation_id': reservation_id
+                                             })
             return cursor.fetchall()
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
-            raise ReservationHallException(f'Reservation hall database error: {error_obj.message}')
+        except DatabaseError as e:
+            raise ReservationHallException(f'Reservation hall database error: {e.message}')
         except Exception as e:
             raise ReservationHallException(f'Reservation hall error: {e}')
 
+    def read_busy_between(self, hall_ids:list, time_from:datetime, time_to:datetime):
+        if not hall_ids:
+            return []
+        try:
+            hall_binds = {f"hall_{i}": hall_id for i, hall_id in enumerate(hall_ids)}
+            cursor = self.connection.execute("SELECT rh.hall_id, r.start_time, r.end_time FROM reservation r "
+                                             "JOIN reservation_hall rh ON rh.reservation_id = r.id "
+                                             f"WHERE rh.hall_id IN ({', '.join(':' + name for name in hall_binds)}) "
+                                             "AND r.status <> 'CANCELLED' AND r.start_time < :time_to AND r.end_time > :time_from "
+                                             "ORDER BY rh.hall_id, r.start_time",
+                                             {
+                                                 **hall_binds,
+                                                 "time_from": time_from,
+                                                 "time_to": time_to
+                                             })
+            return cursor.fetchall()
+        except DatabaseError as e:
+            raise ReservationHallException(f'Reservation hall database error: {e.message}')
+        except Exception as e:
+            raise ReservationHallException(f'Reservation hall error: {e}')
+
+    def iter_all(self, page_size:int=PAGE_SIZE, after:tuple=None):
+        try:
+            yield from iter_pages(self.connection, "SELECT * FROM Reservation_Hall", [("reservation_id", 0), ("hall_id", 1)], page_size=page_size, after=after)
+        except DatabaseError as e:
+            raise ReservationHallException(f'Reservation hall database error: {e.message}')
+
     def read_all(self):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT * FROM Reservation_Hall")
+            cursor = self.connection.execute("SELECT * FROM Reservation_Hall")
             return cursor.fetchall()
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
-            raise ReservationHallException(f'Reservation hall database error: {error_obj.message}')
+        except DatabaseError as e:
+            raise ReservationHallException(f'Reservation hall database error: {e.message}')
         except Exception as e:
             raise ReservationHallException(f'Reservation hall error: {e}')
\ No newline at end of file
@@ -1,4 +1,5 @@
-import cx_Oracle
+from Src.Backends.Backend import DatabaseError
+from Src.Table_Gateways.Paging import PAGE_SIZE, iter_pages
 
 
 class ReservationServiceException(Exception):
@@ -8,81 +9,95 @@ class ServiceReservation:
     def __init__(self, connection):
         self.connection = connection
 
-    def create(self, reservation_id:int, service_id:int, hours:int):
+    def create(self, reservation_id:int, service_id:int, hours:int, amount:float):
+        try:
+            self.connection.execute("INSERT INTO Reservation_Service (reservation_id, service_id, hours, amount) "
+                                    "VALUES (:reservation_id, :service_id, :hours, :amount)",
+                                    {
+                                        "reservation_id": reservation_id,
+                                        "service_id": service_id,
+                                        "hours": hours,
+                                        "amount": amount
+                                     })
+            self.connection.commit()
+        except DatabaseError as e:
+            self.connection.rollback()
+            raise ReservationServiceException(f'Service reservation database error: {e.message}')
+        except Exception as e:
+            self.connection.rollback()
+            raise ReservationServiceException(f'Service reservation error: {e}')
+
+    def create_many(self, rows:list):
+        if not rows:
+            return
         try:
             cursor = self.connection.cursor()
-            cursor.execute("INSERT INTO Reservation_Service (reservation_id, service_id, hours) "
-                           "VALUES (:reservation_id, :service_id, :hours)",
-                           {
-                               "reservation_id": reservation_id,
-                               "service_id": service_id,
-                               "hours": hours
-                            })
+            cursor.executemany("INSERT INTO Reservation_Service (reservation_id, service_id, hours, amount) "
+                               "VALUES (:reservation_id, :service_id, :hours, :amount)",
+                               [{"reservation_id": reservation_id, "service_id": service_id, "hours": hours, "amount": amount}
+                                for reservation_id, service_id, hours, amount in rows])
             self.connection.commit()
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
+        except DatabaseError as e:
             self.connection.rollback()
-            raise ReservationServiceException(f'Service reservation database error: {error_obj.message}')
+            raise ReservationServiceException(f'Service reservation database error: {e.message}')
         except Exception as e:
             self.connection.rollback()
             raise ReservationServiceException(f'Service reservation error: {e}')
 
     def update(self, reservation_id:int, service_id:int, hours:int):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("UPDATE Reservation_Service SET hours = :hours WHERE reservation_id = :reservation_id AND service_id = :service_id",
-                           {
-                               "reservation_id": reservation_id,
-                               "service_id": service_id,
-                               "hours": hours
-                            })
+            self.connection.execute("UPDATE Reservation_Service SET hours = :hours WHERE reservation_id = :reservation_id AND service_id = :service_id",
+                                    {
+                                        "reservation_id": reservation_id,
+                                        "service_id": service_id,
+                                        "hours": hours
+                                     })
             self.connection.commit()
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
+        except DatabaseError as e:
             self.connection.rollback()
-            raise ReservationServiceException(f'Service reservation database error: {error_obj.message}')
+            raise ReservationServiceException(f'Service reservation database error: {e.message}')
         except Exception as e:
             self.connection.rollback()
             raise ReservationServiceException(f'Service reservation error: {e}')
 
     def delete(self, reservation_id:int, service_id:int):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("DELETE FROM Reservation_Service WHERE reservation_id = :reservation_id AND service_id = :service_id",
-                           {
-                               "reservation_id": reservation_id,
-                               "service_id": service_id
-                           })
+            self.connection.execute("DELETE FROM Reservation_Service WHERE reservation_id = :reservation_id AND service_id = :service_id",
+                                    {
+                                        "reservation_id": reservation_id,
+                                        "service_id": service_id
+                                    })
             self.connection.commit()
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
+        except DatabaseError as e:
             self.connection.rollback()
-            raise ReservationServiceException(f'Service reservation database error: {error_obj.message}')
+            raise ReservationServiceException(f'Service reservation database error: {e.message}')
         except Exception as e:
             self.connection.rollback()
             raise ReservationServiceException(f'Service reservation error: {e}')
 
     def read(self, reservation_id:int):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT * FROM Reservation_Service WHERE reservation_id = :reservation_id",
-                           {
-                               'reservation_id': reservation_id
-                           })
+            cursor = self.connection.execute("SELECT * FROM Reservation_Service WHERE reservation_id = :reservation_id",
+                                             {
+                                                 'reservation_id': reservation_id
+                                             })
             return cursor.fetchall()
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
-            raise ReservationServiceException(f'Service reservation database error: {error_obj.message}')
+        except DatabaseError as e:
+            raise ReservationServiceException(f'Service reservation database error: {e.message}')
         except Exception as e:
             raise ReservationServiceException(f'Service reservation error: {e}')
 
+    def iter_all(self, page_size:int=PAGE_SIZE, after:tuple=None):
+        try:
+            yield from iter_pages(self.connection, "SELECT * FROM Reservation_Service", [("reservation_id", 0), ("service_id", 1)], page_size=page_size, after=after)
+        except DatabaseError as e:
+            raise ReservationServiceException(f'Service reservation database error: {e.message}')
+
     def read_all(self):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT * FROM Reservation_Service")
+            cursor = self.connection.execute("SELECT * FROM Reservation_Service")
             return cursor.fetchall()
-        except cx_Oracle.DatabaseError as e:
-            error_obj, = e.args
-            raise ReservationServiceException(f'Service reservation database error: {error_obj.message}')
+        except DatabaseError as e:
+            raise ReservationServiceException(f'Service reservation database error: {e.message}')
         except Exception as e:
             raise ReservationServiceException(f'Service reservation error: {e}')
\ No newline at end of file
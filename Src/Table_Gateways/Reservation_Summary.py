@@ -0,0 +1,71 @@
+from Src.Backends.Backend import DatabaseError
+
+class ReservationSummaryException(Exception):
+    pass
+
+SUMMARY_TOTALS = [
+    ("total_reservations", "reservations"),
+    ("active_reservations", "active_reservations"),
+    ("priced_reservations", "priced_reservations"),
+    ("reservation_price_sum", "revenue"),
+    ("total_service_hours", "service_hours"),
+    ("total_payments", "payments"),
+    ("total_paid_amount", "paid_amount")
+]
+
+class ReservationSummary:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def lock(self):
+        try:
+            cursor = self.connection.execute("SELECT id FROM reservation_summary WHERE id = 1 FOR UPDATE")
+            return cursor.fetchone() is not None
+        except DatabaseError as e:
+            self.connection.rollback()
+            raise ReservationSummaryException(f'Reservation summary database error: {e.message}')
+        except Exception as e:
+            self.connection.rollback()
+            raise ReservationSummaryException(f'Reservation summary error: {e}')
+
+    def apply_rollup(self, reservations:int, active_reservations:int, priced_reservations:int, revenue:float, service_hours:float, payments:int, paid_amount:float):
+        self._update([reservations, active_reservations, priced_reservations, revenue, service_hours, payments, paid_amount], True)
+
+    def replace(self, reservations:int, active_reservations:int, priced_reservations:int, revenue:float, service_hours:float, payments:int, paid_amount:float):
+        self._update([reservations, active_reservations, priced_reservations, revenue, service_hours, payments, paid_amount], False)
+
+    def _update(self, values:list, additive:bool):
+        try:
+            self.connection.execute("UPDATE reservation_summary SET " +
+                                    "".join(f"{column} = {column + ' + ' if additive else ''}:{name}, " for column, name in SUMMARY_TOTALS) +
+                                    "min_reservation_price = (SELECT MIN(total_price) FROM reservation), "
+                                    "max_reservation_price = (SELECT MAX(total_price) FROM reservation), "
+                                    "unique_customers = (SELECT COUNT(*) FROM customer c WHERE EXISTS "
+                                    "(SELECT 1 FROM reservation r WHERE r.customer_id = c.id)), "
+                                    "used_halls = (SELECT COUNT(*) FROM hall h WHERE EXISTS "
+                                    "(SELECT 1 FROM reservation_hall rh WHERE rh.hall_id = h.id)), "
+                                    "used_services = (SELECT COUNT(*) FROM service sv WHERE EXISTS "
+                                    "(SELECT 1 FROM reservation_service rs WHERE rs.service_id = sv.id)), "
+                                    "refreshed_at = SYSDATE "
+                                    "WHERE id = 1",
+                                    {name: value for (_, name), value in zip(SUMMARY_TOTALS, values)})
+            self.connection.commit()
+        except DatabaseError as e:
+            self.connection.rollback()
+            raise ReservationSummaryException(f'Reservation summary database error: {e.message}')
+        except Exception as e:
+            self.connection.rollback()
+            raise ReservationSummaryException(f'Reservation summary error: {e}')
+
+    def read(self):
+        try:
+            cursor = self.connection.execute("SELECT total_reservations, active_reservations, min_reservation_price, max_reservation_price, "
+                                             "ROUND(reservation_price_sum / NULLIF(priced_reservations, 0), 2), "
+                                             "total_paid_amount, total_payments, ROUND(total_paid_amount / NULLIF(total_payments, 0), 2), "
+                                             "unique_customers, used_halls, used_services, total_service_hours, refreshed_at "
+                                             "FROM reservation_summary WHERE id = 1")
+            return cursor.fetchone()
+        except DatabaseError as e:
+            raise ReservationSummaryException(f'Reservation summary database error: {e.message}')
+        except Exception as e:
+            raise ReservationSummaryException(f'Reservation summary error: {e}')
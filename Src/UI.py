@@ -1,5 +1,5 @@
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 
 class UIError(Exception):
     pass
@@ -16,7 +16,10 @@ class UI:
         print("<"+("=" * 50)+">")
 
     def clear_console(self):
-        os.system('cls' if os.name == 'nt' else 'clear')
+        if os.name == 'nt':
+            os.system('cls')
+        else:
+            print("\033[2J\033[H", end="", flush=True)
 
     def user_input(self, data_type:str, message:str, enum_options:list=""):
         print(message)
@@ -48,6 +51,8 @@ class UI:
                 return choice
             if data_type == "datetime":
                 return datetime.strptime(choice, "%Y-%m-%d %H:%M")
+            if data_type == "date":
+                return datetime.strptime(choice, "%Y-%m-%d").date()
             if data_type == "enum":
                 if choice.upper() in enum_options:
                     return choice.upper()
@@ -205,6 +210,74 @@ class UI:
             except Exception as e:
                 raise UIWrongInputError(f"Error in UI: {e}")
 
+    def series_form(self):
+        print("Recurring reservation settings")
+        while True:
+            try:
+                rule = self.user_input("enum","Repeat (WEEKLY, BIWEEKLY): ", ["WEEKLY", "BIWEEKLY"])
+                until = self.user_input("date","Repeat until (YYYY-MM-DD): ")
+                exceptions = []
+                while True:
+                    print("Enter a date to skip (YYYY-MM-DD), empty to finish:")
+                    choice = input(">").strip()
+                    if not choice:
+                        break
+                    try:
+                        exceptions.append(datetime.strptime(choice, "%Y-%m-%d").date())
+                    except ValueError:
+                        print("Invalid date")
+
+                return {
+                    "rule": rule,
+                    "until": until,
+                    "exceptions": exceptions
+                }
+            except UIError as e:
+                print(e)
+            except Exception as e:
+                raise UIWrongInputError(f"Error in UI: {e}")
+
+    def free_slots_form(self):
+        print("Free slots search form")
+        while True:
+            try:
+                sport_type = self.user_input("enum","Select hall sport type (options FOOTBALL, BASKETBALL, VOLLEYBALL, BADMINTON, HANDBALL, FLORBALL): ", ["FOOTBALL", "BASKETBALL", "VOLLEYBALL", "BADMINTON", "HANDBALL", "FLORBALL"])
+                duration = self.user_input("float","Enter reservation length in hours: ")
+                if duration <= 0:
+                    raise UIError("Invalid length")
+                search_from = self.user_input("datetime","Search from (YYYY-MM-DD HH:MM): ")
+                search_to = self.user_input("datetime","Search to (YYYY-MM-DD HH:MM): ")
+                if search_from >= search_to:
+                    raise UIError("Search start must be before its end")
+                min_capacity = self.user_input("int","Enter minimal hall capacity: ")
+                daily = self.user_input("bool","Limit search to the same hours every day (Y/N): ")
+
+                windows = [(search_from, search_to)]
+                if daily:
+                    day_from = self.user_input("int","Every day from hour (0-23): ")
+                    day_to = self.user_input("int","Every day to hour (1-24): ")
+                    if day_from >= day_to or day_to > 24:
+                        raise UIError("Invalid daily hours")
+                    windows = []
+                    day = search_from.replace(hour=0, minute=0)
+                    while day < search_to:
+                        window_from = max(day + timedelta(hours=day_from), search_from)
+                        window_to = min(day + timedelta(hours=day_to), search_to)
+                        if window_from < window_to:
+                            windows.append((window_from, window_to))
+                        day += timedelta(days=1)
+
+                return {
+                    "sport_type": sport_type,
+                    "duration": timedelta(hours=duration),
+                    "windows": windows,
+                    "min_capacity": min_capacity
+                }
+            except UIError as e:
+                print(e)
+            except Exception as e:
+                raise UIWrongInputError(f"Error in UI: {e}")
+
     def delete_reservation_form(self, reservations):
         print("Reservation deletion form")
         if not reservations:
@@ -260,22 +333,50 @@ class UI:
         for hall in halls:
             print(f"{hall[1]}: {hall[2]} {hall[3]}/h Capacity:{hall[4]}")
 
-    def print_reservations_detailed(self, reservations):
-        print("Detailed reservations:")
-        if not reservations:
-            raise UIWrongInputError("Error in UI:  reservations found")
+    def print_series_report(self, report):
+        print("Recurring reservation report")
+        for occurrence in report:
+            reservation = f" (reservation {occurrence[4]})" if occurrence[4] else ""
+            print(f"{occurrence[0]:%Y-%m-%d %H:%M}-{occurrence[1]:%H:%M}: {occurrence[2]} {occurrence[3]}{reservation}")
 
-        for reservation in reservations:
-            print(f"{reservation[0]}: {reservation[1]}-{reservation[2]}, Status: {reservation[3]}, Total price: {reservation[4]},"
-                  f" Customer: {reservation[6]}, {reservation[7]}, Hall: {reservation[9]}")
+    def print_free_slots(self, slots):
+        print("Free slots")
+        if not slots:
+            raise UIWrongInputError("Error in UI: No free slots found")
 
-    def print_customers(self, customers):
+        for slot in slots:
+            print(f"{slot[0]}: {slot[1]} {slot[2]:%Y-%m-%d %H:%M}-{slot[3]:%H:%M} Price: {slot[4]}")
+
+    def print_reservations_detailed(self, pages):
+        print("Detailed reservations:")
+        printed = False
+        for reservations in pages:
+            if printed and not self.next_page():
+                return
+            for reservation in reservations:
+                print(f"{reservation[0]}: {reservation[1]}-{reservation[2]}, Status: {reservation[3]}, Total price: {reservation[4]},"
+                      f" Customer: {reservation[6]}, {reservation[7]}, Hall: {reservation[9]}")
+            printed = True
+
+        if not printed:
+            raise UIWrongInputError("Error in UI: No reservations found")
+
+    def print_customers(self, pages):
         print("Available customers:")
-        if not customers:
+        printed = False
+        for customers in pages:
+            if printed and not self.next_page():
+                return
+            for customer in customers:
+                print(f"{customer[0]}: {customer[1]} {customer[2]} Balance: {customer[3]}")
+            printed = True
+
+        if not printed:
             raise UIWrongInputError("Error in UI: No customers found")
 
-        for customer in customers:
-            print(f"{customer[0]}: {customer[1]} {customer[2]} Balance: {customer[3]}")
+    def next_page(self):
+        print("Press Enter for the next page or Q to stop:")
+        return input(">").strip().upper() != "Q"
 
     def print_report(self, data):
         labels = [
@@ -300,6 +401,39 @@ class UI:
 
         print("\n===============================\n")
 
+    def print_import_report(self, rejected:dict):
+        for table, rows in rejected.items():
+            if not rows:
+                continue
+            print(f"Rejected rows in {table} import:")
+            for line, message in rows:
+                print(f"  line {line}: {message}")
+
+    def print_stats(self, title:str, stats:dict):
+        print(f"\n=== {title} ===\n")
+
+        for label, value in stats.items():
+            label = label.replace("_", " ").capitalize()
+            print(f"{label:<25}: {value}")
+
+        print("\n" + "=" * (len(title) + 8) + "\n")
+
+    def print_query_stats(self, stats:dict):
+        print("\n=== QUERY STATISTICS ===\n")
+        print(f"Instrumentation enabled    : {stats['enabled']}")
+        print(f"Slow query threshold (ms)  : {stats['slow_threshold_ms']}")
+        print(f"Slow queries               : {stats['slow_queries']}\n")
+
+        if stats["statements"]:
+            print(f"{'ID':<10} {'CALLER':<40} {'EXEC':>7} {'TOTAL MS':>10} {'MEAN MS':>9} {'P95 MS':>8} {'ROWS':>8}")
+            print("-" * 98)
+            for statement in stats["statements"]:
+                caller = max(statement["callers"], key=statement["callers"].get)
+                print(f"{statement['id']:<10} {caller[:40]:<40} {statement['executions']:>7} {statement['total_ms']:>10} "
+                      f"{statement['mean_ms']:>9} {str(statement['p95_ms']):>8} {statement['rows']:>8}")
+
+        print("\n" + "=" * 30 + "\n")
+
     def menu(self, actions:dict):
         print("Available actions:")
         for key, value in actions.items():
@@ -0,0 +1,46 @@
+class UnitOfWorkError(Exception):
+    pass
+
+class TransactionalConnection:
+    transactional = True
+
+    def __init__(self, connection):
+        self._connection = connection
+        self.failed = False
+        self.callbacks = []
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        self.failed = True
+
+    def after_commit(self, callback, *args):
+        self.callbacks.append((callback, args))
+
+class UnitOfWork:
+    def __init__(self, connection):
+        self.owner = not isinstance(connection, TransactionalConnection)
+        self.connection = TransactionalConnection(connection) if self.owner else connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if not self.owner:
+            return False
+
+        connection = self.connection._connection
+        if exc_type is not None or self.connection.failed:
+            connection.rollback()
+            if exc_type is None:
+                raise UnitOfWorkError("Transaction was rolled back")
+            return False
+
+        connection.commit()
+        for callback, args in self.connection.callbacks:
+            callback(*args)
+        return False
@@ -1,4 +1,9 @@
+import sys
+
 from Src.App import App
+from Src.Cli import Cli
 
 if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        sys.exit(Cli().run(sys.argv[1:]))
     app = App()
\ No newline at end of file
@@ -0,0 +1,45 @@
+import os
+
+import pytest
+
+from Src.Config.Sql_load import migrate
+from Src.DBconnect import DBconnect
+from Src.Services.Availability_Index import AvailabilityIndex
+from Src.Services.Import import Import
+from Src.Services.Pricing_Engine import PricingEngine
+from Src.Table_Gateways.Reference_Cache import ReferenceCache
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+NEUTRAL_PRICING = {
+    "peak_from": 17,
+    "peak_to": 22,
+    "peak_multiplier": 1.0,
+    "off_peak_multiplier": 1.0,
+    "weekend_multiplier": 1.0,
+    "team_discount": 0.0
+}
+
+@pytest.fixture
+def db(tmp_path):
+    DBconnect._instance = None
+    PricingEngine().configure(dict(NEUTRAL_PRICING))
+    ReferenceCache(300).invalidate()
+    AvailabilityIndex().invalidate()
+    db = DBconnect(None, None, str(tmp_path / "halls.db"), "UTF-8", 1, 4, 1, 2000, "sqlite")
+    db.create_pool()
+    with db.session() as connection:
+        migrate(connection, os.path.join(BASE_PATH, "Migrations"))
+        importer = Import(connection)
+        for table in ("customer", "hall", "service"):
+            assert importer.import_csv(table, os.path.join(BASE_PATH, "Import", f"{table}.csv")) == []
+    yield db
+    db.disconnect()
+    DBconnect._instance = None
+    ReferenceCache().invalidate()
+    AvailabilityIndex().invalidate()
+
+@pytest.fixture
+def connection(db):
+    with db.session() as connection:
+        yield connection
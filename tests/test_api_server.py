@@ -0,0 +1,49 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from Src.Api_Server import ApiServer
+
+async def exchange(server, raw:bytes):
+    listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+    async with listener:
+        reader, writer = await asyncio.open_connection(*listener.sockets[0].getsockname()[:2])
+        writer.write(raw)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+def request(server, raw:bytes):
+    server.executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        return asyncio.run(exchange(server, raw))
+    finally:
+        server.executor.shutdown(wait=True)
+
+def test_invalid_content_length_is_rejected(db):
+    status, payload = request(ApiServer(db), b"POST /quotes HTTP/1.1\r\nContent-Length: abc\r\n\r\n")
+    assert status == 400
+    assert payload == {"error": "Invalid Content-Length"}
+
+    status, _ = request(ApiServer(db), b"POST /quotes HTTP/1.1\r\nContent-Length: -5\r\n\r\n")
+    assert status == 400
+
+def test_body_without_content_length_is_rejected(db):
+    status, _ = request(ApiServer(db), b"POST /reservations HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n0\r\n\r\n")
+    assert status == 411
+
+def test_operation_errors_and_unexpected_errors(db, monkeypatch):
+    server = ApiServer(db)
+    body = json.dumps({"reservation": 999}).encode("utf-8")
+    status, payload = request(server, b"POST /payments HTTP/1.1\r\nConnection: close\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+    assert status == 400
+    assert payload == {"error": "Unknown reservation id: 999"}
+
+    def fail(operation):
+        raise RuntimeError("boom")
+    monkeypatch.setattr(server, "run_operation", fail)
+    status, payload = request(server, b"GET /halls HTTP/1.1\r\nConnection: close\r\n\r\n")
+    assert status == 500
+    assert payload == {"error": "Internal server error"}
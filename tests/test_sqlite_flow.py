@@ -0,0 +1,261 @@
+import json
+import os
+import sqlite3
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from Src.Cli import Cli
+from Src.Config.Sql_load import split_statements
+from Src.Services.Export import Export
+from Src.Services.Utilization import Utilization, WEEKDAYS
+from Src.Services.Availability_Index import AvailabilityIndex
+from Src.Services.Reservation_Service import ReservationService, ReservationServiceException
+from Src.Table_Gateways.Cash_Account import CashAccount, CashAccountError
+from Src.Table_Gateways.Customer import Customer
+from Src.Table_Gateways.Hall import Hall
+from Src.Table_Gateways.Service import Service
+
+START = datetime(2030, 3, 4, 10, 0)
+END = datetime(2030, 3, 4, 12, 0)
+
+REFEREE = 2
+
+SERVICE_AMOUNT_MIGRATION = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Migrations", "sqlite", "0010_service_amount.sql")
+
+def halls(connection, *hall_ids):
+    return {hall[0]: hall for hall in Hall(connection).read_all() if hall[0] in hall_ids}
+
+def book(connection, customer_id, start_time=START, end_time=END, hall_id=2, optional_services=None):
+    return ReservationService(connection).create_reservation(customer_id, start_time, end_time, optional_services or {},
+                                                             Service(connection).read_not_optional(), halls(connection, hall_id))
+
+def fund(connection, customer_id, amount):
+    CashAccount(connection).update(amount, Customer(connection).read_by_id(customer_id)[1])
+
+def test_booking_prices_halls_and_services(connection):
+    reservation_id = book(connection, 1, optional_services={REFEREE: 1000.0})
+
+    price = connection.execute("SELECT total_price FROM reservation WHERE id = :id", {"id": reservation_id}).fetchone()[0]
+    assert price == 900 * 2 + (150 + 400) * 2 + 1000
+    amounts = dict(connection.execute("SELECT service_id, amount FROM reservation_service WHERE reservation_id = :id",
+                                      {"id": reservation_id}).fetchall())
+    assert amounts == {1: 300.0, 2: 1000.0, 5: 800.0}
+
+def test_overlapping_booking_is_rejected(connection):
+    book(connection, 1)
+    with pytest.raises(ReservationServiceException):
+        book(connection, 2, datetime(2030, 3, 4, 11, 0), datetime(2030, 3, 4, 13, 0))
+
+def test_pay_and_report(connection):
+    service = ReservationService(connection)
+    first = book(connection, 1, optional_services={REFEREE: 1000.0})
+    book(connection, 3, datetime(2030, 3, 5, 18, 0), datetime(2030, 3, 5, 19, 0), hall_id=1)
+    fund(connection, 1, 5000)
+    service.pay_and_transfer(first, Customer(connection).read_by_id(1)[1], 3900.0)
+
+    report = service.report(exact=True)
+    assert report == (2, 2, 1750.0, 3900.0, 2825.0, 3900.0, 1, 3900.0, 2, 2, 3, 8.0)
+
+def test_report_reads_the_last_refresh(connection):
+    service = ReservationService(connection)
+    book(connection, 1)
+    assert service.report(exact=True)[0] == 1
+
+    second = book(connection, 2, datetime(2030, 3, 6, 10, 0), datetime(2030, 3, 6, 12, 0))
+    assert service.report()[0] == 1
+    assert service.report(exact=True)[0] == 2
+
+    service.delete_reservation(second)
+    assert service.report(exact=True)[:2] == (1, 1)
+
+def test_service_revenue_ignores_later_price_changes(connection):
+    service = ReservationService(connection)
+    book(connection, 1, optional_services={REFEREE: 1000.0})
+    before, _ = service.revenue(datetime(2030, 1, 1), datetime(2031, 1, 1), "service", refresh=True)
+
+    Service(connection).update("price_per_hour", 999, "Lighting")
+    connection.execute("INSERT INTO rollup_dirty_day (day) VALUES (:day)", {"day": datetime(2030, 3, 4)})
+    connection.commit()
+    after, pending = service.revenue(datetime(2030, 1, 1), datetime(2031, 1, 1), "service", refresh=True)
+
+    assert pending == 0
+    assert after == before
+    assert [(row[0], row[4]) for row in after] == [(1, 300.0), (2, 1000.0), (5, 800.0)]
+
+def test_pool_close_refuses_busy_connections(db):
+    connection = db.acquire()
+    with pytest.raises(sqlite3.OperationalError):
+        db.pool.close()
+    assert db.pool.busy == 1
+
+    db.pool.close(force=True)
+    assert (db.pool.opened, db.pool.busy) == (0, 0)
+    with pytest.raises(sqlite3.OperationalError):
+        db.pool.acquire()
+    db.release(connection)
+
+def test_exact_report_matches_view_after_deleting_hall_and_service(connection):
+    service = ReservationService(connection)
+    book(connection, 1, optional_services={REFEREE: 1000.0})
+    book(connection, 2, datetime(2030, 3, 5, 10, 0), datetime(2030, 3, 5, 12, 0), hall_id=1)
+    service.report(exact=True)
+
+    Hall(connection).delete("Main Football Hall")
+    Service(connection).delete("Referee")
+
+    view = connection.execute("SELECT * FROM reservation_summary_view").fetchone()
+    assert service.report(exact=True) == tuple(view)
+    halls_revenue, _ = service.revenue(datetime(2030, 1, 1), datetime(2031, 1, 1), "hall")
+    services_revenue, _ = service.revenue(datetime(2030, 1, 1), datetime(2031, 1, 1), "service")
+    assert [row[0] for row in halls_revenue] == [2]
+    assert [row[0] for row in services_revenue] == [1, 5]
+
+def test_deposit_to_unknown_account_writes_no_ledger_entries(connection):
+    entries = connection.execute("SELECT COUNT(*) FROM ledger_entry").fetchone()[0]
+    transfers = connection.execute("SELECT COUNT(*) FROM ledger_transfer").fetchone()[0]
+    with pytest.raises(CashAccountError):
+        CashAccount(connection).update(50, 999)
+    assert connection.execute("SELECT COUNT(*) FROM ledger_entry").fetchone()[0] == entries
+    assert connection.execute("SELECT COUNT(*) FROM ledger_transfer").fetchone()[0] == transfers
+
+def test_recent_busy_index_answer_rejects_without_sql(connection):
+    reservation_id = book(connection, 1)
+    connection.execute("DELETE FROM reservation WHERE id = :id", {"id": reservation_id})
+    connection.commit()
+
+    with pytest.raises(ReservationServiceException):
+        book(connection, 2)
+
+def test_stale_busy_index_answer_is_confirmed_in_sql(connection, monkeypatch):
+    reservation_id = book(connection, 1)
+    connection.execute("DELETE FROM reservation WHERE id = :id", {"id": reservation_id})
+    connection.commit()
+    monkeypatch.setattr(AvailabilityIndex(), "busy_trust", 0.0)
+
+    assert ReservationService(connection).check_halls(halls(connection, 2), START, END) is True
+    assert book(connection, 2) != reservation_id
+
+def test_batch_reports_non_object_lines_and_keeps_going(db, tmp_path, capsys):
+    batch = tmp_path / "operations.jsonl"
+    batch.write_text('[1, 2]\n"x"\n{"op": "report"}\n', encoding="utf-8")
+    cli = Cli()
+    cli.db = db
+
+    assert cli.run_batch(str(batch)) == 1
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(record["line"], record["ok"]) for record in records] == [(1, False), (2, False), (3, True)]
+
+def test_service_amount_backfill_matches_the_booking_path(connection):
+    reservation_id = book(connection, 1, START, datetime(2030, 3, 4, 12, 30), optional_services={REFEREE: 1000.0})
+    booked = dict(connection.execute("SELECT service_id, amount FROM reservation_service WHERE reservation_id = :id",
+                                     {"id": reservation_id}).fetchall())
+
+    with open(SERVICE_AMOUNT_MIGRATION, encoding="utf-8") as f:
+        backfill = [statement for statement in split_statements(f.read()) if "SET amount" in statement]
+    connection.execute("UPDATE reservation_service SET amount = NULL")
+    for statement in backfill:
+        connection.execute(statement)
+    backfilled = dict(connection.execute("SELECT service_id, amount FROM reservation_service WHERE reservation_id = :id",
+                                         {"id": reservation_id}).fetchall())
+
+    assert backfilled[1] == booked[1] == 150 * 2.5
+    assert backfilled[5] == booked[5] == 400 * 2.5
+    assert backfilled[REFEREE] == 500 * 2
+    connection.commit()
+
+def series(connection, rule, until, exceptions=(), skip_conflicts=True):
+    return ReservationService(connection).create_reservation_series(3, START, END, rule, until, list(exceptions), {},
+                                                                    Service(connection).read_not_optional(), halls(connection, 2),
+                                                                    skip_conflicts)
+
+def count_reservations(connection):
+    return connection.execute("SELECT COUNT(*) FROM reservation").fetchone()[0]
+
+def test_weekly_series_books_every_week_except_excluded_dates(connection):
+    report = series(connection, "WEEKLY", date(2030, 3, 25), [date(2030, 3, 11)])
+
+    assert [(row[0].day, row[2]) for row in report] == [(4, "OK"), (11, "SKIPPED"), (18, "OK"), (25, "OK")]
+    assert all(row[4] is not None for row in report if row[2] == "OK")
+    assert count_reservations(connection) == 3
+
+def test_biweekly_series_steps_two_weeks(connection):
+    report = series(connection, "BIWEEKLY", date(2030, 3, 25))
+
+    assert [(row[0], row[1], row[2]) for row in report] == [(START, END, "OK"),
+                                                           (datetime(2030, 3, 18, 10, 0), datetime(2030, 3, 18, 12, 0), "OK")]
+
+def test_series_with_conflicts_books_nothing_unless_skipping(connection):
+    book(connection, 1, datetime(2030, 3, 18, 11, 0), datetime(2030, 3, 18, 13, 0))
+
+    report = series(connection, "WEEKLY", date(2030, 3, 25), skip_conflicts=False)
+    assert [row[2] for row in report] == ["NOT_BOOKED", "NOT_BOOKED", "CONFLICT", "NOT_BOOKED"]
+    assert all(row[4] is None for row in report)
+    assert count_reservations(connection) == 1
+
+    report = series(connection, "WEEKLY", date(2030, 3, 25))
+    assert [row[2] for row in report] == ["OK", "OK", "CONFLICT", "OK"]
+    assert count_reservations(connection) == 4
+
+@pytest.mark.parametrize("table", ["reservation", "reservation_service"])
+def test_export_resumed_from_checkpoint_matches_single_run(connection, tmp_path, table):
+    for day in range(4, 11):
+        book(connection, 1 + day % 2, datetime(2030, 3, day, 10, 0), datetime(2030, 3, day, 12, 0),
+             optional_services={REFEREE: 500.0} if day % 3 == 0 else None)
+    exporter = Export(connection, chunk_size=2)
+    single = tmp_path / "single.csv"
+    exporter.export(table, str(single))
+    lines = single.read_text(encoding="utf-8").splitlines(keepends=True)
+    assert len(lines) > 6
+
+    resumed = tmp_path / "resumed.csv"
+    resumed.write_text("".join(lines[:4]), encoding="utf-8")
+    result = exporter.export(table, str(resumed), resume=True)
+
+    assert result["rows"] == len(lines) - 4
+    assert resumed.read_text(encoding="utf-8") == single.read_text(encoding="utf-8")
+
+def brute_force_utilization(connection, hall_id, window_from, window_to):
+    bookings = connection.execute("SELECT r.start_time, r.end_time, r.total_price, "
+                                  "(SELECT COUNT(*) FROM reservation_hall x WHERE x.reservation_id = r.id) "
+                                  "FROM reservation r JOIN reservation_hall rh ON rh.reservation_id = r.id WHERE rh.hall_id = :id",
+                                  {"id": hall_id}).fetchall()
+    occupied, available, earned = {}, {}, {}
+    minute = window_from
+    while minute < window_to:
+        keys = [("all",), ("hour", minute.hour), ("weekday", WEEKDAYS[minute.weekday()]), ("month", minute.strftime("%Y-%m"))]
+        for key in keys:
+            available[key] = available.get(key, 0) + 1
+        for start_time, end_time, total_price, hall_count in bookings:
+            if start_time <= minute < end_time:
+                for key in keys:
+                    occupied[key] = occupied.get(key, 0) + 1
+                    earned[key] = earned.get(key, 0) + total_price / hall_count / ((end_time - start_time).total_seconds() / 60)
+        minute += timedelta(minutes=1)
+    return occupied, available, earned
+
+def test_utilization_matches_brute_force_minute_count(connection):
+    book(connection, 1, datetime(2030, 3, 30, 7, 30), datetime(2030, 3, 30, 9, 15))
+    book(connection, 2, datetime(2030, 3, 31, 23, 0), datetime(2030, 4, 1, 1, 30))
+    book(connection, 1, datetime(2030, 4, 2, 7, 0), datetime(2030, 4, 2, 9, 0))
+    book(connection, 3, datetime(2030, 3, 31, 10, 15), datetime(2030, 3, 31, 11, 45), hall_id=1)
+    book(connection, 4, datetime(2030, 4, 1, 12, 0), datetime(2030, 4, 1, 15, 0), hall_id=1)
+    ReservationService(connection).create_reservation(3, datetime(2030, 3, 30, 18, 0), datetime(2030, 3, 30, 19, 30), {},
+                                                      Service(connection).read_not_optional(), halls(connection, 1, 2))
+    window_from, window_to = datetime(2030, 3, 30, 8, 0), datetime(2030, 4, 2, 8, 0)
+
+    report = Utilization(connection).report(window_from, window_to, [1, 2, 3])
+
+    for hall in report["halls"]:
+        occupied, available, earned = brute_force_utilization(connection, hall["hall_id"], window_from, window_to)
+        percent = lambda key: round(100 * occupied.get(key, 0) / available[key], 1) if key in available else None
+        assert hall["occupied_hours"] == pytest.approx(occupied.get(("all",), 0) / 60, abs=0.01)
+        assert hall["occupancy_pct"] == pytest.approx(percent(("all",)), abs=0.1)
+        assert hall["revenue"] == pytest.approx(earned.get(("all",), 0), abs=0.01)
+        assert hall["by_hour"] == pytest.approx([percent(("hour", hour)) for hour in range(24)], abs=0.1)
+        assert hall["by_weekday"] == pytest.approx({name: percent(("weekday", name)) for name in WEEKDAYS}, abs=0.1)
+        for month, values in hall["by_month"].items():
+            assert values["occupied_hours"] == pytest.approx(occupied.get(("month", month), 0) / 60, abs=0.01)
+            assert values["revenue"] == pytest.approx(earned.get(("month", month), 0), abs=0.01)
+    assert report["halls"][2]["occupied_hours"] == 0
+    assert report["halls"][0]["occupied_hours"] > 0 and report["halls"][1]["occupied_hours"] > 0